@@ -25,6 +25,7 @@ from model.item_csv_model import ItemData
 from model.master_table_model import MasterTable
 from model.upload_master_reports_model import UploadReport
 from model.listing_master import ListingMaster
+from model.listing_entity import ListingEntity, ListingEntityMember, ListingEntityBlock
 from model.heyplaces import HeyPlaces
 # Existing Models
 from model.asklaila import Asklaila
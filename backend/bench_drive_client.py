@@ -0,0 +1,90 @@
+"""
+Microbenchmark: per-task Drive client setup.
+  before: etl_tasks.get_service() style - read the service-account JSON and build
+          the discovery client on every task
+  after:  DriveClientPool.client() checkout from the per-process pool
+Runs offline (no token fetch). Uses SERVICE_ACCOUNT_FILE when present, otherwise a
+throwaway service-account key generated on the fly.
+
+Usage: python bench_drive_client.py [iterations]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import statistics
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+
+from utils.drive_client_pool import DriveClientPool, DRIVE_READONLY_SCOPES
+
+SERVICE_ACCOUNT_FILE = os.getenv(
+    "SERVICE_ACCOUNT_FILE",
+    os.path.join(os.getcwd(), "model", "honey-bee-digital-d96daf6e6faf.json")
+)
+
+
+def throwaway_service_account():
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    info = {
+        "type": "service_account", "project_id": "bench", "private_key_id": "bench",
+        "private_key": pem, "client_email": "bench@bench.iam.gserviceaccount.com",
+        "client_id": "0", "token_uri": "https://oauth2.googleapis.com/token",
+    }
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(info, fh)
+    return path
+
+
+def setup_per_task(sa_file):
+    creds = service_account.Credentials.from_service_account_file(sa_file, scopes=DRIVE_READONLY_SCOPES)
+    return build('drive', 'v3', credentials=creds, cache_discovery=False)
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    print(f"  {label:<28} mean {statistics.mean(samples):8.3f} ms   "
+          f"p50 {statistics.median(samples):8.3f} ms   max {max(samples):8.3f} ms")
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    generated = not os.path.exists(SERVICE_ACCOUNT_FILE)
+    sa_file = throwaway_service_account() if generated else SERVICE_ACCOUNT_FILE
+
+    try:
+        print(f"Per-task Drive client setup, {iterations} iterations ({'generated' if generated else 'real'} key)")
+        report("before: json + build", timed(lambda: setup_per_task(sa_file), iterations))
+
+        pool = DriveClientPool(sa_file, size=8, refresh_margin=None)
+        start = time.perf_counter()
+        pool.init()
+        print(f"  pool init (once per process)  {(time.perf_counter() - start) * 1000:8.3f} ms for {pool.size} clients")
+
+        def checkout():
+            with pool.client():
+                pass
+        report("after: pool checkout", timed(checkout, iterations))
+    finally:
+        if generated:
+            os.remove(sa_file)
@@ -0,0 +1,80 @@
+"""
+Benchmark: raw ingest engines (executemany INSERT IGNORE vs LOAD DATA LOCAL INFILE).
+Loads synthetic normalised rows into a scratch copy of raw_google_map_drive_data
+on a local MySQL and reports rows/sec per engine. The server needs local_infile=ON.
+
+Usage: python bench_raw_ingest.py [rows] [batch_size]
+"""
+import os
+import sys
+import time
+import random
+from sqlalchemy import create_engine, text
+from urllib.parse import quote_plus
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from tasks.gdrive_task.etl_tasks import prepare_raw_batch, write_raw_batch
+
+DB_USER = os.getenv('DB_USER')
+DB_PASS = quote_plus(os.getenv('DB_PASSWORD_PLAIN') or "")
+DB_HOST = os.getenv('DB_HOST', 'localhost')
+DB_NAME = os.getenv('DB_NAME')
+DB_PORT = os.getenv('DB_PORT', '3306')
+DATABASE_URI = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+
+SCRATCH_TABLE = "raw_ingest_bench"
+
+engine = create_engine(DATABASE_URI, connect_args={"local_infile": True})
+
+
+def synthetic_rows(n, seed):
+    rnd = random.Random(seed)
+    cities = ["Ahmedabad", "Surat", "Rajkot", "Delhi", "Pune", "અમદાવાદ"]
+    cats = ["Cafe", "Hotel", "Restaurant", "Hospital", "Shop"]
+    rows = []
+    for i in range(n):
+        rows.append({
+            "name": f"Business {seed}-{i}", "address": f"{rnd.randint(1, 999)} Main Road\tBlock {i % 7}",
+            "website": f"https://example{i}.com", "phone_number": f"9{rnd.randint(100000000, 999999999)}",
+            "reviews_count": rnd.randint(0, 5000), "reviews_average": round(rnd.uniform(1, 5), 1),
+            "category": rnd.choice(cats), "subcategory": "", "city": rnd.choice(cities), "state": "Gujarat",
+            "area": None, "drive_file_id": f"bench-{seed}", "drive_file_name": "bench.csv",
+            "drive_file_path": "ROOT/bench", "drive_uploaded_time": "2026-01-01T00:00:00Z", "file_hash": "bench",
+        })
+    return rows
+
+
+def run(ingest_engine, total, batch_size, seed):
+    rows = synthetic_rows(total, seed)
+    start = time.perf_counter()
+    inserted = 0
+    for i in range(0, total, batch_size):
+        batch = prepare_raw_batch(rows[i:i + batch_size], task_id="bench")
+        with engine.begin() as conn:
+            inserted += write_raw_batch(conn, batch, ingest_engine, table=SCRATCH_TABLE)
+    elapsed = time.perf_counter() - start
+    return inserted, elapsed
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}"))
+        conn.execute(text(f"CREATE TABLE {SCRATCH_TABLE} LIKE raw_google_map_drive_data"))
+
+    try:
+        print(f"Rows: {total:,} | Batch: {batch_size:,}")
+        for seed, ingest_engine in enumerate(("executemany", "load_data")):
+            inserted, elapsed = run(ingest_engine, total, batch_size, seed)
+            print(f"  {ingest_engine:<12} {inserted:>10,} rows in {elapsed:7.2f}s  ->  {total / elapsed:>10,.0f} rows/sec")
+
+        # Re-load the first engine's rows through LOAD DATA: row_signature dedupe must skip all of them
+        dup_inserted, _ = run("load_data", total, batch_size, 0)
+        print(f"  load_data re-run of existing rows inserted {dup_inserted} (expected 0)")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}"))
@@ -12,6 +12,7 @@ import redis
 import requests
 from celery import Celery
 from celery.signals import worker_ready, setup_logging
+from celery.schedules import crontab
 
 import re
 # ... (rest of imports)
@@ -108,15 +109,35 @@ celery.conf.update(
 celery.conf.worker_concurrency = 8
 
 # SECTION 6: Periodic Stats Refresh Schedule
+# Summaries are maintained from staged deltas; the full recompute only reconciles drift
 celery.conf.beat_schedule = {
-    'refresh-stats-every-5-mins': {
+    'merge-stats-every-minute': {
+        'task': 'tasks.gdrive.merge_stats',
+        'schedule': 60.0,
+    },
+    'reconcile-stats-daily': {
         'task': 'tasks.gdrive.refresh_stats',
-        'schedule': 300.0,
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'near-dupes-every-15-minutes': {
+        'task': 'tasks.gdrive.near_dupes',
+        'schedule': 900.0,
+    },
+    'listing-entity-index-every-10-minutes': {
+        'task': 'tasks.listings.entity_index',
+        'schedule': 600.0,
+    },
+    'index-reconcile-every-30-minutes': {
+        'task': 'tasks.indexes.reconcile',
+        'schedule': 1800.0,
     },
 }
 
 celery.autodiscover_tasks(["tasks"])
 
+import tasks.upload_fanout
+import tasks.upload_master_task
+import tasks.index_maintenance_task
 import tasks.listings_task.upload_asklaila_task
 import tasks.listings_task.upload_atm_task
 import tasks.listings_task.upload_bank_task
@@ -132,10 +153,12 @@ import tasks.listings_task.upload_pinda_task
 import tasks.listings_task.upload_post_office_task
 import tasks.listings_task.upload_schoolgis_task
 import tasks.listings_task.upload_yellow_pages_task
+import tasks.listings_task.entity_index_task
 import tasks.listings_task.upload_shiksha_task
 import tasks.products_task.upload_amazon_products_task
 import tasks.products_task.upload_big_basket_task
 import tasks.gdrive_task.etl_tasks
+import tasks.gdrive_task.validation_tasks
 
 
 # SECTION 8: Prometheus Metrics Server (starts with worker)
@@ -149,6 +172,15 @@ def start_metrics_on_worker_ready(**kwargs):
         logging.warning(f"Could not start Prometheus metrics server: {e}")
 
 
+@worker_ready.connect
+def reconcile_indexes_on_worker_ready(**kwargs):
+    """Restore indexes a bulk load dropped before the previous worker died."""
+    try:
+        celery.send_task('tasks.indexes.reconcile')
+    except Exception as e:
+        logging.warning(f"Could not schedule index reconcile: {e}")
+
+
 # SECTION 7: Queue Backlog Monitor
 def check_queue_health():
     """
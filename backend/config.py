@@ -63,6 +63,18 @@ class Config:
     MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "100"))
     ETL_VERSION = os.getenv("ETL_VERSION", "2.0.0")
     BATCH_SIZE = int(os.getenv("BATCH_SIZE", "2000"))
+    # Stream Drive CSVs chunk-by-chunk into the parser instead of buffering whole files
+    CSV_STREAMING = os.getenv("CSV_STREAMING", "true").lower() in ("1", "true", "yes")
+    DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    # Raw ingest write path: 'executemany' (INSERT IGNORE) or 'load_data' (LOAD DATA LOCAL INFILE)
+    RAW_INGEST_ENGINE = os.getenv("RAW_INGEST_ENGINE", "executemany")
+    DB_LOCAL_INFILE = os.getenv("DB_LOCAL_INFILE", "false").lower() in ("1", "true", "yes")
+    # Max distinct CSV header layouts kept in each worker's column-plan LRU
+    COLUMN_PLAN_CACHE_SIZE = int(os.getenv("COLUMN_PLAN_CACHE_SIZE", "256"))
+    # Authorised Drive clients kept per worker process (match the worker's concurrency)
+    DRIVE_CLIENT_POOL_SIZE = int(os.getenv("DRIVE_CLIENT_POOL_SIZE", "8"))
+    # Seconds a task waits for a pooled Drive client before building a one-off client
+    DRIVE_CLIENT_CHECKOUT_TIMEOUT = float(os.getenv("DRIVE_CLIENT_CHECKOUT_TIMEOUT", "30"))
 
 # Instantiate config for import convenience
 config = Config()
@@ -0,0 +1,71 @@
+"""
+Exact-duplicate cleanup for raw_google_map_drive_data (see model/raw_dedupe.py).
+Resumes from its checkpoint in etl_metadata, so rerunning after new ingests only
+reads the new ids.
+
+Usage:
+    python dedupe_raw.py --dry-run             # report what would be deleted, change nothing
+    python dedupe_raw.py                       # dedupe from the checkpoint to MAX(id)
+    python dedupe_raw.py --from-id 0 --to-id 2000000
+    python dedupe_raw.py --reset               # start over from id 0 on the next run
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from sqlalchemy import create_engine
+from urllib.parse import quote_plus
+from dotenv import load_dotenv
+
+from model.raw_dedupe import RawDedupeEngine
+
+load_dotenv()
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+DB_USER = os.getenv('DB_USER')
+DB_PASS = quote_plus(os.getenv('DB_PASSWORD_PLAIN') or "")
+DB_HOST = os.getenv('DB_HOST')
+DB_NAME = os.getenv('DB_NAME')
+DB_PORT = os.getenv('DB_PORT', '3306')
+DATABASE_URI = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Optional: a replica to watch for lag (the dedupe pauses while it falls behind)
+REPLICA_URI = os.getenv('DEDUPE_REPLICA_URI')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumable exact-duplicate cleanup of the raw table.")
+    parser.add_argument("--dry-run", action="store_true", help="report only; no deletes, no checkpoint")
+    parser.add_argument("--from-id", type=int, help="start after this id instead of the checkpoint")
+    parser.add_argument("--to-id", type=int, help="stop at this id (default: current MAX(id))")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--max-lock-waits", type=int, default=5, help="pause while more InnoDB row-lock waits")
+    parser.add_argument("--max-replica-lag", type=int, default=30, help="pause while the replica lags more (s)")
+    parser.add_argument("--reset", action="store_true", help="reset the checkpoint to 0 and exit")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(DATABASE_URI, pool_pre_ping=True)
+    replica = create_engine(REPLICA_URI, pool_pre_ping=True) if REPLICA_URI else None
+    dedupe = RawDedupeEngine(
+        engine, chunk_size=args.chunk_size, max_lock_waits=args.max_lock_waits,
+        max_replica_lag=args.max_replica_lag, replica_engine=replica
+    )
+    if args.reset:
+        dedupe.reset_checkpoint()
+        print("Raw dedupe checkpoint reset to 0.")
+        return 0
+
+    try:
+        stats = dedupe.run(from_id=args.from_id, to_id=args.to_id, dry_run=args.dry_run)
+    except KeyboardInterrupt:
+        print(f"Interrupted; progress is checkpointed. So far: {json.dumps(dict(dedupe.stats))}")
+        return 130
+    label = "would delete" if args.dry_run else "deleted"
+    print(f"{'DRY RUN: ' if args.dry_run else ''}{stats.get('deleted', 0):,} duplicates {label}, "
+          f"{stats.get('signed', 0):,} rows signed in {stats.get('seconds', 0)}s "
+          f"({stats.get('throttled', 0)} throttle pauses, {stats.get('errors', 0)} retried chunks).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Near-duplicate detection over g_map_master_table (see model/near_dupes.py).
+Incremental: each run scores only master rows added since the previous one.
+
+Usage:
+    python find_near_dupes.py                  # scan new rows, then print the largest clusters
+    python find_near_dupes.py --threshold 0.85 --report 50
+    python find_near_dupes.py --reset          # forget blocks/clusters; the next run rescans everything
+"""
+import os
+import sys
+import logging
+import argparse
+from sqlalchemy import create_engine, text
+from urllib.parse import quote_plus
+from dotenv import load_dotenv
+
+from model.near_dupes import NearDuplicateDetector, CHECKPOINT_KEY
+
+load_dotenv()
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+DB_USER = os.getenv('DB_USER')
+DB_PASS = quote_plus(os.getenv('DB_PASSWORD_PLAIN') or "")
+DB_HOST = os.getenv('DB_HOST')
+DB_NAME = os.getenv('DB_NAME')
+DB_PORT = os.getenv('DB_PORT', '3306')
+DATABASE_URI = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+
+
+def print_report(conn, limit):
+    clusters = conn.execute(text("""
+        SELECT cluster_id, COUNT(*) AS members, ROUND(AVG(score), 3)
+        FROM master_duplicate_clusters
+        GROUP BY cluster_id ORDER BY members DESC LIMIT :lim
+    """), {"lim": limit}).fetchall()
+    total = conn.execute(text("SELECT COUNT(DISTINCT cluster_id), COUNT(*) FROM master_duplicate_clusters")).fetchone()
+    print(f"\n{total[0]:,} clusters covering {total[1]:,} master rows. Largest {len(clusters)}:")
+    for cluster_id, members, avg_score in clusters:
+        names = conn.execute(text("""
+            SELECT m.name, m.city, m.phone_number FROM master_duplicate_clusters c
+            JOIN g_map_master_table m ON m.id = c.master_id
+            WHERE c.cluster_id = :cid ORDER BY c.master_id LIMIT 3
+        """), {"cid": cluster_id}).fetchall()
+        sample = " | ".join(f"{n} ({c}, {p})" for n, c, p in names)
+        print(f"  #{cluster_id}: {members} rows, avg score {avg_score} :: {sample}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental near-duplicate detection for g_map_master_table.")
+    parser.add_argument("--threshold", type=float, default=0.9, help="minimum pair score (0-1)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--max-block-size", type=int, default=200, help="members compared per blocking key")
+    parser.add_argument("--report", type=int, default=20, help="print the N largest clusters")
+    parser.add_argument("--reset", action="store_true")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(DATABASE_URI, pool_pre_ping=True)
+    if args.reset:
+        with engine.begin() as conn:
+            conn.execute(text("TRUNCATE TABLE master_dupe_blocks"))
+            conn.execute(text("TRUNCATE TABLE master_duplicate_clusters"))
+            conn.execute(text("DELETE FROM etl_metadata WHERE meta_key = :k"), {"k": CHECKPOINT_KEY})
+        print("Near-duplicate state reset.")
+        return 0
+
+    NearDuplicateDetector(
+        engine, chunk_size=args.chunk_size, threshold=args.threshold, max_block_size=args.max_block_size
+    ).run()
+    if args.report:
+        with engine.connect() as conn:
+            print_report(conn, args.report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,9 @@ from sqlalchemy import create_engine, text
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
 
+from utils.stats_deltas import reconcile_summaries
+from utils.validation_snapshot import reconcile_validation_snapshot
+
 load_dotenv()
 
 db_pass = quote_plus(os.getenv('DB_PASSWORD_PLAIN') or "")
@@ -29,38 +32,75 @@ CREATE TABLE IF NOT EXISTS state_category_summary_v5 (
 );
 """
 
+SQL_CREATE_FILE_SUMMARY = """
+CREATE TABLE IF NOT EXISTS file_record_summary (
+    drive_file_id VARCHAR(255) PRIMARY KEY,
+    record_count BIGINT NOT NULL DEFAULT 0
+);
+"""
+
+SQL_CREATE_DELTA_STAGING = """
+CREATE TABLE IF NOT EXISTS stats_delta_staging (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    state VARCHAR(255) NOT NULL DEFAULT '',
+    category VARCHAR(255) NOT NULL DEFAULT '',
+    drive_file_id VARCHAR(255) NOT NULL DEFAULT '',
+    delta INT NOT NULL
+);
+"""
+
+SQL_CREATE_VALIDATION_SNAPSHOT = """
+CREATE TABLE IF NOT EXISTS validation_dashboard_snapshot (
+    id TINYINT PRIMARY KEY,
+    clean_count BIGINT NOT NULL DEFAULT 0,
+    valid_count BIGINT NOT NULL DEFAULT 0,
+    missing_count BIGINT NOT NULL DEFAULT 0,
+    invalid_count BIGINT NOT NULL DEFAULT 0,
+    duplicate_count BIGINT NOT NULL DEFAULT 0,
+    last_id BIGINT NOT NULL DEFAULT 0,
+    last_batch_at DATETIME NULL
+);
+"""
+
+SQL_CREATE_VALIDATION_STATES = """
+CREATE TABLE IF NOT EXISTS validation_state_snapshot (
+    state VARCHAR(255) PRIMARY KEY,
+    clean_count BIGINT NOT NULL DEFAULT 0
+);
+"""
+
+SQL_CREATE_VALIDATION_DAYS = """
+CREATE TABLE IF NOT EXISTS validation_daily_snapshot (
+    day DATE PRIMARY KEY,
+    clean_count BIGINT NOT NULL DEFAULT 0
+);
+"""
+
 def refresh_summary():
-    with engine.begin() as conn:
-        print("Refreshing Global Summary...")
-        # Global Summary
-        conn.execute(text("INSERT IGNORE INTO dashboard_stats_summary_v5 (id, last_updated) VALUES (1, NOW())"))
-        
-        # Calculate totals
-        res = conn.execute(text("SELECT COUNT(*), COUNT(DISTINCT state), COUNT(DISTINCT category), COUNT(DISTINCT drive_file_id) FROM raw_google_map_drive_data")).fetchone()
-        
-        conn.execute(text("""
-            UPDATE dashboard_stats_summary_v5 
-            SET total_records = :total, 
-                total_states = :states, 
-                total_categories = :cats, 
-                total_csvs = :csvs, 
-                last_updated = NOW() 
-            WHERE id = 1
-        """), {"total": res[0], "states": res[1], "cats": res[2], "csvs": res[3]})
-        
-        print("Refreshing State-Category Summary...")
-        # State-Category Summary
-        conn.execute(text("DELETE FROM state_category_summary_v5"))
-        conn.execute(text("""
-            INSERT INTO state_category_summary_v5 (state, category, record_count)
-            SELECT state, category, COUNT(*) 
-            FROM raw_google_map_drive_data 
-            GROUP BY state, category
-        """))
-        print("Summary updated successfully.")
+    # Same full recompute as the reconcile job, so file_record_summary and staged deltas stay consistent
+    print("Refreshing Global + State-Category + File Summaries...")
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="REPEATABLE READ")
+        with conn.begin():
+            reconcile_summaries(conn)
+    print("Summary updated successfully.")
+
+def refresh_validation_snapshot():
+    print("Seeding/Reconciling Validation Dashboard Snapshot...")
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="REPEATABLE READ")
+        with conn.begin():
+            reconcile_validation_snapshot(conn)
+    print("Validation snapshot updated successfully.")
 
 if __name__ == "__main__":
     with engine.begin() as conn:
         conn.execute(text(SQL_CREATE_SUMMARY))
         conn.execute(text(SQL_CREATE_STATE_CAT))
+        conn.execute(text(SQL_CREATE_FILE_SUMMARY))
+        conn.execute(text(SQL_CREATE_DELTA_STAGING))
+        conn.execute(text(SQL_CREATE_VALIDATION_SNAPSHOT))
+        conn.execute(text(SQL_CREATE_VALIDATION_STATES))
+        conn.execute(text(SQL_CREATE_VALIDATION_DAYS))
     refresh_summary()
+    refresh_validation_snapshot()
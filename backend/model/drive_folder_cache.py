@@ -0,0 +1,191 @@
+import time
+import random
+import logging
+from sqlalchemy import text
+
+logger = logging.getLogger("DriveFolderCache")
+
+# Drive batch endpoint accepts at most 100 sub-requests per HTTP round trip
+DRIVE_BATCH_LIMIT = 100
+
+
+class DriveFolderCache:
+    """
+    Persistent folder metadata cache for ancestor/path resolution.
+
+    Folder rows (id, name, parent) live in `drive_folder_paths` and are loaded once
+    per process, so resolving the path of a file whose ancestors are already known
+    costs zero Drive API calls, across restarts too. Unknown ancestors are fetched
+    level by level with Drive batch HTTP requests (up to 100 `files().get` per round
+    trip) and written back to the table. Rows older than `max_age_days` are ignored
+    on load so renamed or moved folders are eventually picked up again.
+
+    Only a 404 marks a folder as missing for the life of the process. Throttling
+    (403/429), 5xx and transport errors are retried with exponential backoff and,
+    if they persist, left uncached so a later lookup tries again.
+    """
+
+    def __init__(self, service, engine=None, root_id=None, max_depth=8, max_age_days=7,
+                 batch_size=DRIVE_BATCH_LIMIT, max_retries=3, retry_backoff=1.0):
+        self.service = service
+        self.engine = engine
+        self.root_id = root_id
+        self.max_depth = max_depth
+        self.max_age_days = max_age_days
+        self.batch_size = min(batch_size, DRIVE_BATCH_LIMIT)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.folders = {}
+        self.missing = set()
+        self.loaded = False
+        self.batch_requests = 0
+        self.api_calls = 0
+
+    def load(self):
+        """Loads cached folder rows from the database (once)."""
+        if self.loaded:
+            return
+        self.loaded = True
+        if self.engine is None:
+            return
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text("""
+                    SELECT folder_id, folder_name, parent_id FROM drive_folder_paths
+                    WHERE resolved_at >= NOW() - INTERVAL :days DAY
+                """), {"days": self.max_age_days}).fetchall()
+            for folder_id, folder_name, parent_id in rows:
+                self.folders[folder_id] = self._info(folder_id, folder_name, parent_id)
+            logger.info(f"Loaded {len(rows)} cached folders from drive_folder_paths")
+        except Exception as e:
+            logger.warning(f"Folder path cache unavailable, resolving from Drive only: {e}")
+
+    @staticmethod
+    def _info(folder_id, folder_name, parent_id):
+        return {"id": folder_id, "name": folder_name, "parents": [parent_id] if parent_id else []}
+
+    def _persist(self, infos):
+        if self.engine is None or not infos:
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("""
+                    INSERT INTO drive_folder_paths (folder_id, folder_name, parent_id, resolved_at)
+                    VALUES (:folder_id, :folder_name, :parent_id, NOW())
+                    ON DUPLICATE KEY UPDATE folder_name = VALUES(folder_name),
+                        parent_id = VALUES(parent_id), resolved_at = NOW()
+                """), [
+                    {"folder_id": i["id"], "folder_name": i["name"],
+                     "parent_id": (i.get("parents") or [None])[0]}
+                    for i in infos
+                ])
+        except Exception as e:
+            logger.warning(f"Failed to persist {len(infos)} folders to drive_folder_paths: {e}")
+
+    @staticmethod
+    def _is_not_found(exception):
+        status = getattr(getattr(exception, "resp", None), "status", None)
+        return str(status) == "404"
+
+    def fetch_batch(self, folder_ids):
+        """Fetches metadata for folder_ids with batched files().get calls. Returns the infos found."""
+        fetched = []
+        retry = []
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                if self._is_not_found(exception):
+                    self.missing.add(request_id)
+                else:
+                    logger.warning(f"Folder lookup failed for {request_id}: {exception}")
+                    retry.append(request_id)
+                return
+            info = self._info(response["id"], response.get("name"), (response.get("parents") or [None])[0])
+            self.folders[info["id"]] = info
+            fetched.append(info)
+
+        pending = list(folder_ids)
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                wait = self.retry_backoff * (2 ** (attempt - 1)) + random.uniform(0, self.retry_backoff)
+                logger.warning(f"Retrying {len(pending)} folder lookups in {wait:.2f}s...")
+                time.sleep(wait)
+            for i in range(0, len(pending), self.batch_size):
+                chunk = pending[i:i + self.batch_size]
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for fid in chunk:
+                    batch.add(self.service.files().get(fileId=fid, fields="id, name, parents"), request_id=fid)
+                try:
+                    batch.execute()
+                except Exception as e:
+                    logger.warning(f"Folder batch request for {len(chunk)} folders failed: {e}")
+                    answered = {info["id"] for info in fetched} | self.missing | set(retry)
+                    retry.extend(fid for fid in chunk if fid not in answered)
+                self.batch_requests += 1
+                self.api_calls += len(chunk)
+            pending, retry = retry, []
+            if not pending:
+                break
+        if pending:
+            logger.warning(f"Giving up on {len(pending)} folder lookups for now; they stay uncached.")
+
+        self._persist(fetched)
+        return fetched
+
+    def prefetch(self, folder_ids):
+        """
+        Makes sure every folder in folder_ids and its ancestors (up to max_depth, stopping
+        at root_id) are cached. Unknown folders across all chains are fetched together,
+        one batch round per ancestor level.
+        """
+        self.load()
+        frontier = {fid for fid in folder_ids if fid}
+        for _ in range(self.max_depth):
+            unknown = [fid for fid in frontier
+                       if fid != self.root_id and fid not in self.folders and fid not in self.missing]
+            if unknown:
+                self.fetch_batch(unknown)
+            next_frontier = set()
+            for fid in frontier:
+                info = self.folders.get(fid)
+                if info and fid != self.root_id and info["parents"]:
+                    next_frontier.add(info["parents"][0])
+            frontier = next_frontier
+            if not frontier:
+                break
+
+    def get(self, folder_id):
+        """Returns {'id', 'name', 'parents'} for a folder, fetching it if it is not cached."""
+        self.load()
+        if folder_id not in self.folders and folder_id not in self.missing:
+            self.fetch_batch([folder_id])
+        return self.folders.get(folder_id)
+
+    def ancestors(self, folder_id):
+        """Folder infos from the topmost ancestor below root_id down to folder_id."""
+        return self.resolve(folder_id)[0]
+
+    def resolve(self, folder_id):
+        """
+        (ancestors(folder_id), complete). complete is False when the chain stops short at a
+        folder that could not be fetched, so callers should not memoise that path.
+        """
+        self.prefetch([folder_id])
+        chain = []
+        curr_id = folder_id
+        depth = 0
+        while curr_id and curr_id != self.root_id and depth < self.max_depth:
+            info = self.folders.get(curr_id)
+            if not info:
+                return chain, False
+            chain.insert(0, info)
+            curr_id = (info.get("parents") or [None])[0]
+            depth += 1
+        return chain, True
+
+    def path_names(self, folder_id):
+        return [info["name"] for info in self.ancestors(folder_id)]
+
+    def stats(self):
+        return {"cached": len(self.folders), "batch_requests": self.batch_requests,
+                "api_calls": self.api_calls}
@@ -1,17 +1,17 @@
 import os
 import io
 import re
-import time
 import pandas as pd
-import hashlib
 from sqlalchemy import create_engine, text
-from datetime import datetime, timezone
+from datetime import datetime
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
 
+from .drive_folder_cache import DriveFolderCache
+
 load_dotenv()
 
 # --- CONFIGURATION ---
@@ -23,6 +23,9 @@ ROOT_FOLDER_ID = "1ltTYjekxZsk2CdF20tSk1B2FnRn4119E"
 db_pass = quote_plus(os.getenv('DB_PASSWORD_PLAIN') or "")
 DATABASE_URI = f"mysql+pymysql://{os.getenv('DB_USER')}:{db_pass}@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
 
+# Cached folder rows older than this are re-fetched (picks up renames/moves)
+FOLDER_CACHE_MAX_AGE_DAYS = int(os.getenv('GDRIVE_FOLDER_CACHE_MAX_AGE_DAYS', 7))
+
 EXCLUDED_FOLDERS = {
     'darshit', 'riyaz', 'krunali', 'jahnavi', 'harikesh pratap verma', 'thomas', 'ayush', 'anushk', 'hetvi',
     'aarya', 'rohit', 'vedanshi', 'fujel', 'google map data', 'top cities', 'uncategorized', 'cleaned', 'latest', 'all_districts'
@@ -75,7 +78,10 @@ class GDriveSmartIngestor:
         )
         self.service = build('drive', 'v3', credentials=self.creds)
         self.engine = create_engine(DATABASE_URI)
-        self.folder_cache = {} 
+        self.folder_cache = DriveFolderCache(
+            self.service, self.engine, root_id=ROOT_FOLDER_ID,
+            max_depth=8, max_age_days=FOLDER_CACHE_MAX_AGE_DAYS
+        )
         self.resolution_cache = {} # Cache for (city, category, path) by parent_folder_id
 
 
@@ -113,36 +119,26 @@ class GDriveSmartIngestor:
             print(f"Error updating sync metadata: {e}")
 
     def get_folder_info(self, folder_id):
-        """Fetches folder name and parents with caching."""
-        if folder_id in self.folder_cache:
-            return self.folder_cache[folder_id]
+        """Fetches folder name and parents (persistent cache first, then Drive)."""
         try:
-            meta = self.service.files().get(fileId=folder_id, fields="id, name, parents").execute()
-            self.folder_cache[folder_id] = meta
-            return meta
+            return self.folder_cache.get(folder_id)
         except Exception:
             return None
 
+    def prefetch_folders(self, csv_files):
+        """Resolves every ancestor of the given files up front in batched Drive requests."""
+        parent_ids = {f.get('parents', [None])[0] for f in csv_files}
+        self.folder_cache.prefetch(parent_ids)
+
     def get_root_city_folder(self, file_meta):
         """Finds which root folder (direct child of ROOT_FOLDER_ID) this file belongs to."""
         curr_id = file_meta.get('parents', [None])[0]
         if not curr_id: return None
-        
-        path_cache = []
-        depth = 0
-        while curr_id and curr_id != ROOT_FOLDER_ID and depth < 8:
-            info = self.get_folder_info(curr_id)
-            if not info: break
-            path_cache.insert(0, info)
-            parents = info.get('parents')
-            if not parents: break
-            
-            if ROOT_FOLDER_ID in parents:
-                # This folder is a direct child of root!
-                return info
-            
-            curr_id = parents[0]
-            depth += 1
+
+        chain = self.folder_cache.ancestors(curr_id)
+        if chain and ROOT_FOLDER_ID in chain[0].get('parents', []):
+            # Topmost folder of the chain is a direct child of root!
+            return chain[0]
         return None
 
     def resolve_city_and_category(self, csv_meta, parents):
@@ -159,17 +155,10 @@ class GDriveSmartIngestor:
         if parent_id and parent_id in self.resolution_cache:
             path_folders = self.resolution_cache[parent_id]
         else:
-            path_folders = []
-            if parents:
-                curr_id = parents[0]
-                depth_limit = 8
-                while curr_id and curr_id != ROOT_FOLDER_ID and depth_limit > 0:
-                    info = self.get_folder_info(curr_id)
-                    if not info: break
-                    path_folders.insert(0, info['name'])
-                    curr_id = info.get('parents', [None])[0]
-                    depth_limit -= 1
-            if parent_id:
+            chain, complete = self.folder_cache.resolve(parents[0]) if parents else ([], False)
+            path_folders = [info["name"] for info in chain]
+            # A path cut short by a failed folder lookup is retried on the next file, not memoised
+            if parent_id and complete:
                 self.resolution_cache[parent_id] = path_folders
         
         full_path = "/".join(path_folders)
@@ -443,6 +432,8 @@ class GDriveSmartIngestor:
                 return
 
             print(f"Detected {len(all_csvs)} modified CSVs. Grouping by root city...")
+            self.prefetch_folders(all_csvs)
+            print(f"Folder cache: {self.folder_cache.stats()}")
             
             # 2. Group CSVs by Root City Folder
             city_groups = {} # folder_id -> {'info': folder_meta, 'csvs': []}
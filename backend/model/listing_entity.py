@@ -0,0 +1,47 @@
+from extensions import db
+from datetime import datetime
+
+
+class ListingEntity(db.Model):
+    """One real-world business across listing sources (maintained by model/listing_entity_index.py)."""
+    __tablename__ = 'listing_entities'
+
+    # Lowest listing_master_table.id in the entity
+    entity_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    business_name = db.Column(db.String(255))
+    # Lower-cased, whitespace-collapsed name: indexed prefix search instead of '%search%'
+    name_key = db.Column(db.String(255), index=True)
+    category = db.Column(db.String(255))
+    city = db.Column(db.String(100))
+    listing_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+    source_count = db.Column(db.Integer, nullable=False, default=0)
+    sources = db.Column(db.String(1000))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "entity_id": self.entity_id,
+            "business_name": self.business_name,
+            "category": self.category,
+            "city": self.city,
+            "total_listings": self.listing_count,
+            "source_count": self.source_count,
+            "sources": self.sources,
+        }
+
+
+class ListingEntityMember(db.Model):
+    __tablename__ = 'listing_entity_members'
+
+    listing_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    entity_id = db.Column(db.Integer, nullable=False, index=True)
+    source = db.Column(db.String(50))
+    score = db.Column(db.Float)
+
+
+class ListingEntityBlock(db.Model):
+    """Blocking-key membership, so new listings are only compared within their blocks."""
+    __tablename__ = 'listing_entity_blocks'
+
+    block_key = db.Column(db.String(191), primary_key=True)
+    listing_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
@@ -0,0 +1,100 @@
+"""
+Cross-source entity index for listing_master_table.
+
+Links listings from JustDial, Google Maps, Asklaila, Magicpin, ... that describe the same
+business, using the near-duplicate machinery of model/near_dupes.py: blocking on
+normalised phone (mobile, else phone), name prefix + city and geohash, then Jaro-Winkler /
+token-set scoring within blocks. Every listing is a member of exactly one entity
+(listing_entity_members); an entity's id is its lowest listing id. listing_entities
+holds each entity's listing count and source set, maintained incrementally for the
+entities a chunk touches, so /api/listing-master reads the top 100 straight off
+idx(listing_count) instead of aggregating the whole table per request.
+
+Runs incrementally from listing_entity_last_id (etl_metadata). Listings deleted from
+listing_master_table are not removed from the index; --reset style rebuilds are a
+TRUNCATE of the three tables plus the checkpoint.
+"""
+from sqlalchemy import text, bindparam
+
+from model.near_dupes import NearDuplicateDetector, assign_clusters
+
+ENTITY_BATCH = 500
+
+
+class ListingEntityIndexer(NearDuplicateDetector):
+    source_table = "listing_master_table"
+    blocks_table = "listing_entity_blocks"
+    block_id_column = "listing_id"
+    checkpoint_key = "listing_entity_last_id"
+
+    def select_columns(self, conn):
+        return [
+            "id", "business_name AS name", "address",
+            "COALESCE(NULLIF(mobile, ''), phone) AS phone_number",
+            "city", "latitude", "longitude", "source",
+        ]
+
+    def _member_entities(self, conn, ids):
+        if not ids:
+            return {}
+        rows = conn.execute(text(
+            "SELECT listing_id, entity_id FROM listing_entity_members WHERE listing_id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)), {"ids": list(ids)}).fetchall()
+        return dict(rows)
+
+    def save_matches(self, conn, new_rows, matches):
+        involved = {a for a, _, _, _ in matches} | {b for _, b, _, _ in matches}
+        existing = self._member_entities(conn, involved - set(new_rows))
+        assignments, renames = assign_clusters(matches, existing)
+        for old, new in renames.items():
+            conn.execute(text("UPDATE listing_entity_members SET entity_id = :new WHERE entity_id = :old"),
+                         {"old": old, "new": new})
+            conn.execute(text("DELETE FROM listing_entities WHERE entity_id = :old"), {"old": old})
+
+        best = self.best_matches(matches)
+        members = [
+            {"listing_id": row_id, "entity_id": assignments.get(row_id, row_id),
+             "source": row.get('source'), "score": best[row_id][1] if row_id in best else None}
+            for row_id, row in new_rows.items()
+        ]
+        # Older listings pulled into a different entity by this chunk
+        members += [
+            {"listing_id": row_id, "entity_id": entity_id, "source": None, "score": best[row_id][1]}
+            for row_id, entity_id in assignments.items()
+            if row_id not in new_rows and existing.get(row_id) != entity_id
+        ]
+        if members:
+            conn.execute(text("""
+                INSERT INTO listing_entity_members (listing_id, entity_id, source, score)
+                VALUES (:listing_id, :entity_id, :source, :score)
+                ON DUPLICATE KEY UPDATE entity_id = VALUES(entity_id),
+                    source = COALESCE(VALUES(source), source),
+                    score = GREATEST(COALESCE(score, 0), COALESCE(VALUES(score), 0))
+            """), members)
+        self.refresh_entities(conn, {m["entity_id"] for m in members} | set(renames.values()))
+
+    def refresh_entities(self, conn, entity_ids):
+        """Recomputes count and source set of the given entities (each scan is one entity's members)."""
+        entity_ids = sorted(entity_ids)
+        for i in range(0, len(entity_ids), ENTITY_BATCH):
+            conn.execute(text("""
+                INSERT INTO listing_entities
+                    (entity_id, business_name, name_key, category, city,
+                     listing_count, source_count, sources, updated_at)
+                SELECT agg.entity_id, l.business_name,
+                       REGEXP_REPLACE(LOWER(TRIM(l.business_name)), '[[:space:]]+', ' '), l.category, l.city,
+                       agg.n, agg.source_count, agg.sources, NOW()
+                FROM (
+                    SELECT entity_id, COUNT(*) AS n, COUNT(DISTINCT source) AS source_count,
+                           GROUP_CONCAT(DISTINCT source ORDER BY source) AS sources
+                    FROM listing_entity_members
+                    WHERE entity_id IN :ids
+                    GROUP BY entity_id
+                ) agg
+                JOIN listing_master_table l ON l.id = agg.entity_id
+                ON DUPLICATE KEY UPDATE
+                    business_name = VALUES(business_name), name_key = VALUES(name_key),
+                    category = VALUES(category), city = VALUES(city),
+                    listing_count = VALUES(listing_count), source_count = VALUES(source_count),
+                    sources = VALUES(sources), updated_at = VALUES(updated_at)
+            """).bindparams(bindparam("ids", expanding=True)), {"ids": entity_ids[i:i + ENTITY_BATCH]})
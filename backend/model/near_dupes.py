@@ -0,0 +1,284 @@
+"""
+Incremental near-duplicate detection for g_map_master_table.
+
+Rows are never compared all-against-all. Each row gets a few blocking keys:
+  p:<phone>              normalised phone (last 10 digits)
+  n:<name prefix>|<city> first 3 characters of the compacted name, plus the city
+  g:<geohash6>           only when the table has latitude/longitude columns
+and is scored only against rows sharing a key. Scoring uses Jaro-Winkler and token-set
+similarity on names, plus phone, city and address agreement (score_pair).
+
+Block membership is persisted in master_dupe_blocks, so a run only reads master rows
+past its checkpoint (near_dupe_last_id in etl_metadata) and looks up their blocks.
+Each key contributes at most `max_block_size` of its newest members, so junk keys
+(shared placeholder phones, "shr|ahmedabad") cannot turn a run quadratic: the cost is
+O(new rows x keys x max_block_size). Matches are merged with union-find into
+master_duplicate_clusters (cluster_id = lowest master id in the cluster). Each chunk
+commits with its checkpoint, so an interrupted run resumes where it stopped.
+"""
+import re
+import time
+import logging
+from collections import defaultdict
+from sqlalchemy import text, bindparam
+
+from model.normalizer import UniversalNormalizer
+from utils.similarity import jaro_winkler, token_set_ratio, geohash
+
+logger = logging.getLogger("NearDupes")
+
+MASTER_TABLE = "g_map_master_table"
+CHECKPOINT_KEY = "near_dupe_last_id"
+_NAME_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def compact_name(name):
+    return _NAME_RE.sub('', (name or "").lower())
+
+
+def normalised_phone(row):
+    phone = UniversalNormalizer.normalize_phone(row.get('phone_number'))
+    return phone[-10:] if len(phone) >= 8 else ""
+
+
+def blocking_keys(row):
+    keys = []
+    phone = normalised_phone(row)
+    if phone:
+        keys.append(f"p:{phone}")
+    name = compact_name(row.get('name'))
+    city = (row.get('city') or "").strip().lower()
+    if len(name) >= 3 and city:
+        keys.append(f"n:{name[:3]}|{city}"[:191])
+    cell = geohash(row.get('latitude'), row.get('longitude'))
+    if cell:
+        keys.append(f"g:{cell}")
+    return keys
+
+
+def score_pair(a, b):
+    """(score, method) for two master rows; score 0 when they cannot be the same place."""
+    name_a, name_b = (a.get('name') or "").lower().strip(), (b.get('name') or "").lower().strip()
+    if not name_a or not name_b:
+        return 0.0, None
+    name_sim = max(jaro_winkler(compact_name(name_a), compact_name(name_b)), token_set_ratio(name_a, name_b))
+    phone_a = normalised_phone(a)
+    if phone_a and phone_a == normalised_phone(b):
+        return 0.6 + 0.4 * name_sim, "phone+name"
+    same_city = (a.get('city') or "").strip().lower() == (b.get('city') or "").strip().lower()
+    cell = geohash(a.get('latitude'), a.get('longitude'))
+    same_cell = cell is not None and cell == geohash(b.get('latitude'), b.get('longitude'))
+    if not (same_city or same_cell):
+        return 0.0, None
+    return 0.65 * name_sim + 0.35 * token_set_ratio(a.get('address'), b.get('address')), "name+address"
+
+
+def find_matches(new_rows, candidates, block_members, threshold, max_block_size=200):
+    """
+    Scores each new row against the members of its blocks (older rows and earlier new
+    rows). new_rows/candidates are {id: row}; block_members is {key: [ids]}.
+    Returns [(new_id, other_id, score, method)] for pairs at or above `threshold`.
+    """
+    matches = []
+    seen_in_chunk = defaultdict(list)
+    for row_id in sorted(new_rows):
+        row = new_rows[row_id]
+        compared = set()
+        for key in blocking_keys(row):
+            for other_id in block_members.get(key, []) + seen_in_chunk[key][-max_block_size:]:
+                if other_id == row_id or other_id in compared:
+                    continue
+                compared.add(other_id)
+                other = new_rows.get(other_id) or candidates.get(other_id)
+                if other is None:
+                    continue
+                score, method = score_pair(row, other)
+                if score >= threshold:
+                    matches.append((row_id, other_id, round(score, 4), method))
+            seen_in_chunk[key].append(row_id)
+    return matches
+
+
+def assign_clusters(matches, existing):
+    """
+    Union-find over matched pairs and existing memberships ({master_id: cluster_id}).
+    Returns ({master_id: cluster_id} for every matched row, {old_cluster_id: new_cluster_id}).
+    """
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(x, y):
+        rx, ry = find(x), find(y)
+        if rx != ry:
+            parent[max(rx, ry)] = min(rx, ry)
+
+    for a, b, _, _ in matches:
+        union(a, b)
+        for node in (a, b):
+            if node in existing:
+                union(node, existing[node])
+    assignments = {}
+    for a, b, _, _ in matches:
+        assignments[a] = find(a)
+        assignments[b] = find(b)
+    renames = {}
+    for node in assignments:
+        old = existing.get(node)
+        if old is not None and find(old) != old:
+            renames[old] = find(old)
+    return assignments, renames
+
+
+class NearDuplicateDetector:
+    """
+    Block-and-score driver. Subclasses point it at another table by overriding the class
+    attributes, select_columns() (aliased to id/name/address/phone_number/city and
+    optionally latitude/longitude) and save_matches().
+    """
+    source_table = MASTER_TABLE
+    blocks_table = "master_dupe_blocks"
+    block_id_column = "master_id"
+    checkpoint_key = CHECKPOINT_KEY
+
+    def __init__(self, engine, chunk_size=5000, threshold=0.9, max_block_size=200, key_batch=500):
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+        self.key_batch = key_batch
+        self._columns = None
+
+    def select_columns(self, conn):
+        """Master columns to read; coordinates only where the table has them."""
+        present = {r[0] for r in conn.execute(text("""
+            SELECT COLUMN_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t
+        """), {"t": self.source_table}).fetchall()}
+        return ["id", "name", "address", "phone_number", "city"] + \
+            [c for c in ("latitude", "longitude") if c in present]
+
+    def columns(self, conn):
+        if self._columns is None:
+            self._columns = self.select_columns(conn)
+        return self._columns
+
+    def get_checkpoint(self, conn):
+        row = conn.execute(text("SELECT meta_value FROM etl_metadata WHERE meta_key = :k"),
+                           {"k": self.checkpoint_key}).fetchone()
+        return int(row[0]) if row and str(row[0]).isdigit() else 0
+
+    def _rows(self, conn, where, params):
+        sql = text(f"SELECT {', '.join(self.columns(conn))} FROM {self.source_table} WHERE {where}")
+        if "ids" in params:
+            sql = sql.bindparams(bindparam("ids", expanding=True))
+        return {r['id']: dict(r) for r in conn.execute(sql, params).mappings().fetchall()}
+
+    def _block_members(self, conn, keys):
+        """The newest `max_block_size` members of each key (bounded work per key)."""
+        members = defaultdict(list)
+        keys = list(keys)
+        for i in range(0, len(keys), self.key_batch):
+            part = keys[i:i + self.key_batch]
+            union = " UNION ALL ".join(
+                f"(SELECT block_key, {self.block_id_column} FROM {self.blocks_table} WHERE block_key = :k{j} "
+                f"ORDER BY {self.block_id_column} DESC LIMIT {int(self.max_block_size)})"
+                for j in range(len(part))
+            )
+            for key, row_id in conn.execute(text(union), {f"k{j}": k for j, k in enumerate(part)}).fetchall():
+                members[key].append(row_id)
+        return members
+
+    def _existing_clusters(self, conn, ids):
+        if not ids:
+            return {}
+        rows = conn.execute(text(
+            "SELECT master_id, cluster_id FROM master_duplicate_clusters WHERE master_id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)), {"ids": list(ids)}).fetchall()
+        return dict(rows)
+
+    @staticmethod
+    def best_matches(matches):
+        """{row_id: (other_id, score, method)} of each row's highest-scoring match."""
+        best = {}
+        for a, b, score, method in matches:
+            for row_id, other in ((a, b), (b, a)):
+                if row_id not in best or score > best[row_id][1]:
+                    best[row_id] = (other, score, method)
+        return best
+
+    def save_matches(self, conn, new_rows, matches):
+        if not matches:
+            return
+        involved = {a for a, _, _, _ in matches} | {b for _, b, _, _ in matches}
+        existing = self._existing_clusters(conn, involved)
+        assignments, renames = assign_clusters(matches, existing)
+        for old, new in renames.items():
+            conn.execute(text("UPDATE master_duplicate_clusters SET cluster_id = :new WHERE cluster_id = :old"),
+                         {"old": old, "new": new})
+        best = self.best_matches(matches)
+        conn.execute(text("""
+            INSERT INTO master_duplicate_clusters (master_id, cluster_id, matched_id, score, method, detected_at)
+            VALUES (:master_id, :cluster_id, :matched_id, :score, :method, NOW())
+            ON DUPLICATE KEY UPDATE cluster_id = VALUES(cluster_id),
+                matched_id = IF(VALUES(score) > score, VALUES(matched_id), matched_id),
+                method = IF(VALUES(score) > score, VALUES(method), method),
+                score = GREATEST(score, VALUES(score))
+        """), [
+            {"master_id": row_id, "cluster_id": cluster_id, "matched_id": best[row_id][0],
+             "score": best[row_id][1], "method": best[row_id][2]}
+            for row_id, cluster_id in assignments.items()
+        ])
+
+    def process_chunk(self, conn, lo, hi):
+        """Detects near duplicates for ids in (lo, hi]. Returns (rows, matches)."""
+        new_rows = self._rows(conn, "id > :lo AND id <= :hi", {"lo": lo, "hi": hi})
+        if not new_rows:
+            return 0, 0
+        keys_by_row = {row_id: blocking_keys(row) for row_id, row in new_rows.items()}
+        block_members = self._block_members(conn, {k for keys in keys_by_row.values() for k in keys})
+        candidate_ids = {m for ids in block_members.values() for m in ids} - set(new_rows)
+        candidates = self._rows(conn, "id IN :ids", {"ids": list(candidate_ids)}) if candidate_ids else {}
+
+        matches = find_matches(new_rows, candidates, block_members, self.threshold, self.max_block_size)
+        self.save_matches(conn, new_rows, matches)
+
+        block_rows = [{"k": k, "id": row_id} for row_id, keys in keys_by_row.items() for k in keys]
+        if block_rows:
+            conn.execute(text(
+                f"INSERT IGNORE INTO {self.blocks_table} (block_key, {self.block_id_column}) VALUES (:k, :id)"
+            ), block_rows)
+        return len(new_rows), len(matches)
+
+    def run(self, max_chunks=None, shutdown_event=None):
+        """Processes rows past the checkpoint. Returns {'rows', 'matches', 'last_id', 'seconds'}."""
+        start = time.time()
+        stats = {"rows": 0, "matches": 0}
+        with self.engine.connect() as conn:
+            lo = self.get_checkpoint(conn)
+            max_id = conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {self.source_table}")).scalar()
+        chunks = 0
+        while lo < max_id and (max_chunks is None or chunks < max_chunks):
+            if shutdown_event is not None and shutdown_event.is_set():
+                break
+            hi = min(lo + self.chunk_size, max_id)
+            with self.engine.begin() as conn:
+                rows, matches = self.process_chunk(conn, lo, hi)
+                conn.execute(text("""
+                    INSERT INTO etl_metadata (meta_key, meta_value) VALUES (:k, :v)
+                    ON DUPLICATE KEY UPDATE meta_value = VALUES(meta_value)
+                """), {"k": self.checkpoint_key, "v": str(hi)})
+            stats["rows"] += rows
+            stats["matches"] += matches
+            lo = hi
+            chunks += 1
+        stats["last_id"] = lo
+        stats["seconds"] = round(time.time() - start, 1)
+        logger.info(f"{type(self).__name__}: {stats['rows']:,} rows, {stats['matches']:,} matches, "
+                    f"up to id {lo:,} in {stats['seconds']}s")
+        return stats
@@ -1,4 +1,6 @@
 import re
+import json
+import hashlib
 import unicodedata
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -36,6 +38,16 @@ import unicodedata
 #        Data is preserved EXACTLY as received from Google Drive.
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Precompiled patterns (hot path: called for every cell of every row)
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+_SPACE_DASH_RE = re.compile(r'[\s\-]')
+_NON_DIGIT_RE = re.compile(r'\D')
+_SCHEME_RE = re.compile(r'^https?://')
+_WWW_RE = re.compile(r'^www\.')
+_INT_RE = re.compile(r'\d+')
+_FLOAT_RE = re.compile(r'[-+]?\d*\.?\d+')
+
 # State map for canonical names (English abbreviations → Full names)
 STATE_MAP = {
     # Abbreviations
@@ -74,6 +86,21 @@ INDIAN_STATES_FULL = [
 ]
 
 
+# Common variations for Indian data headers
+HEADER_MAPPINGS = {
+    "name": ["name", "business name", "company name", "naam", "नाम", "નામ", "பெயர்", "పేరు", "ಹೆಸರು", "പേര്", "নাম"],
+    "address": ["address", "location", "full address", "पता", "સરનામું", "மேகவரி", "చిరునామా", "ವಿಳಾಸ", "മേൽವിലാസം", "ঠিকানা"],
+    "phone_number": ["phone", "phone number", "contact", "mobile", "tel", "फोन", "ફોન", "தொலைபேசி", "ఫోన్", "ಫೋನ್", "ഫോൺ", "ফোন"],
+    "city": ["city", "town", "location city", "शहर", "શહેર", "நகரம்", "నగరం", "ನಗರ", "നഗരം", "শহর"],
+    "state": ["state", "province", "region", "राज्य", "રાજ્ય", "மாநிலம்", "రాష్ట్రం", "ರಾಜ್ಯ", "സംസ്ഥാനം", "রাজ্য"],
+    "category": ["category", "type", "business type", "श्रेणी", "શ્રેણી", "வகை", "ವರ್ಗ", "వర్గం", "വിഭാഗം", "বিভাগ"],
+    "subcategory": ["subcategory", "sub-category", "उपश्रेणी", "ઉપશ્રેણી"],
+    "website": ["website", "url", "link", "वेबसाइट", "વેબસાઇટ"],
+    "reviews_count": ["reviews_count", "reviews", "total reviews", "समीक्षाएं"],
+    "reviews_average": ["reviews_average", "rating", "avg rating", "रेटिंग"],
+}
+
+
 class UniversalNormalizer:
     """
     Unicode-safe normalizer. Preserves ALL scripts (Devanagari, Gujarati,
@@ -94,7 +121,7 @@ class UniversalNormalizer:
         # This is the FASTEST Unicode normalization and is non-destructive
         val = unicodedata.normalize('NFKC', val)
         # Collapse excessive whitespace
-        val = re.sub(r'\s+', ' ', val).strip()
+        val = _WHITESPACE_RE.sub(' ', val).strip()
         return val
 
     @staticmethod
@@ -107,7 +134,7 @@ class UniversalNormalizer:
         if cleaned.lower() in ('nan', 'none', 'nat', '', 'unknown'):
             return "unknown"
         # Try English abbreviation lookup (lowercase, no spaces)
-        lookup_key = re.sub(r'[^a-z0-9]', '', cleaned.lower())
+        lookup_key = _NON_ALNUM_RE.sub('', cleaned.lower())
         if lookup_key in STATE_MAP:
             return STATE_MAP[lookup_key]
         # If it's in a regional script, preserve as-is
@@ -133,7 +160,7 @@ class UniversalNormalizer:
         addr = str(val or "").strip()
         if not addr: return False
         # Remove spaces/dashes to check if only digits remain
-        stripped = re.sub(r'[\s\-]', '', addr)
+        stripped = _SPACE_DASH_RE.sub('', addr)
         return stripped.isdigit() and len(stripped) > 3
 
     @staticmethod
@@ -142,7 +169,7 @@ class UniversalNormalizer:
         if not val:
             return ""
         # 1. Extract digits only
-        s = re.sub(r'\D', '', str(val))
+        s = _NON_DIGIT_RE.sub('', str(val))
         
         # 2. Aggressive Indian normalization
         # Remove all leading zeros first (handles 07085485781 -> 7085485781)
@@ -162,8 +189,8 @@ class UniversalNormalizer:
         val = str(val).strip().lower()
         if val in ('nan', 'none', 'nat', ''):
             return ""
-        val = re.sub(r'^https?://', '', val)
-        val = re.sub(r'^www\.', '', val)
+        val = _SCHEME_RE.sub('', val)
+        val = _WWW_RE.sub('', val)
         return val.rstrip('/')
 
     @staticmethod
@@ -175,7 +202,7 @@ class UniversalNormalizer:
         if val.lower() in ('nan', 'none', 'nat', ''):
             return ""
         val = unicodedata.normalize('NFKC', val)
-        val = re.sub(r'\s+', ' ', val).strip()
+        val = _WHITESPACE_RE.sub(' ', val).strip()
         return val
 
     @staticmethod
@@ -184,7 +211,7 @@ class UniversalNormalizer:
         if val is None: return 0
         val_str = str(val).strip().lower()
         if val_str in ('', 'nan', 'none', 'nat'): return 0
-        match = re.search(r'\d+', val_str)
+        match = _INT_RE.search(val_str)
         return int(match.group()) if match else 0
 
     @staticmethod
@@ -193,7 +220,7 @@ class UniversalNormalizer:
         if val is None: return 0.0
         val_str = str(val).strip().lower()
         if val_str in ('', 'nan', 'none', 'nat'): return 0.0
-        match = re.search(r'[-+]?\d*\.?\d+', val_str)
+        match = _FLOAT_RE.search(val_str)
         return float(match.group()) if match else 0.0
 
     @staticmethod
@@ -209,21 +236,7 @@ class UniversalNormalizer:
     @staticmethod
     def get_fuzzy(row, canonical_key):
         """🔍 Smart header mapping for multilingual CSVs."""
-        # Common variations for Indian data headers
-        MAPPINGS = {
-            "name": ["name", "business name", "company name", "naam", "नाम", "નામ", "பெயர்", "పేరు", "ಹೆಸರು", "പേര്", "নাম"],
-            "address": ["address", "location", "full address", "पता", "સરનામું", "மேகவரி", "చిరునామా", "ವಿಳಾಸ", "മേൽವിലാസം", "ঠিকানা"],
-            "phone_number": ["phone", "phone number", "contact", "mobile", "tel", "फोन", "ફોન", "தொலைபேசி", "ఫోన్", "ಫೋನ್", "ഫോൺ", "ফোন"],
-            "city": ["city", "town", "location city", "शहर", "શહેર", "நகரம்", "నగరం", "ನಗರ", "നഗരം", "শহর"],
-            "state": ["state", "province", "region", "राज्य", "રાજ્ય", "மாநிலம்", "రాష్ట్రం", "ರಾಜ್ಯ", "സംസ്ഥാനം", "রাজ্য"],
-            "category": ["category", "type", "business type", "श्रेणी", "શ્રેણી", "வகை", "ವರ್ಗ", "వర్గం", "വിഭാഗം", "বিভাগ"],
-            "subcategory": ["subcategory", "sub-category", "उपश्रेणी", "ઉપશ્રેણી"],
-            "website": ["website", "url", "link", "वेबसाइट", "વેબસાઇટ"],
-            "reviews_count": ["reviews_count", "reviews", "total reviews", "समीक्षाएं"],
-            "reviews_average": ["reviews_average", "rating", "avg rating", "रेटिंग"],
-        }
-        
-        candidates = MAPPINGS.get(canonical_key, [canonical_key])
+        candidates = HEADER_MAPPINGS.get(canonical_key, [canonical_key])
         
         # 1. Exact match
         for c in candidates:
@@ -294,3 +307,146 @@ class UniversalNormalizer:
             "drive_file_path": row.get("drive_file_path"),
             "drive_uploaded_time": cls.normalize_date(row.get("drive_uploaded_time")),
         }
+
+    # ───────────────────────────────────────────────────────────────────────
+    #  BATCH API — resolve headers once, normalise column-by-column
+    # ───────────────────────────────────────────────────────────────────────
+    FUZZY_KEYS = (
+        "name", "address", "website", "phone_number", "reviews_count",
+        "reviews_average", "category", "subcategory", "city", "state",
+    )
+    DIRECT_KEYS = (
+        "area", "drive_folder_id", "drive_folder_name", "drive_file_id",
+        "drive_file_name", "drive_file_path", "drive_uploaded_time",
+    )
+    # Optional shared column-plan cache (installed by ETL workers, see utils/column_plan_cache.py)
+    plan_cache = None
+
+    @staticmethod
+    def mappings_fingerprint():
+        """Short hash of HEADER_MAPPINGS; changes whenever header resolution rules change."""
+        payload = json.dumps(HEADER_MAPPINGS, sort_keys=True, ensure_ascii=False)
+        return hashlib.md5(payload.encode('utf-8')).hexdigest()[:12]
+
+    @classmethod
+    def resolve_column_plan(cls, keys):
+        """Maps each fuzzy canonical key to the actual row key get_fuzzy would pick (or None).
+        Runs get_fuzzy against a key->key probe, so resolution is identical by construction."""
+        probe = {k: k for k in keys}
+        return {canonical: cls.get_fuzzy(probe, canonical) for canonical in cls.FUZZY_KEYS}
+
+    @staticmethod
+    def _map_column(fn, values):
+        """Applies fn once per distinct value (city/state/category repeat heavily within a file)."""
+        cache = {}
+        out = []
+        for v in values:
+            try:
+                if v.__class__ is tuple:
+                    key = tuple((x.__class__, x) for x in v)
+                else:
+                    key = (v.__class__, v)
+                res = cache[key]
+            except KeyError:
+                res = cache[key] = fn(v)
+            except TypeError:  # unhashable (e.g. DictReader restkey lists)
+                res = fn(v)
+            out.append(res)
+        return out
+
+    @classmethod
+    def _normalize_group(cls, rows, plan, full, extra):
+        """Normalises rows that share one key layout. Returns dicts in normalize_row_* key order."""
+        def column(key):
+            if key is None:
+                return [None] * len(rows)
+            if key in extra:
+                return [extra[key]] * len(rows)
+            return [row.get(key) for row in rows]
+
+        fuzzy = {canonical: column(plan[canonical]) for canonical in cls.FUZZY_KEYS}
+        direct = {key: column(key) for key in cls.DIRECT_KEYS}
+
+        city_state = cls._map_column(
+            lambda pair: cls.extract_state_from_city(*pair),
+            list(zip(fuzzy["city"], fuzzy["state"]))
+        )
+        cities = [cs[0] for cs in city_state]
+        states = [cs[1] for cs in city_state]
+
+        if full:
+            cols = {
+                "name": cls._map_column(cls.clean_text, fuzzy["name"]),
+                "address": cls._map_column(cls.clean_text, fuzzy["address"]),
+                "website": cls._map_column(cls.normalize_website, fuzzy["website"]),
+                "phone_number": cls._map_column(cls.normalize_phone, fuzzy["phone_number"]),
+                "reviews_count": cls._map_column(cls.normalize_int, fuzzy["reviews_count"]),
+                "reviews_average": cls._map_column(cls.normalize_float, fuzzy["reviews_average"]),
+                "category": cls._map_column(cls.normalize_category, fuzzy["category"]),
+                "subcategory": cls._map_column(cls.clean_text, fuzzy["subcategory"]),
+                "city": cls._map_column(cls.clean_text, cities),
+                "state": cls._map_column(cls.normalize_state, states),
+                "area": cls._map_column(cls.clean_text, direct["area"]),
+            }
+        else:
+            cols = {
+                "name": cls._map_column(cls.clean_text, fuzzy["name"]),
+                "address": fuzzy["address"],
+                "website": fuzzy["website"],
+                "phone_number": fuzzy["phone_number"],
+                "reviews_count": cls._map_column(cls.normalize_int, fuzzy["reviews_count"]),
+                "reviews_average": cls._map_column(cls.normalize_float, fuzzy["reviews_average"]),
+                "category": fuzzy["category"],
+                "subcategory": fuzzy["subcategory"],
+                "city": cities,
+                "state": states,
+                "area": direct["area"],
+            }
+        for key in cls.DIRECT_KEYS[1:-1]:
+            cols[key] = direct[key]
+        cols["drive_uploaded_time"] = cls._map_column(cls.normalize_date, direct["drive_uploaded_time"])
+
+        names = list(cols.keys())
+        return [dict(zip(names, values)) for values in zip(*cols.values())]
+
+    @classmethod
+    def normalize_batch(cls, rows, full=False, extra=None, on_error=None):
+        """
+        Batch equivalent of normalize_row_raw (full=False) / normalize_row_full (full=True).
+        `extra` holds per-file constants merged over every row, like {**row, **extra}.
+        Output is identical to calling the per-row function on each merged row.
+        Returns a list aligned with `rows`; rows that fail are None and reported via on_error(index, exc).
+        """
+        extra = extra or {}
+        if not rows:
+            return []
+
+        # Group by key layout (normally one group per file / query)
+        groups = {}
+        for idx, row in enumerate(rows):
+            groups.setdefault(tuple(row), []).append(idx)
+
+        results = [None] * len(rows)
+        for keys, indices in groups.items():
+            merged_keys = keys + tuple(k for k in extra if k not in keys)
+            group_rows = [rows[i] for i in indices]
+            try:
+                if cls.plan_cache is not None:
+                    plan = cls.plan_cache.get(merged_keys)
+                else:
+                    plan = cls.resolve_column_plan(merged_keys)
+                normalized = cls._normalize_group(group_rows, plan, full, extra)
+            except Exception:
+                # Fall back to per-row so one bad value only costs its own row
+                normalized = []
+                per_row = cls.normalize_row_full if full else cls.normalize_row_raw
+                for i, row in zip(indices, group_rows):
+                    try:
+                        normalized.append(per_row({**row, **extra}))
+                    except Exception as e:
+                        normalized.append(None)
+                        if on_error:
+                            on_error(i, e)
+            for i, norm in zip(indices, normalized):
+                results[i] = norm
+        return results
@@ -0,0 +1,212 @@
+"""
+Resumable online dedupe for raw_google_map_drive_data.
+
+Ingest stamps every row with row_signature (md5 of the 11 business columns) and the
+UNIQUE idx_raw_signature keeps signed rows exact-duplicate free. What is left are rows
+with no signature (ingested before the column existed, or by older writers). This engine
+walks the table by id in chunks and, for each unsigned row:
+  - computes its signature exactly as ingest does (raw_row_signature);
+  - keeps the lowest id per signature (the old scripts' rule) and deletes the others,
+    whether they sit in the same chunk or are already signed;
+  - signs the kept row, so later chunks and later ingests find it through the index.
+Each chunk is one short transaction that also moves the checkpoint, so an interrupted
+run resumes where it stopped and a rerun after new ingests only reads ids past the
+checkpoint. Between chunks the engine backs off while InnoDB row-lock waits or replica
+lag are above their limits. A dry run writes nothing and reports what would go.
+
+Deleted rows leave the dashboard summaries high until the nightly reconcile.
+"""
+import time
+import hashlib
+import logging
+from collections import Counter
+from sqlalchemy import text, bindparam
+
+logger = logging.getLogger("RawDedupe")
+
+RAW_TABLE = "raw_google_map_drive_data"
+CHECKPOINT_KEY = "raw_dedupe_last_id"
+SIGNATURE_COLUMNS = [
+    'name', 'address', 'website', 'phone_number', 'reviews_count', 'reviews_average',
+    'category', 'subcategory', 'city', 'state', 'area'
+]
+
+
+def raw_row_signature(row):
+    """Exact-duplicate key over the 11 business columns. Ingest and dedupe must agree on it."""
+    sig_str = "|".join([
+        str(row.get('name') or "").lower().strip(),
+        str(row.get('address') or "").lower().strip(),
+        str(row.get('website') or "").lower().strip(),
+        str(row.get('phone_number') or "").lower().strip(),
+        str(row.get('reviews_count') or 0),
+        str(row.get('reviews_average') or 0.0),
+        str(row.get('category') or "").lower().strip(),
+        str(row.get('subcategory') or "").lower().strip(),
+        str(row.get('city') or "").lower().strip(),
+        str(row.get('state') or "").lower().strip(),
+        str(row.get('area') or "").lower().strip()
+    ])
+    return hashlib.md5(sig_str.encode('utf-8', errors='ignore')).hexdigest()
+
+
+def plan_chunk(unsigned, indexed):
+    """
+    Pure dedupe decision for one chunk.
+      unsigned  {id: signature} for the chunk's rows without a row_signature
+      indexed   {signature: id} of rows already signed with those signatures
+    Returns (to_sign, to_delete): {id: signature} to stamp, and ids to delete.
+    """
+    keep = {}
+    for row_id, sig in sorted(unsigned.items()):
+        keep.setdefault(sig, row_id)
+    to_sign, to_delete = {}, [row_id for row_id, sig in unsigned.items() if keep[sig] != row_id]
+    for sig, row_id in keep.items():
+        owner = indexed.get(sig)
+        if owner is not None and owner < row_id:
+            to_delete.append(row_id)
+        else:
+            if owner is not None:
+                to_delete.append(owner)  # a newer signed copy: the oldest row wins
+            to_sign[row_id] = sig
+    return to_sign, sorted(to_delete)
+
+
+class RawDedupeEngine:
+    def __init__(self, engine, chunk_size=5000, max_lock_waits=5, max_replica_lag=30,
+                 replica_engine=None, pause_seconds=0.1, max_backoff=60, lock_wait_timeout=10):
+        self.engine = engine
+        self.replica_engine = replica_engine
+        self.chunk_size = chunk_size
+        self.max_lock_waits = max_lock_waits
+        self.max_replica_lag = max_replica_lag
+        self.pause_seconds = pause_seconds
+        self.max_backoff = max_backoff
+        self.lock_wait_timeout = lock_wait_timeout
+        self.stats = Counter()
+        self._dry_run_seen = {}
+
+    # --- checkpoint -------------------------------------------------------
+    def get_checkpoint(self):
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT meta_value FROM etl_metadata WHERE meta_key = :key"), {"key": CHECKPOINT_KEY}
+            ).fetchone()
+        return int(row[0]) if row and str(row[0]).isdigit() else 0
+
+    def _save_checkpoint(self, conn, last_id):
+        conn.execute(text("""
+            INSERT INTO etl_metadata (meta_key, meta_value) VALUES (:key, :val)
+            ON DUPLICATE KEY UPDATE meta_value = VALUES(meta_value)
+        """), {"key": CHECKPOINT_KEY, "val": str(last_id)})
+
+    def reset_checkpoint(self):
+        with self.engine.begin() as conn:
+            self._save_checkpoint(conn, 0)
+
+    # --- throttling ------------------------------------------------------
+    def pressure(self):
+        """(row-lock waits, replica lag seconds or None). Never throws."""
+        waits, lag = 0, None
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(text("SHOW GLOBAL STATUS LIKE 'Innodb_row_lock_current_waits'")).fetchone()
+                waits = int(row[1]) if row else 0
+        except Exception as e:
+            logger.debug(f"Lock pressure probe failed: {e}")
+        if self.replica_engine is not None:
+            try:
+                with self.replica_engine.connect() as conn:
+                    row = conn.execute(text("SHOW REPLICA STATUS")).mappings().fetchone()
+                    if row:
+                        lag = row.get("Seconds_Behind_Source")
+            except Exception as e:
+                logger.debug(f"Replica lag probe failed: {e}")
+        return waits, lag
+
+    def throttle(self):
+        backoff = self.pause_seconds
+        while True:
+            waits, lag = self.pressure()
+            if waits <= self.max_lock_waits and (lag is None or lag <= self.max_replica_lag):
+                time.sleep(self.pause_seconds)
+                return
+            backoff = min(max(backoff * 2, 1), self.max_backoff)
+            self.stats["throttled"] += 1
+            logger.info(f"Dedupe throttled: {waits} row-lock waits, replica lag {lag}s; sleeping {backoff:.0f}s")
+            time.sleep(backoff)
+
+    # --- chunks ---------------------------------------------------------
+    def _read_unsigned(self, conn, lo, hi):
+        rows = conn.execute(text(f"""
+            SELECT id, {", ".join(SIGNATURE_COLUMNS)} FROM {RAW_TABLE}
+            WHERE id > :lo AND id <= :hi AND row_signature IS NULL
+        """), {"lo": lo, "hi": hi}).mappings().fetchall()
+        return {row['id']: raw_row_signature(row) for row in rows}
+
+    def _read_indexed(self, conn, signatures):
+        if not signatures:
+            return {}
+        rows = conn.execute(text(
+            f"SELECT row_signature, id FROM {RAW_TABLE} WHERE row_signature IN :sigs"
+        ).bindparams(bindparam("sigs", expanding=True)), {"sigs": list(signatures)}).fetchall()
+        return {sig: row_id for sig, row_id in rows}
+
+    def process_chunk(self, lo, hi, dry_run=False):
+        """Dedupes ids in (lo, hi]. Returns (signed, deleted)."""
+        with self.engine.begin() as conn:
+            conn.execute(text(f"SET SESSION innodb_lock_wait_timeout = {int(self.lock_wait_timeout)}"))
+            unsigned = self._read_unsigned(conn, lo, hi)
+            indexed = self._read_indexed(conn, set(unsigned.values()))
+            if dry_run:
+                # Nothing gets signed, so remember kept signatures to see cross-chunk duplicates
+                for sig in set(unsigned.values()) & self._dry_run_seen.keys():
+                    indexed[sig] = min(self._dry_run_seen[sig], indexed.get(sig, self._dry_run_seen[sig]))
+            to_sign, to_delete = plan_chunk(unsigned, indexed)
+            if dry_run:
+                self._dry_run_seen.update((sig, row_id) for row_id, sig in to_sign.items())
+                return len(to_sign), len(to_delete)
+            if to_delete:
+                conn.execute(text(f"DELETE FROM {RAW_TABLE} WHERE id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)), {"ids": to_delete})
+            if to_sign:
+                conn.execute(text(f"UPDATE {RAW_TABLE} SET row_signature = :sig WHERE id = :id"),
+                             [{"id": row_id, "sig": sig} for row_id, sig in to_sign.items()])
+            self._save_checkpoint(conn, hi)
+        return len(to_sign), len(to_delete)
+
+    def run(self, from_id=None, to_id=None, dry_run=False, progress_every=20):
+        """Dedupes from the checkpoint (or from_id) up to to_id (default: current MAX(id))."""
+        start = time.time()
+        lo = self.get_checkpoint() if from_id is None else int(from_id)
+        if to_id is None:
+            with self.engine.connect() as conn:
+                to_id = conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {RAW_TABLE}")).scalar()
+        logger.info(f"Raw dedupe {'DRY RUN ' if dry_run else ''}over ids ({lo:,}, {to_id:,}] "
+                    f"in chunks of {self.chunk_size:,}")
+        chunks, errors = 0, 0
+        while lo < to_id:
+            hi = min(lo + self.chunk_size, to_id)
+            try:
+                signed, deleted = self.process_chunk(lo, hi, dry_run)
+            except Exception as e:
+                # Typically a lock wait timeout or an ingest racing on a signature: retry the chunk
+                errors += 1
+                self.stats["errors"] += 1
+                backoff = min(errors * 2, self.max_backoff)
+                logger.warning(f"Dedupe chunk ({lo}, {hi}] failed (retry in {backoff}s): {str(e)[:200]}")
+                time.sleep(backoff)
+                continue
+            errors = 0
+            self.stats["signed"] += signed
+            self.stats["deleted"] += deleted
+            self.stats["chunks"] += 1
+            chunks += 1
+            lo = hi
+            if chunks % progress_every == 0:
+                logger.info(f"  up to id {hi:,}: {self.stats['signed']:,} signed, "
+                            f"{self.stats['deleted']:,} {'duplicate' if dry_run else 'deleted'} "
+                            f"({time.time() - start:.0f}s)")
+            self.throttle()
+        self.stats["seconds"] = round(time.time() - start, 1)
+        return dict(self.stats)
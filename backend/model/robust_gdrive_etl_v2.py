@@ -10,7 +10,6 @@ import threading
 import queue
 import redis
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
@@ -19,7 +18,16 @@ from urllib.parse import quote_plus
 from dotenv import load_dotenv
 
 from .normalizer import UniversalNormalizer
+from .drive_crawler import DriveTreeCrawler, normalize_drive_time
+from .signature_filter import SignatureFilter
+from .validation_pipeline import ValidationPipeline
+from .validation_shards import ValidationShardCoordinator, load_range_cursor, save_range_checkpoint, \
+    read_ranges, resume_point
 from utils.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from utils.rate_limiter import TokenBucket
+from utils.file_sketches import get_redis
+from utils.response_cache import invalidate_tags, CLEAN_TABLE as CLEAN_TAG, VALIDATION_LOG
+from utils.validation_snapshot import existing_raw_ids, inserted_rows, apply_clean_batch
 
 load_dotenv()
 
@@ -43,6 +51,54 @@ DB_HOST = os.getenv('DB_HOST')
 DB_NAME = os.getenv('DB_NAME')
 DB_PORT = os.getenv('DB_PORT', '3306')
 DATABASE_URI = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Crawler: parallel folder listings under one shared Drive API rate limit
+CRAWL_CONCURRENCY = int(os.getenv('GDRIVE_CRAWL_CONCURRENCY', '16'))
+DRIVE_API_QPS = float(os.getenv('GDRIVE_API_QPS', '50'))
+# Coalesced dispatch: small CSVs share one Celery task up to this many bytes (0 = one task per file)
+DISPATCH_BATCH_BYTES = int(os.getenv('GDRIVE_DISPATCH_BATCH_BYTES', str(32 * 1024 * 1024)))
+DISPATCH_BATCH_MAX_FILES = int(os.getenv('GDRIVE_DISPATCH_BATCH_MAX_FILES', '200'))
+# Bloom filter in front of the clean-table signature_hash duplicate check
+SIGNATURE_BLOOM_ENABLED = os.getenv('SIGNATURE_BLOOM_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SIGNATURE_BLOOM_CAPACITY = int(os.getenv('SIGNATURE_BLOOM_CAPACITY', '20000000'))
+SIGNATURE_BLOOM_ERROR_RATE = float(os.getenv('SIGNATURE_BLOOM_ERROR_RATE', '0.001'))
+SIGNATURE_BLOOM_PATH = os.getenv('SIGNATURE_BLOOM_PATH', os.path.join(os.getcwd(), 'output', 'signature_bloom.bin'))
+SIGNATURE_BLOOM_SNAPSHOT_SECONDS = int(os.getenv('SIGNATURE_BLOOM_SNAPSHOT_SECONDS', '300'))
+SIGNATURE_BLOOM_CATCH_UP_SECONDS = int(os.getenv('SIGNATURE_BLOOM_CATCH_UP_SECONDS', '10'))
+# Sharded validation: >0 hands id ranges to this many concurrent Celery range tasks
+VALIDATION_SHARDS = int(os.getenv('VALIDATION_SHARDS', '0'))
+VALIDATION_RANGE_SIZE = int(os.getenv('VALIDATION_RANGE_SIZE', '50000'))
+VALIDATION_RANGE_LEASE_SECONDS = int(os.getenv('VALIDATION_RANGE_LEASE_SECONDS', '900'))
+# Pipelined quality processor: prefetching reader -> normaliser pool -> batched writer
+VALIDATION_PIPELINE = os.getenv('VALIDATION_PIPELINE', 'true').lower() in ('1', 'true', 'yes')
+VALIDATION_QUEUE_DEPTH = int(os.getenv('VALIDATION_QUEUE_DEPTH', '2'))
+VALIDATION_NORMALISE_WORKERS = int(os.getenv('VALIDATION_NORMALISE_WORKERS', '2'))
+MAX_ROW_ID = 2 ** 63 - 1  # BIGINT upper bound: "no upper id" for unsharded batches
+
+
+def group_by_size(descriptors, byte_budget=DISPATCH_BATCH_BYTES, max_files=DISPATCH_BATCH_MAX_FILES):
+    """
+    Packs file descriptors (dicts with a Drive 'size') into batches of at most byte_budget
+    bytes and max_files files, keeping their order. Files of unknown size or at/above the
+    budget get a batch of their own.
+    """
+    batches, current, current_bytes = [], [], 0
+    for desc in descriptors:
+        try:
+            size = int(desc.get('size') or 0)
+        except (TypeError, ValueError):
+            size = 0
+        if byte_budget <= 0 or size <= 0 or size >= byte_budget:
+            batches.append([desc])
+            continue
+        if current and (current_bytes + size > byte_budget or len(current) >= max_files):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(desc)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
 
 class GDriveHighSpeedIngestor:
     def __init__(self):
@@ -61,6 +117,8 @@ class GDriveHighSpeedIngestor:
         self.page_token = None
         # Circuit breaker for Google Drive API calls
         self.api_breaker = CircuitBreaker(name="gdrive_api")
+        # Shared token bucket: every listing thread draws from it, 429s pause all of them
+        self.rate_limiter = TokenBucket("gdrive_api", rate=DRIVE_API_QPS, capacity=DRIVE_API_QPS)
         
         # Stats & Heartbeat
         self.stats_lock = threading.Lock()
@@ -77,20 +135,6 @@ class GDriveHighSpeedIngestor:
             self._tls.service = build('drive', 'v3', credentials=self.creds, cache_discovery=False)
         return self._tls.service
 
-    def retry_on_429(func):
-        def wrapper(*args, **kwargs):
-            for attempt in range(5):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if '429' in str(e) or 'rate limit' in str(e).lower():
-                        wait = (2 ** attempt) + random.uniform(0, 1)
-                        logger.warning(f"Rate limited. Retrying in {wait:.2f}s...")
-                        time.sleep(wait)
-                    else: raise
-            return func(*args, **kwargs)
-        return wrapper
-
     @staticmethod
     def get_file_hash(file_id, modified_time):
         """Generate a hash for file change detection."""
@@ -136,7 +180,7 @@ class GDriveHighSpeedIngestor:
                     pageToken=current_token, 
                     spaces='drive', 
                     pageSize=100,
-                    fields="nextPageToken, newStartPageToken, changes(fileId, removed, file(id, name, mimeType, parents, modifiedTime))"
+                    fields="nextPageToken, newStartPageToken, changes(fileId, removed, file(id, name, mimeType, parents, modifiedTime, size))"
                 ).execute()
                 all_changes.extend(response.get('changes', []))
                 if 'nextPageToken' in response:
@@ -172,38 +216,70 @@ class GDriveHighSpeedIngestor:
         except Exception as e:
             logger.error(f"Failed to register folder {folder_name}: {e}")
 
-    @retry_on_429
+    def drive_call(self, request_fn):
+        """Executes one Drive API request under the shared rate limiter + circuit breaker.
+        Rate-limit errors back off the whole bucket rather than just this caller."""
+        for attempt in range(5):
+            self.rate_limiter.acquire()
+            try:
+                return self.api_breaker.call(request_fn)
+            except CircuitBreakerOpenError:
+                raise
+            except Exception as e:
+                if '429' in str(e) or 'rate limit' in str(e).lower():
+                    wait = (2 ** attempt) + random.uniform(0, 1)
+                    logger.warning(f"Rate limited. Pausing Drive calls for {wait:.2f}s...")
+                    self.rate_limiter.penalize(wait)
+                else: raise
+        self.rate_limiter.acquire()
+        return self.api_breaker.call(request_fn)
+
+    def list_children(self, parent_id):
+        """Lists ALL children of a folder, following nextPageToken. Raises on API failure."""
+        service = self.get_service()
+        items = []
+        page_token = None
+        while True:
+            def _list():
+                return service.files().list(
+                    q=f"'{parent_id}' in parents and trashed=false", 
+                    fields="nextPageToken, files(id, name, mimeType, modifiedTime, size)",
+                    orderBy="modifiedTime desc",
+                    pageSize=1000,
+                    pageToken=page_token
+                ).execute()
+            response = self.drive_call(_list)
+            items.extend(response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return items
+
     def list_files(self, parent_id):
-        # Circuit breaker + rate limit protected API call
-        def _list():
-            return self.get_service().files().list(
-                q=f"'{parent_id}' in parents and trashed=false", 
-                fields="files(id, name, mimeType, modifiedTime)",
-                orderBy="modifiedTime desc",
-                pageSize=1000 
-            ).execute().get('files', [])
         try:
-            return self.api_breaker.call(_list)
+            return self.list_children(parent_id)
         except CircuitBreakerOpenError as e:
             logger.warning(f"Circuit breaker OPEN, skipping list_files for {parent_id}: {e}")
             return []
 
-    def scanner_producer(self, folder_id, folder_name, path=""):
-        if self.shutdown_event.is_set(): return
-        
-        # 1. Fetch items (Already sorted by modifiedTime DESC in API call)
-        items = self.list_files(folder_id)
-        
-        # Separate Folders and Files to guarantee processing order
-        folders = [item for item in items if item['mimeType'] == 'application/vnd.google-apps.folder']
-        csv_files = [item for item in items if item['name'].lower().endswith('.csv')]
-        
-        # Process NEWEST CSV FILES first
+    def send_file_tasks(self, descriptors):
+        """
+        Queues file descriptors (process_csv_task kwargs + 'size') to Celery: files are
+        grouped by size, so runs of small CSVs go out as one process_csv_batch_task.
+        """
+        from tasks.gdrive_task.etl_tasks import process_csv_task, process_csv_batch_task
+
+        for batch in group_by_size(descriptors):
+            files = [{k: v for k, v in desc.items() if k != 'size'} for desc in batch]
+            if len(files) == 1:
+                process_csv_task.delay(**files[0])
+            else:
+                process_csv_batch_task.delay(files)
+
+    def dispatch_csv_files(self, folder_id, folder_name, path, csv_files):
+        """Sends new / changed CSVs of one folder to Celery. Returns (dispatched, skipped)."""
         folder_skipped = 0
-        folder_dispatched = 0
+        to_dispatch = []
         
-        # Import task ONCE out of the loop
-        from tasks.gdrive_task.etl_tasks import process_csv_task
         import gevent
         
         for idx, item in enumerate(csv_files):
@@ -229,15 +305,30 @@ class GDriveHighSpeedIngestor:
                 continue
                 
             # New, Modified, or stale IN_PROGRESS with new hash -> Dispatch
-            process_csv_task.delay(
-                file_id=item['id'], 
-                file_name=item['name'],
-                folder_id=folder_id, 
-                folder_name=folder_name,
-                path=f"{path}/{folder_name}", 
-                modified_time=item.get('modifiedTime')
-            )
-            folder_dispatched += 1
+            to_dispatch.append({
+                "file_id": item['id'],
+                "file_name": item['name'],
+                "folder_id": folder_id,
+                "folder_name": folder_name,
+                "path": f"{path}/{folder_name}",
+                "modified_time": item.get('modifiedTime'),
+                "size": item.get('size'),
+            })
+        self.send_file_tasks(to_dispatch)
+        return len(to_dispatch), folder_skipped
+
+    def scanner_producer(self, folder_id, folder_name, path=""):
+        if self.shutdown_event.is_set(): return
+        
+        # 1. Fetch items (Already sorted by modifiedTime DESC in API call)
+        items = self.list_files(folder_id)
+        
+        # Separate Folders and Files to guarantee processing order
+        folders = [item for item in items if item['mimeType'] == 'application/vnd.google-apps.folder']
+        csv_files = [item for item in items if item['name'].lower().endswith('.csv')]
+        
+        # Process NEWEST CSV FILES first
+        folder_dispatched, _ = self.dispatch_csv_files(folder_id, folder_name, path, csv_files)
 
         # Then recursively scan NEWEST SUBFOLDERS (Phase 2)
         for folder in folders:
@@ -250,9 +341,11 @@ class GDriveHighSpeedIngestor:
             
         # Register folder scan as done
         mod_time = items[0].get('modifiedTime') if items else datetime.utcnow().isoformat() + "Z"
-        if 'T' in mod_time: 
-            mod_time = mod_time.replace('T', ' ').replace('Z', '').split('.')[0]
-        self.register_folder(folder_id, folder_name, mod_time, len(csv_files))
+        self.register_folder(folder_id, folder_name, normalize_drive_time(mod_time), len(csv_files))
+
+    def crawl(self, roots, skip_unchanged=True):
+        """Breadth-first parallel crawl from (folder_id, folder_name, path, modified_time) roots."""
+        DriveTreeCrawler(self, concurrency=CRAWL_CONCURRENCY, skip_unchanged=skip_unchanged).run(roots)
 
     # REMOVED: download_csv, worker_consumer, process_file, commit_batch
     # These are now handled by Celery in tasks/gdrive_task/etl_tasks.py
@@ -289,11 +382,9 @@ class GDriveHighSpeedIngestor:
             logger.info("🎬 Initializing GDrive Orchestrator v6.0 (Celery Mode)...")
             top_folders = [f for f in self.list_files(ROOT_FOLDER_ID) if f['mimeType'] == 'application/vnd.google-apps.folder']
             
-            # Reduced workers for scanning to avoid overhead.
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                futures = [executor.submit(self.scanner_producer, f['id'], f['name'], "ROOT") for f in top_folders]
-                for f in as_completed(futures): pass
-                self.scanners_finished.set()
+            # Breadth-first parallel crawl (pagination-aware, shared rate limit, skips unchanged subtrees)
+            self.crawl([(f['id'], f['name'], "ROOT", f.get('modifiedTime')) for f in top_folders])
+            self.scanners_finished.set()
             
             # Removed redundant Producer-side stats refresh (handled by Celery now)
             self.first_run = False
@@ -314,9 +405,8 @@ class GDriveHighSpeedIngestor:
 
         logger.info(f"🚀 Reactive Trigger! Disptaching {len(changes)} updates to Celery...")
         
-        from tasks.gdrive_task.etl_tasks import process_csv_task
-        
         folders_to_scan = []
+        reactive_files = []
 
         for c in changes:
             if c.get('removed'): continue
@@ -327,16 +417,18 @@ class GDriveHighSpeedIngestor:
             if file.get('name', '').lower().endswith('.csv'):
                 if file['id'] not in self.processed_files:
                      logger.debug(f"🆕 REACTIVE TASK: {file['name']}")
-                     process_csv_task.delay(
-                        file_id=file['id'], 
-                        file_name=file['name'],
-                        folder_id="TARGETED", 
-                        folder_name="Reactive",
-                        path="REACTIVE", 
-                        modified_time=file.get('modifiedTime')
-                     )
+                     reactive_files.append({
+                        "file_id": file['id'],
+                        "file_name": file['name'],
+                        "folder_id": "TARGETED",
+                        "folder_name": "Reactive",
+                        "path": "REACTIVE",
+                        "modified_time": file.get('modifiedTime'),
+                        "size": file.get('size'),
+                     })
             elif file.get('mimeType') == 'application/vnd.google-apps.folder':
                 folders_to_scan.append(file)
+        self.send_file_tasks(reactive_files)
         
         # Deduplicate folders to prevent parallel scans of the same folder
         if folders_to_scan:
@@ -349,9 +441,8 @@ class GDriveHighSpeedIngestor:
             folders_to_scan = unique_folders
             logger.info(f"📂 Scanning {len(folders_to_scan)} unique reactive folders...")
 
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                for f in folders_to_scan:
-                    executor.submit(self.scanner_producer, f['id'], f['name'], "REACTIVE")
+            # Reactive folders changed by definition: never skip them on registry timestamps
+            self.crawl([(f['id'], f['name'], "REACTIVE", None) for f in folders_to_scan], skip_unchanged=False)
             
         self.save_change_token(self.page_token)
         logger.info(f"✨ DRIVE DISPATCH FINISHED: Tasks sent to workers for {len(changes)} items.")
@@ -369,6 +460,11 @@ class ValidationQualityProcessor:
         self.batch_size = 2000 # Smaller batch for stability
         self.consecutive_errors = 0
         self.max_backoff = 60  # Max sleep on consecutive errors
+        self.signature_filter = SignatureFilter(
+            engine, capacity=SIGNATURE_BLOOM_CAPACITY, error_rate=SIGNATURE_BLOOM_ERROR_RATE,
+            snapshot_path=SIGNATURE_BLOOM_PATH, snapshot_seconds=SIGNATURE_BLOOM_SNAPSHOT_SECONDS,
+            catch_up_seconds=SIGNATURE_BLOOM_CATCH_UP_SECONDS
+        ) if SIGNATURE_BLOOM_ENABLED else None
 
     @staticmethod
     def safe_str(val, default=""):
@@ -410,6 +506,14 @@ class ValidationQualityProcessor:
     def get_last_processed_id(self):
         try:
             with self.engine.connect() as conn:
+                # Priority 0: sharded runs log the coordinator watermark, so their range
+                # checkpoints are the real progress whenever any are left
+                ranges = read_ranges(conn)
+                if ranges:
+                    res = conn.execute(text("SELECT meta_value FROM etl_metadata WHERE meta_key='last_processed_id'"))
+                    row = res.fetchone()
+                    return resume_point(int(row[0]) if row and str(row[0]).isdigit() else 0, ranges)
+
                 # Priority 1: Check newest log entry for last_id
                 res = conn.execute(text("SELECT last_id FROM data_validation_log ORDER BY id DESC LIMIT 1"))
                 row = res.fetchone()
@@ -444,6 +548,8 @@ class ValidationQualityProcessor:
                 """), summary)
         except Exception as e:
             logger.warning(f"Failed to log validation batch: {e}")
+        # The batch's clean rows are committed by now; cached validation dashboards are stale
+        invalidate_tags(get_redis(), CLEAN_TAG, VALIDATION_LOG)
 
     def is_missing(self, val):
         return val is None or str(val).strip() == ""
@@ -485,6 +591,13 @@ class ValidationQualityProcessor:
         if not hashes:
             return set()
         
+        # Bloom filter first: only probable hits need a MySQL lookup
+        if self.signature_filter:
+            self.signature_filter.catch_up(conn)
+            hashes = self.signature_filter.probable(hashes)
+            if not hashes:
+                return set()
+
         results = set()
         hash_list = list(hashes)
         
@@ -498,175 +611,273 @@ class ValidationQualityProcessor:
                     results.add(str(r[0]))
             except Exception as e:
                 logger.warning(f"Duplicate hash check failed (non-fatal): {e}")
+        if self.signature_filter and self.signature_filter.ready:
+            self.signature_filter.record_false_positives(len(hash_list) - len(results))
         return results
 
+    def read_raw_batch(self, last_id, upper_id=None):
+        """Reads the next batch of raw rows with id > last_id (and <= upper_id) as dicts."""
+        with self.engine.connect() as conn:
+            # READ UNCOMMITTED: prevents locking raw table during read
+            conn.execute(text("SET SESSION TRANSACTION ISOLATION LEVEL READ UNCOMMITTED"))
+            try:
+                # 1. Fetch batch from Tier 1 (Raw)
+                rows = conn.execute(text("""
+                    SELECT id, name, address, website, phone_number, 
+                            reviews_count, reviews_average, category, subcategory, 
+                            city, state, area, created_at
+                    FROM raw_google_map_drive_data 
+                    WHERE id > :last_id AND id <= :upper_id
+                    ORDER BY id ASC 
+                    LIMIT :limit
+                """), {"last_id": last_id, "upper_id": upper_id if upper_id is not None else MAX_ROW_ID,
+                       "limit": self.batch_size}).fetchall()
+                conn.commit()
+            finally:
+                conn.execute(text("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ"))
+        return [dict(row_obj._asdict() if hasattr(row_obj, '_asdict') else row_obj._mapping) for row_obj in rows]
+
+    def normalise_raw_batch(self, raw_rows, last_id):
+        """
+        CPU-only stage: normalises and signs a raw batch. Returns (batch_rows, signatures,
+        current_max_id); the cursor moves past rows that fail normalisation too.
+        """
+        current_max_id = last_id
+        batch_rows = []
+        signatures = set()
+
+        # 2. Process batch — normalised column-wise, then each row is individually protected
+        norm_rows = UniversalNormalizer.normalize_batch(
+            raw_rows, full=True,
+            on_error=lambda i, err: logger.warning(f"Row normalization failed (skipping): {str(err)[:100]}")
+        )
+        for raw_row, norm_row in zip(raw_rows, norm_rows):
+            try:
+                if norm_row is None:
+                    # Skip bad row, advance cursor past it
+                    current_max_id = max(current_max_id, raw_row['id'])
+                    continue
+                norm_row['id'] = raw_row['id']
+                
+                # Ensure all string fields are safe
+                for key in ['name', 'address', 'website', 'phone_number', 'category', 'subcategory', 'city', 'state', 'area']:
+                    norm_row[key] = self.safe_str(norm_row.get(key))
+                norm_row['reviews_count'] = self.safe_int(norm_row.get('reviews_count'))
+                norm_row['reviews_average'] = self.safe_float(norm_row.get('reviews_average'))
+                
+                batch_rows.append(norm_row)
+                current_max_id = max(current_max_id, norm_row['id'])
+                
+                # Calculate Signature Hash (Fast Dedupe)
+                sig_str = f"{norm_row['phone_number']}|{norm_row['name'].lower()}|{norm_row['address'].lower()}|{norm_row['city'].lower()}"
+                norm_row['sig_hash'] = hashlib.md5(sig_str.encode()).hexdigest()
+                signatures.add(norm_row['sig_hash'])
+            except Exception as row_err:
+                # Skip bad row, advance cursor past it
+                try:
+                    current_max_id = max(current_max_id, raw_row['id'])
+                except Exception:
+                    pass
+                logger.warning(f"Row normalization failed (skipping): {str(row_err)[:100]}")
+                continue
+
+        return batch_rows, signatures, current_max_id
+
+    def write_batch(self, batch_rows, signatures, current_max_id):
+        """
+        Duplicate check, clean insert (+ snapshot counters) and master insert for a
+        normalised batch, in one transaction. Returns the batch summary.
+        """
+        batch_summary = {
+            "total": 0, "missing": 0, "valid": 0,
+            "duplicate": 0, "cleaned": 0
+        }
+        clean_data_batch = []
+        master_data_batch = []
+
+        with self.engine.begin() as conn:
+            # Bulk Duplicate Check
+            existing_sigs = self.check_duplicates_batch(signatures, conn)
+            
+            for row in batch_rows:
+                try:
+                    batch_summary["total"] += 1
+                    
+                    is_structured, is_valid, missing_list, invalid_list, clean_phone = self.validate_row(row)
+                    
+                    is_duplicate = row['sig_hash'] in existing_sigs if is_structured else False
+
+                    status = "VALID"
+                    if not is_structured: 
+                        status = "MISSING"
+                        batch_summary["missing"] += 1
+                    elif is_duplicate: 
+                        status = "DUPLICATE"
+                        batch_summary["duplicate"] += 1
+                    elif not is_valid: 
+                        status = "INVALID"
+                    else:
+                        batch_summary["valid"] += 1
+
+                    if status in ["VALID", "MISSING", "INVALID", "DUPLICATE"]:
+                        created_at = row.get('created_at')
+                        if not created_at:
+                            created_at = datetime.now()
+                        
+                        clean_data_batch.append({
+                            "raw_id": row['id'], "sig_hash": row['sig_hash'], "name": row['name'], "address": row['address'],
+                            "website": row['website'], "phone": row['phone_number'], 
+                            "reviews": self.safe_int(row.get('reviews_count', 0)),
+                            "avg": self.safe_float(row.get('reviews_average', 0.00)),
+                            "cat": row['category'], "sub": row['subcategory'], "city": row['city'],
+                            "state": row['state'], "area": row['area'], "created": created_at,
+                            "val_status": status, 
+                            "clean_status": "CLEANED" if status == "VALID" else "FAILED_VALIDATION" if status != "DUPLICATE" else "DUPLICATE_FOUND", 
+                            "missing": ",".join(missing_list) if missing_list else None, 
+                            "invalid": ",".join(invalid_list) if invalid_list else None, 
+                            "duplicate_reason": "Exact match detected via signature hash" if status == "DUPLICATE" else None, 
+                            "processed_at": datetime.now()
+                        })
+                        
+                        if status == "VALID":
+                            master_data_batch.append({
+                                "name": row['name'],
+                                "address": row['address'],
+                                "website": row['website'],
+                                "phone_number": row['phone_number'],
+                                "reviews_count": self.safe_int(row.get('reviews_count', 0)),
+                                "reviews_avg": self.safe_float(row.get('reviews_average', 0.00)),
+                                "category": row['category'],
+                                "subcategory": row['subcategory'],
+                                "city": row['city'],
+                                "state": row['state'],
+                                "area": row['area'],
+                                "created_at": created_at
+                            })
+                            batch_summary["cleaned"] += 1
+                except Exception as row_err:
+                    logger.warning(f"Row validation failed (skipping): {str(row_err)[:100]}")
+                    continue
+
+            # 4. Execute Batch Writes — each INSERT is individually protected
+            new_clean_rows = []
+            if clean_data_batch:
+                try:
+                    preexisting = existing_raw_ids(conn, clean_data_batch)
+                    conn.execute(text("""
+                        INSERT IGNORE INTO raw_clean_google_map_data 
+                        (raw_id, signature_hash, name, address, website, phone_number, reviews_count, reviews_avg,
+                         category, subcategory, city, state, area, created_at,
+                         validation_status, cleaning_status, missing_fields, invalid_format_fields, duplicate_reason, processed_at)
+                        VALUES (:raw_id, :sig_hash, :name, :address, :website, :phone, :reviews, :avg, :cat, :sub, :city, :state, :area, :created,
+                                :val_status, :clean_status, :missing, :invalid, :duplicate_reason, :processed_at)
+                    """), clean_data_batch)
+                    new_clean_rows = inserted_rows(conn, clean_data_batch, preexisting)
+                    if self.signature_filter:
+                        self.signature_filter.add_many(row['sig_hash'] for row in clean_data_batch)
+                except Exception as e:
+                    logger.warning(f"Clean table batch insert failed (non-fatal): {str(e)[:200]}")
+
+            # Dashboard counters commit atomically with the clean rows they count
+            try:
+                with conn.begin_nested():
+                    apply_clean_batch(conn, new_clean_rows, current_max_id)
+            except Exception as e:
+                logger.warning(f"Validation snapshot update failed (non-fatal): {str(e)[:200]}")
+                
+            if master_data_batch:
+                try:
+                    conn.execute(text("""
+                        INSERT IGNORE INTO g_map_master_table 
+                        (name, address, website, phone_number, reviews_count, reviews_avg, category, subcategory, city, state, area, created_at)
+                        VALUES (:name, :address, :website, :phone_number, :reviews_count, :reviews_avg, :category, :subcategory, :city, :state, :area, :created_at)
+                    """), master_data_batch)
+                except Exception as e:
+                    logger.warning(f"Master table batch insert failed (non-fatal): {str(e)[:200]}")
+
+        return batch_summary
+
+    def process_batch(self, last_id, upper_id=None):
+        """
+        Validates, cleans and master-syncs the next batch of raw rows with id > last_id
+        (and <= upper_id for a shard's range). Returns (new_last_id, batch_summary), or
+        (last_id, None) when there are no rows to process.
+        """
+        raw_rows = self.read_raw_batch(last_id, upper_id)
+        if not raw_rows:
+            return last_id, None
+        batch_rows, signatures, current_max_id = self.normalise_raw_batch(raw_rows, last_id)
+        return current_max_id, self.write_batch(batch_rows, signatures, current_max_id)
+
+    def process_range(self, start, end, watermark, keep_alive=None):
+        """
+        Shard worker: processes raw ids in (start, end], resuming from the range's checkpoint
+        in etl_metadata. Batches are logged with last_id = `watermark` (the coordinator's
+        contiguous progress when it assigned the range), so data_validation_log's newest
+        last_id never runs ahead of rows actually processed.
+
+        `keep_alive` is called after every batch to renew the caller's range lease; when it
+        returns False the lease was lost to another worker and the range is abandoned.
+        """
+        cursor = load_range_cursor(self.engine, start, end)
+        while not self.shutdown_event.is_set():
+            cursor_new, batch_summary = self.process_batch(cursor, upper_id=end)
+            if batch_summary is None:
+                break
+            save_range_checkpoint(self.engine, start, end, cursor_new)
+            batch_summary['last_id'] = watermark
+            self.log_validation_batch(batch_summary)
+            cursor = cursor_new
+            if self.signature_filter:
+                self.signature_filter.maybe_snapshot()
+            if keep_alive is not None and not keep_alive():
+                logger.warning(f"Lost the lease on validation range ({start}, {end}] at {cursor}; stopping.")
+                return False
+        else:
+            return False
+        save_range_checkpoint(self.engine, start, end, end, done=True)
+        logger.info(f"Validation range ({start}, {end}] complete.")
+        return True
+
+    def finalize_batch(self, current_max_id, batch_summary):
+        # 5. Finalize batch — ALWAYS advance the cursor
+        batch_summary['last_id'] = current_max_id
+        self.update_last_processed_id(current_max_id)
+        self.log_validation_batch(batch_summary)
+        self.consecutive_errors = 0  # Reset on success
+        if self.signature_filter:
+            self.signature_filter.maybe_snapshot()
+
+        logger.info(f"Quality Cycle Complete: Processed {batch_summary['total']} | Valid: {batch_summary['valid']} | Missing: {batch_summary['missing']} | Dup: {batch_summary['duplicate']} | Master: {batch_summary['cleaned']} | Last ID: {current_max_id}")
+
     def start_pipeline(self):
         """Main loop for the quality assurance and master sync thread. NEVER exits on error."""
         last_id = self.get_last_processed_id()
         logger.info(f"Data Quality Processor Started from ID: {last_id}")
+        if self.signature_filter:
+            self.signature_filter.start_warming(self.shutdown_event)
         
+        def on_batch(current_max_id, batch_summary):
+            nonlocal last_id
+            self.finalize_batch(current_max_id, batch_summary)
+            last_id = current_max_id
+
         while not self.shutdown_event.is_set():
             try:
-                with self.engine.begin() as conn:
-                    # READ UNCOMMITTED: prevents locking raw table during read
-                    conn.execute(text("SET SESSION TRANSACTION ISOLATION LEVEL READ UNCOMMITTED"))
-                    
-                    # 1. Fetch batch from Tier 1 (Raw)
-                    rows = conn.execute(text("""
-                        SELECT id, name, address, website, phone_number, 
-                                reviews_count, reviews_average, category, subcategory, 
-                                city, state, area, created_at
-                        FROM raw_google_map_drive_data 
-                        WHERE id > :last_id 
-                        ORDER BY id ASC 
-                        LIMIT :limit
-                    """), {"last_id": last_id, "limit": self.batch_size}).fetchall()
-                
-                    if not rows:
-                        conn.execute(text("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ"))
-                        self.consecutive_errors = 0  # Reset on successful idle
-                        if self.shutdown_event.wait(timeout=10):
-                            break
-                        continue
-
-                    batch_summary = {
-                        "total": 0, "missing": 0, "valid": 0,
-                        "duplicate": 0, "cleaned": 0
-                    }
-                    
-                    current_max_id = last_id
-                    clean_data_batch = []
-                    master_data_batch = []
-                    batch_rows = []
-                    signatures = set()
-                    
-                    # 2. Process batch — each row is individually protected
-                    for row_obj in rows:
-                        try:
-                            raw_row = row_obj._asdict() if hasattr(row_obj, '_asdict') else row_obj._mapping
-                            norm_row = UniversalNormalizer.normalize_row_full(dict(raw_row))
-                            norm_row['id'] = raw_row['id']
-                            
-                            # Ensure all string fields are safe
-                            for key in ['name', 'address', 'website', 'phone_number', 'category', 'subcategory', 'city', 'state', 'area']:
-                                norm_row[key] = self.safe_str(norm_row.get(key))
-                            norm_row['reviews_count'] = self.safe_int(norm_row.get('reviews_count'))
-                            norm_row['reviews_average'] = self.safe_float(norm_row.get('reviews_average'))
-                            
-                            batch_rows.append(norm_row)
-                            current_max_id = max(current_max_id, norm_row['id'])
-                            
-                            # Calculate Signature Hash (Fast Dedupe)
-                            sig_str = f"{norm_row['phone_number']}|{norm_row['name'].lower()}|{norm_row['address'].lower()}|{norm_row['city'].lower()}"
-                            norm_row['sig_hash'] = hashlib.md5(sig_str.encode()).hexdigest()
-                            signatures.add(norm_row['sig_hash'])
-                        except Exception as row_err:
-                            # Skip bad row, advance cursor past it
-                            try:
-                                current_max_id = max(current_max_id, raw_row['id'])
-                            except Exception:
-                                pass
-                            logger.warning(f"Row normalization failed (skipping): {str(row_err)[:100]}")
-                            continue
-
-                    # Bulk Duplicate Check
-                    existing_sigs = self.check_duplicates_batch(signatures, conn)
-                    
-                    # Switch back to safe mode for writes
-                    conn.execute(text("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ"))
-
-                    for row in batch_rows:
-                        try:
-                            batch_summary["total"] += 1
-                            
-                            is_structured, is_valid, missing_list, invalid_list, clean_phone = self.validate_row(row)
-                            
-                            is_duplicate = row['sig_hash'] in existing_sigs if is_structured else False
-
-                            status = "VALID"
-                            if not is_structured: 
-                                status = "MISSING"
-                                batch_summary["missing"] += 1
-                            elif is_duplicate: 
-                                status = "DUPLICATE"
-                                batch_summary["duplicate"] += 1
-                            elif not is_valid: 
-                                status = "INVALID"
-                            else:
-                                batch_summary["valid"] += 1
-
-                            if status in ["VALID", "MISSING", "INVALID", "DUPLICATE"]:
-                                created_at = row.get('created_at')
-                                if not created_at:
-                                    created_at = datetime.now()
-                                
-                                clean_data_batch.append({
-                                    "raw_id": row['id'], "sig_hash": row['sig_hash'], "name": row['name'], "address": row['address'],
-                                    "website": row['website'], "phone": row['phone_number'], 
-                                    "reviews": self.safe_int(row.get('reviews_count', 0)),
-                                    "avg": self.safe_float(row.get('reviews_average', 0.00)),
-                                    "cat": row['category'], "sub": row['subcategory'], "city": row['city'],
-                                    "state": row['state'], "area": row['area'], "created": created_at,
-                                    "val_status": status, 
-                                    "clean_status": "CLEANED" if status == "VALID" else "FAILED_VALIDATION" if status != "DUPLICATE" else "DUPLICATE_FOUND", 
-                                    "missing": ",".join(missing_list) if missing_list else None, 
-                                    "invalid": ",".join(invalid_list) if invalid_list else None, 
-                                    "duplicate_reason": "Exact match detected via signature hash" if status == "DUPLICATE" else None, 
-                                    "processed_at": datetime.now()
-                                })
-                                
-                                if status == "VALID":
-                                    master_data_batch.append({
-                                        "name": row['name'],
-                                        "address": row['address'],
-                                        "website": row['website'],
-                                        "phone_number": row['phone_number'],
-                                        "reviews_count": self.safe_int(row.get('reviews_count', 0)),
-                                        "reviews_avg": self.safe_float(row.get('reviews_average', 0.00)),
-                                        "category": row['category'],
-                                        "subcategory": row['subcategory'],
-                                        "city": row['city'],
-                                        "state": row['state'],
-                                        "area": row['area'],
-                                        "created_at": created_at
-                                    })
-                                    batch_summary["cleaned"] += 1
-                        except Exception as row_err:
-                            logger.warning(f"Row validation failed (skipping): {str(row_err)[:100]}")
-                            continue
-
-                    # 4. Execute Batch Writes — each INSERT is individually protected
-                    if clean_data_batch:
-                        try:
-                            conn.execute(text("""
-                                INSERT IGNORE INTO raw_clean_google_map_data 
-                                (raw_id, signature_hash, name, address, website, phone_number, reviews_count, reviews_avg,
-                                 category, subcategory, city, state, area, created_at,
-                                 validation_status, cleaning_status, missing_fields, invalid_format_fields, duplicate_reason, processed_at)
-                                VALUES (:raw_id, :sig_hash, :name, :address, :website, :phone, :reviews, :avg, :cat, :sub, :city, :state, :area, :created,
-                                        :val_status, :clean_status, :missing, :invalid, :duplicate_reason, :processed_at)
-                            """), clean_data_batch)
-                        except Exception as e:
-                            logger.warning(f"Clean table batch insert failed (non-fatal): {str(e)[:200]}")
-                        
-                    if master_data_batch:
-                        try:
-                            conn.execute(text("""
-                                INSERT IGNORE INTO g_map_master_table 
-                                (name, address, website, phone_number, reviews_count, reviews_avg, category, subcategory, city, state, area, created_at)
-                                VALUES (:name, :address, :website, :phone_number, :reviews_count, :reviews_avg, :category, :subcategory, :city, :state, :area, :created_at)
-                            """), master_data_batch)
-                        except Exception as e:
-                            logger.warning(f"Master table batch insert failed (non-fatal): {str(e)[:200]}")
-
-                # 5. Finalize batch — ALWAYS advance the cursor
-                batch_summary['last_id'] = current_max_id
-                self.update_last_processed_id(current_max_id)
-                self.log_validation_batch(batch_summary)
-                last_id = current_max_id
-                self.consecutive_errors = 0  # Reset on success
-                
-                logger.info(f"Quality Cycle Complete: Processed {batch_summary['total']} | Valid: {batch_summary['valid']} | Missing: {batch_summary['missing']} | Dup: {batch_summary['duplicate']} | Master: {batch_summary['cleaned']} | Last ID: {last_id}")
+                if VALIDATION_PIPELINE:
+                    # Read, normalise and write overlap; returns only on shutdown
+                    ValidationPipeline(
+                        self, queue_depth=VALIDATION_QUEUE_DEPTH, normalise_workers=VALIDATION_NORMALISE_WORKERS
+                    ).run(last_id, on_batch)
+                    continue
+
+                current_max_id, batch_summary = self.process_batch(last_id)
+                if batch_summary is None:
+                    self.consecutive_errors = 0  # Reset on successful idle
+                    if self.shutdown_event.wait(timeout=10):
+                        break
+                    continue
+                on_batch(current_max_id, batch_summary)
 
             except Exception as e:
                 self.consecutive_errors += 1
@@ -678,6 +889,9 @@ class ValidationQualityProcessor:
                 if self.shutdown_event.wait(timeout=backoff):
                     break
 
+        if self.signature_filter:
+            self.signature_filter.maybe_snapshot(force=True)
+
 def get_engine():
     return GDriveHighSpeedIngestor()
 
@@ -700,9 +914,16 @@ def start_background_etl():
     t_scanner = threading.Thread(target=scanner_loop, name="ScannerThread", daemon=True)
     t_scanner.start()
 
-    # Start Validation & Cleaning Thread
+    # Start Validation & Cleaning Thread (or, sharded, the coordinator handing id ranges to Celery)
     validator = ValidationQualityProcessor(ingestor.engine, ingestor.shutdown_event)
-    t_validator = threading.Thread(target=validator.start_pipeline, name="QualityThread", daemon=True)
+    if VALIDATION_SHARDS > 0:
+        coordinator = ValidationShardCoordinator(
+            validator, shards=VALIDATION_SHARDS, range_size=VALIDATION_RANGE_SIZE,
+            lease_seconds=VALIDATION_RANGE_LEASE_SECONDS
+        )
+        t_validator = threading.Thread(target=coordinator.run, name="QualityCoordinator", daemon=True)
+    else:
+        t_validator = threading.Thread(target=validator.start_pipeline, name="QualityThread", daemon=True)
     t_validator.start()
 
     return ingestor
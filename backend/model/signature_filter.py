@@ -0,0 +1,167 @@
+"""
+In-process Bloom filter over raw_clean_google_map_data.signature_hash.
+
+ValidationQualityProcessor asks the filter first and only sends probable hits to MySQL,
+so the (mostly new) hashes of a batch cost no IN-list lookups. The filter is:
+  - loaded from its last snapshot at startup and caught up from the clean table by id,
+    or built by one keyset scan when there is no usable snapshot (in the background;
+    until it is ready every hash goes to MySQL as before);
+  - updated with every batch the processor inserts;
+  - caught up every `catch_up_seconds` with rows other writers inserted, re-reading an
+    `overlap` of ids because auto-increment ids can commit out of order;
+  - snapshotted to disk every `snapshot_seconds`.
+A miss can only be wrong for a row another writer committed within the last catch-up
+interval; the clean and master tables' unique indexes still reject such duplicates.
+"""
+import os
+import time
+import logging
+import threading
+from sqlalchemy import text
+
+from utils.bloom_filter import BloomFilter
+from utils.metrics import (
+    signature_bloom_bytes, signature_bloom_items, signature_bloom_fp_rate,
+    signature_bloom_checks, signature_bloom_false_positives
+)
+
+logger = logging.getLogger("SignatureFilter")
+
+CLEAN_TABLE = "raw_clean_google_map_data"
+
+
+class SignatureFilter:
+    def __init__(self, engine, capacity=20_000_000, error_rate=0.001, snapshot_path=None,
+                 snapshot_seconds=300, catch_up_seconds=10, overlap=5000, scan_batch=50000):
+        self.engine = engine
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.snapshot_path = snapshot_path
+        self.snapshot_seconds = snapshot_seconds
+        self.catch_up_seconds = catch_up_seconds
+        self.overlap = overlap
+        self.scan_batch = scan_batch
+        self.bloom = None
+        self.watermark = 0  # highest clean-table id folded into the filter
+        self.last_catch_up = 0
+        self.last_snapshot = time.time()
+        self.shutdown_event = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.bloom is not None
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None, 0
+        try:
+            bloom, meta = BloomFilter.load(self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable signature filter snapshot: {e}")
+            return None, 0
+        if bloom.capacity != self.capacity or bloom.error_rate != self.error_rate:
+            logger.info("Signature filter sizing changed since the snapshot; rebuilding.")
+            return None, 0
+        return bloom, int(meta.get("watermark", 0))
+
+    def _scan(self, conn, bloom, after_id):
+        """Adds every signature with id > after_id (keyset chunks). Returns the last id seen."""
+        last_id = after_id
+        while True:
+            rows = conn.execute(text(f"""
+                SELECT id, signature_hash FROM {CLEAN_TABLE}
+                WHERE id > :after ORDER BY id LIMIT :lim
+            """), {"after": last_id, "lim": self.scan_batch}).fetchall()
+            for _, sig in rows:
+                if sig:
+                    bloom.add(sig)
+            if rows:
+                last_id = rows[-1][0]
+            if len(rows) < self.scan_batch or self._stopping():
+                return last_id
+
+    def _stopping(self):
+        return self.shutdown_event is not None and self.shutdown_event.is_set()
+
+    def warm(self, shutdown_event=None):
+        """Loads the snapshot (or scans the whole table) and catches up. Never throws."""
+        self.shutdown_event = shutdown_event
+        try:
+            start = time.time()
+            bloom, watermark = self._load_snapshot()
+            source = "snapshot"
+            if bloom is None:
+                bloom, watermark, source = BloomFilter(self.capacity, self.error_rate), 0, "full scan"
+            with self.engine.connect() as conn:
+                watermark = self._scan(conn, bloom, max(0, watermark - self.overlap) if watermark else 0)
+            if self._stopping():
+                return
+            with self._lock:
+                self.bloom = bloom
+                self.watermark = watermark
+                self.last_catch_up = 0  # first check folds in rows inserted while warming
+            self._export_metrics()
+            logger.info(f"Signature filter ready from {source} in {time.time() - start:.1f}s: "
+                        f"{bloom.count} signatures, {bloom.nbytes / 1e6:.1f} MB, "
+                        f"est. FP rate {bloom.estimated_error_rate():.5f}")
+            if bloom.count > self.capacity:
+                logger.warning("Signature filter is over capacity; raise SIGNATURE_BLOOM_CAPACITY.")
+        except Exception as e:
+            logger.warning(f"Signature filter warm-up failed; duplicate checks stay on MySQL: {e}")
+
+    def start_warming(self, shutdown_event=None):
+        t = threading.Thread(target=self.warm, args=(shutdown_event,), name="SignatureFilterWarm", daemon=True)
+        t.start()
+        return t
+
+    def catch_up(self, conn, force=False):
+        """Folds in rows inserted by other writers since the last catch-up. Never throws."""
+        if not self.ready or (not force and time.time() - self.last_catch_up < self.catch_up_seconds):
+            return
+        try:
+            with self._lock:
+                self.watermark = max(self.watermark, self._scan(conn, self.bloom, max(0, self.watermark - self.overlap)))
+                self.last_catch_up = time.time()
+        except Exception as e:
+            logger.warning(f"Signature filter catch-up failed (non-fatal): {e}")
+
+    def probable(self, hashes):
+        """The subset of `hashes` that may already exist; everything when the filter is not ready."""
+        if not self.ready:
+            return set(hashes)
+        bloom = self.bloom
+        hits = {h for h in hashes if h in bloom}
+        signature_bloom_checks.labels(result="probable").inc(len(hits))
+        signature_bloom_checks.labels(result="negative").inc(len(hashes) - len(hits))
+        return hits
+
+    def record_false_positives(self, n):
+        if n:
+            signature_bloom_false_positives.inc(n)
+
+    def add_many(self, hashes):
+        if not self.ready:
+            return
+        with self._lock:
+            self.bloom.update(h for h in hashes if h)
+        self._export_metrics()
+
+    def _export_metrics(self):
+        bloom = self.bloom
+        signature_bloom_bytes.set(bloom.nbytes)
+        signature_bloom_items.set(bloom.count)
+        signature_bloom_fp_rate.set(bloom.estimated_error_rate())
+
+    def maybe_snapshot(self, force=False):
+        """Persists the filter every snapshot_seconds (and on shutdown). Never throws."""
+        if not self.ready or not self.snapshot_path:
+            return
+        if not force and time.time() - self.last_snapshot < self.snapshot_seconds:
+            return
+        try:
+            with self._lock:
+                self.bloom.save(self.snapshot_path, watermark=self.watermark)
+            self.last_snapshot = time.time()
+        except Exception as e:
+            logger.warning(f"Signature filter snapshot failed (non-fatal): {e}")
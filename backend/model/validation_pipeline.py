@@ -0,0 +1,146 @@
+"""
+Three-stage pipeline for ValidationQualityProcessor:
+
+    reader ──read queue──> normaliser pool ──normalised queue──> writer
+
+The reader prefetches raw batches by keyset (its cursor runs ahead of the writer's),
+the normaliser pool runs normalise_raw_batch off the writer's thread, and the writer
+(the caller's thread) does the duplicate check and the inserts, one transaction per
+batch, strictly in id order. So batch N+1 is read while batch N is normalised and batch
+N-1 written, and both queues are bounded, so at most about 2 * queue_depth + workers
+batches are in memory. An error in any stage surfaces in the writer after every batch
+before it has been written; run() raises it and the caller restarts from the last
+committed id, discarding whatever was prefetched.
+"""
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import validation_stage_seconds, validation_queue_depth
+
+logger = logging.getLogger("ValidationPipeline")
+
+POLL_SECONDS = 0.5
+
+
+class _StageError:
+    def __init__(self, stage, error):
+        self.stage = stage
+        self.error = error
+
+
+class ValidationPipeline:
+    def __init__(self, processor, queue_depth=2, normalise_workers=2, idle_seconds=10, upper_id=None):
+        self.processor = processor
+        self.shutdown_event = processor.shutdown_event
+        self.queue_depth = max(1, queue_depth)
+        self.normalise_workers = max(1, normalise_workers)
+        self.idle_seconds = idle_seconds
+        self.upper_id = upper_id
+
+    def _stopping(self, stop):
+        return stop.is_set() or self.shutdown_event.is_set()
+
+    def _wait(self, stop, seconds):
+        deadline = time.time() + seconds
+        while not self._stopping(stop) and time.time() < deadline:
+            stop.wait(POLL_SECONDS)
+
+    def _put(self, q, name, item, stop):
+        """Blocking put that gives up when the pipeline stops. Returns False if it did."""
+        while not self._stopping(stop):
+            try:
+                q.put(item, timeout=POLL_SECONDS)
+                validation_queue_depth.labels(queue=name).set(q.qsize())
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q, name, stop):
+        while not self._stopping(stop):
+            try:
+                item = q.get(timeout=POLL_SECONDS)
+                validation_queue_depth.labels(queue=name).set(q.qsize())
+                return item
+            except queue.Empty:
+                continue
+        return None
+
+    def _read_stage(self, last_id, read_q, stop):
+        cursor = last_id
+        while not self._stopping(stop):
+            try:
+                start = time.time()
+                raw_rows = self.processor.read_raw_batch(cursor, self.upper_id)
+                validation_stage_seconds.labels(stage="read").observe(time.time() - start)
+            except Exception as e:
+                self._put(read_q, "read", _StageError("read", e), stop)
+                return
+            if not raw_rows:
+                self._wait(stop, self.idle_seconds)
+                continue
+            if not self._put(read_q, "read", (cursor, raw_rows), stop):
+                return
+            cursor = max(row['id'] for row in raw_rows)
+
+    def _normalise(self, raw_rows, batch_last_id):
+        start = time.time()
+        result = self.processor.normalise_raw_batch(raw_rows, batch_last_id)
+        validation_stage_seconds.labels(stage="normalise").observe(time.time() - start)
+        return result
+
+    def _normalise_stage(self, read_q, norm_q, executor, stop):
+        """Submits batches to the pool in arrival order; the writer awaits the futures in that order."""
+        while not self._stopping(stop):
+            item = self._get(read_q, "read", stop)
+            if item is None:
+                return
+            if isinstance(item, _StageError):
+                self._put(norm_q, "normalised", item, stop)
+                return
+            batch_last_id, raw_rows = item
+            if not self._put(norm_q, "normalised", executor.submit(self._normalise, raw_rows, batch_last_id), stop):
+                return
+
+    def run(self, last_id, on_batch):
+        """
+        Processes batches after `last_id` until shutdown, calling on_batch(current_max_id,
+        batch_summary) after each commit. Returns the last committed id; raises the first
+        stage error once every earlier batch is written.
+        """
+        stop = threading.Event()
+        read_q = queue.Queue(maxsize=self.queue_depth)
+        norm_q = queue.Queue(maxsize=self.queue_depth)
+        executor = ThreadPoolExecutor(max_workers=self.normalise_workers, thread_name_prefix="QualityNormalise")
+        reader = threading.Thread(target=self._read_stage, args=(last_id, read_q, stop),
+                                  name="QualityReader", daemon=True)
+        dispatcher = threading.Thread(target=self._normalise_stage, args=(read_q, norm_q, executor, stop),
+                                      name="QualityNormaliseDispatch", daemon=True)
+        reader.start()
+        dispatcher.start()
+        try:
+            while not self._stopping(stop):
+                item = self._get(norm_q, "normalised", stop)
+                if item is None:
+                    break
+                if isinstance(item, _StageError):
+                    logger.warning(f"Quality pipeline {item.stage} stage failed; restarting from ID {last_id}")
+                    raise item.error
+                batch_rows, signatures, current_max_id = item.result()
+
+                start = time.time()
+                batch_summary = self.processor.write_batch(batch_rows, signatures, current_max_id)
+                validation_stage_seconds.labels(stage="write").observe(time.time() - start)
+                on_batch(current_max_id, batch_summary)
+                last_id = current_max_id
+            return last_id
+        finally:
+            stop.set()
+            reader.join()
+            dispatcher.join()
+            executor.shutdown(wait=True, cancel_futures=True)
+            validation_queue_depth.labels(queue="read").set(0)
+            validation_queue_depth.labels(queue="normalised").set(0)
@@ -0,0 +1,216 @@
+"""
+Sharded validation: a coordinator splits raw_google_map_drive_data ids into ranges and
+hands them to Celery range tasks (tasks.validation.process_range), each running
+ValidationQualityProcessor.process_range over its own (start, end].
+
+Every range has a checkpoint row in etl_metadata, `validation_range:<start>:<end>`, holding
+{"cursor", "done", "updated"}; a worker resumes a range from its cursor. The coordinator
+owns 'last_processed_id' and only advances it over the contiguous prefix of finished
+ranges, so it never runs ahead of a range still in flight. A range whose checkpoint has
+not moved for `lease_seconds` is handed out again. One coordinator runs at a time
+(Redis lease); the rest stand by. The worker running a range renews its own Redis lease
+after every batch, so a slow range is not picked up by a second worker mid-run.
+
+Range batches are logged to data_validation_log with the coordinator watermark, so the
+unsharded processor resumes from resume_point() over the range checkpoints instead.
+"""
+import json
+import time
+import uuid
+import logging
+from sqlalchemy import text, bindparam
+
+from utils.file_sketches import get_redis
+
+logger = logging.getLogger("ValidationShards")
+
+RAW_TABLE = "raw_google_map_drive_data"
+RANGE_PREFIX = "validation_range:"
+LEADER_KEY = "lock:validation_coordinator"
+
+
+def range_key(start, end):
+    return f"{RANGE_PREFIX}{start}:{end}"
+
+
+def write_range_checkpoint(conn, start, end, cursor, done=False):
+    conn.execute(text("""
+        INSERT INTO etl_metadata (meta_key, meta_value) VALUES (:key, :val)
+        ON DUPLICATE KEY UPDATE meta_value = VALUES(meta_value)
+    """), {
+        "key": range_key(start, end),
+        "val": json.dumps({"cursor": int(cursor), "done": bool(done), "updated": time.time()}),
+    })
+
+
+def save_range_checkpoint(engine, start, end, cursor, done=False):
+    """Records a range's progress (and keeps its lease alive). Never throws."""
+    try:
+        with engine.begin() as conn:
+            write_range_checkpoint(conn, start, end, cursor, done)
+    except Exception as e:
+        logger.warning(f"Failed to checkpoint validation range ({start}, {end}]: {e}")
+
+
+def load_range_cursor(engine, start, end):
+    """Where a worker resumes range (start, end]: its checkpointed cursor, else `start`."""
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT meta_value FROM etl_metadata WHERE meta_key = :key"),
+                {"key": range_key(start, end)}
+            ).fetchone()
+        if row and row[0]:
+            return max(int(start), int(json.loads(row[0]).get("cursor", start)))
+    except Exception as e:
+        logger.warning(f"Failed to read checkpoint for validation range ({start}, {end}]: {e}")
+    return int(start)
+
+
+def read_ranges(conn):
+    """All range checkpoints, ordered by start."""
+    rows = conn.execute(text(
+        "SELECT meta_key, meta_value FROM etl_metadata WHERE meta_key LIKE :prefix"
+    ), {"prefix": RANGE_PREFIX + "%"}).fetchall()
+    ranges = []
+    for key, value in rows:
+        try:
+            start, end = (int(x) for x in key[len(RANGE_PREFIX):].split(":"))
+            state = json.loads(value or "{}")
+        except ValueError:
+            logger.warning(f"Ignoring malformed validation range checkpoint {key!r}")
+            continue
+        ranges.append({
+            "start": start, "end": end,
+            "cursor": int(state.get("cursor", start)),
+            "done": bool(state.get("done")),
+            "updated": float(state.get("updated", 0)),
+        })
+    return sorted(ranges, key=lambda r: r["start"])
+
+
+def resume_point(watermark, ranges):
+    """
+    Highest id up to which every raw row has been validated: `watermark` carried over the
+    contiguous done ranges and into the first unfinished one up to its cursor. Lets an
+    unsharded run pick up where sharded ranges left off.
+    """
+    for r in ranges:
+        if r["start"] > watermark:
+            break
+        if not r["done"]:
+            return max(watermark, r["cursor"])
+        watermark = max(watermark, r["end"])
+    return watermark
+
+
+def plan_ranges(watermark, max_id, ranges, shards, range_size, lease_seconds, now=None):
+    """
+    Pure scheduling step. Returns (new_watermark, finished, stale, new):
+      finished  ranges in the contiguous done prefix starting at `watermark` (to delete)
+      stale     unfinished ranges whose checkpoint is older than `lease_seconds` (to re-dispatch)
+      new       (start, end) pairs to create so at most `shards` ranges are in flight
+    """
+    now = time.time() if now is None else now
+    finished = []
+    for r in ranges:
+        if r["done"] and r["start"] <= watermark:
+            finished.append(r)
+            watermark = max(watermark, r["end"])
+        else:
+            break
+    active = ranges[len(finished):]
+    pending = [r for r in active if not r["done"]]
+    stale = [r for r in pending if now - r["updated"] > lease_seconds]
+
+    new = []
+    next_start = max([r["end"] for r in active] + [watermark])
+    in_flight = len(pending)
+    while in_flight < shards and next_start < max_id:
+        end = min(next_start + range_size, max_id)
+        new.append((next_start, end))
+        next_start = end
+        in_flight += 1
+    return watermark, finished, stale, new
+
+
+def dispatch_range(start, end, watermark):
+    from tasks.gdrive_task.validation_tasks import process_validation_range
+    process_validation_range.delay(start, end, watermark)
+
+
+class ValidationShardCoordinator:
+    def __init__(self, processor, shards=4, range_size=50000, lease_seconds=900, poll_seconds=10,
+                 dispatch=dispatch_range, redis_factory=get_redis):
+        self.processor = processor
+        self.engine = processor.engine
+        self.shutdown_event = processor.shutdown_event
+        self.shards = shards
+        self.range_size = range_size
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.dispatch = dispatch
+        self.redis_factory = redis_factory
+        self.node_id = uuid.uuid4().hex
+
+    def is_leader(self):
+        """Takes or renews the coordinator lease. Without Redis there is no Celery either: stand by."""
+        try:
+            r = self.redis_factory()
+            ttl = max(30, self.poll_seconds * 6)
+            if r.set(LEADER_KEY, self.node_id, nx=True, ex=ttl):
+                return True
+            if r.get(LEADER_KEY) in (self.node_id, self.node_id.encode()):
+                r.expire(LEADER_KEY, ttl)
+                return True
+        except Exception as e:
+            logger.warning(f"Coordinator lease check failed: {e}")
+        return False
+
+    def get_watermark(self, conn):
+        row = conn.execute(text("SELECT meta_value FROM etl_metadata WHERE meta_key='last_processed_id'")).fetchone()
+        if row and str(row[0]).isdigit():
+            return int(row[0])
+        return self.processor.get_last_processed_id()
+
+    def step(self):
+        """One scheduling pass. Returns the number of ranges dispatched."""
+        with self.engine.begin() as conn:
+            watermark = self.get_watermark(conn)
+            max_id = conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {RAW_TABLE}")).scalar() or 0
+            new_watermark, finished, stale, new = plan_ranges(
+                watermark, int(max_id), read_ranges(conn), self.shards, self.range_size, self.lease_seconds
+            )
+            if finished:
+                conn.execute(text("DELETE FROM etl_metadata WHERE meta_key IN :keys").bindparams(
+                    bindparam("keys", expanding=True)
+                ), {"keys": [range_key(r["start"], r["end"]) for r in finished]})
+                # Same transaction as the delete, so a crash cannot drop ranges without advancing
+                conn.execute(text("""
+                    INSERT INTO etl_metadata (meta_key, meta_value) VALUES ('last_processed_id', :val)
+                    ON DUPLICATE KEY UPDATE meta_value = VALUES(meta_value)
+                """), {"val": str(new_watermark)})
+            for r in stale:
+                write_range_checkpoint(conn, r["start"], r["end"], r["cursor"])
+            for start, end in new:
+                write_range_checkpoint(conn, start, end, start)
+
+        if finished:
+            logger.info(f"Validation watermark advanced {watermark} -> {new_watermark} "
+                        f"({len(finished)} ranges finished).")
+        for r in stale:
+            logger.warning(f"Re-dispatching stalled validation range ({r['start']}, {r['end']}] from {r['cursor']}")
+        to_dispatch = [(r["start"], r["end"]) for r in stale] + new
+        for start, end in to_dispatch:
+            self.dispatch(start, end, new_watermark)
+        return len(to_dispatch)
+
+    def run(self):
+        logger.info(f"Validation coordinator started: {self.shards} shards x {self.range_size} ids.")
+        while not self.shutdown_event.is_set():
+            try:
+                if self.is_leader():
+                    self.step()
+            except Exception as e:
+                logger.error(f"Validation coordinator step failed: {e}")
+            self.shutdown_event.wait(self.poll_seconds)
@@ -3,19 +3,15 @@ from sqlalchemy import text
 from database.session import engine
 import logging
 import time
+from utils.file_sketches import get_redis, count_files, STANDARD_ERROR
+from utils.keyset_cursor import decode_cursor, page_response
+from utils.response_cache import cached_response, RAW_TABLE, STATE_SUMMARY, STATS_SUMMARY
 
 logger = logging.getLogger("DashboardAPI")
 dashboard_bp = Blueprint("dashboard_v4", __name__)
 
 TABLE = "raw_google_map_drive_data"
 
-# Simple in-memory cache
-CACHE = {
-    "summary": None,
-    "last_summary": 0
-}
-CACHE_TTL = 30 # 30 seconds
-
 def execute_read(query, params=None):
     """Helper to execute read queries and return list of rows (materialized)."""
     with engine.connect() as conn:
@@ -23,11 +19,55 @@ def execute_read(query, params=None):
         result = conn.execute(text(query), params or {})
         return result.fetchall()
 
+def sketch_stats(state=None, cat=None):
+    """
+    Filtered stats without touching the raw table: record/state/category counts come from
+    state_category_summary_v5, distinct CSVs from merging the matching slices' HyperLogLog
+    sketches. Returns None when the summaries or sketches are unavailable.
+    """
+    where_clauses = ["record_count > 0"]
+    params = {}
+    if state:
+        where_clauses.append("state = :state")
+        params['state'] = state
+    if cat:
+        where_clauses.append("category = :cat")
+        params['cat'] = cat
+    rows = execute_read(
+        f"SELECT state, category, record_count FROM state_category_summary_v5 WHERE {' AND '.join(where_clauses)}",
+        params
+    )
+    if not rows:
+        return None
+    return {
+        "total_records": int(sum(r[2] for r in rows)),
+        "total_states": len({r[0] for r in rows if r[0]}),
+        "total_categories": len({r[1] for r in rows if r[1]}),
+        "total_csvs": count_files(get_redis(), [(r[0], r[1]) for r in rows]),
+    }
+
+
 @dashboard_bp.route("/api/model/stats", methods=["GET"])
+@cached_response(STATS_SUMMARY, STATE_SUMMARY, RAW_TABLE)
 def get_stats():
     state = request.args.get('state')
     cat = request.args.get('category')
-    
+    exact = request.args.get('exact', '').lower() in ('1', 'true', 'yes')
+
+    # Filtered: summary table + HLL sketches (milliseconds); ?exact=true forces the live SQL below
+    if (state or cat) and not exact:
+        try:
+            stats = sketch_stats(state, cat)
+            if stats:
+                return jsonify({
+                    "status": "success",
+                    **stats,
+                    "approximate": True,
+                    "csv_relative_error": STANDARD_ERROR
+                })
+        except Exception as e:
+            logger.warning(f"Sketch stats unavailable, using exact queries: {e}")
+
     # If filtered, we still use live queries but they should be indexed
     if state or cat:
         where_clauses = []
@@ -98,24 +138,53 @@ def get_recent():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def summary_total(state=None, cat=None, file_name=None):
+    """
+    Row count for a listing's filter set, read from the summary tables (never the raw table).
+    None for a file combined with state/category: file_record_summary has no per-slice counts.
+    """
+    if file_name and (state or cat):
+        return None
+    if file_name:
+        rows = execute_read("""
+            SELECT COALESCE(SUM(s.record_count), 0) FROM file_record_summary s
+            JOIN file_registry r ON r.drive_file_id = s.drive_file_id
+            WHERE r.filename = :file_name
+        """, {"file_name": file_name})
+    elif state or cat:
+        where_clauses = []
+        params = {}
+        if state: where_clauses.append("state = :state"); params['state'] = state
+        if cat: where_clauses.append("category = :cat"); params['cat'] = cat
+        rows = execute_read(f"SELECT COALESCE(SUM(record_count), 0) FROM state_category_summary_v5 WHERE {' AND '.join(where_clauses)}", params)
+    else:
+        rows = execute_read("SELECT total_records FROM dashboard_stats_summary_v5 LIMIT 1")
+    return int(rows[0][0]) if rows else 0
+
 @dashboard_bp.route("/api/model/all", methods=["GET"])
 def get_all():
-    page = int(request.args.get('page', 1))
-    limit = int(request.args.get('limit', 50))
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
     state = request.args.get('state')
     cat = request.args.get('category')
     file_name = request.args.get('file_name')
-    offset = (page - 1) * limit
+    filters = {k: v for k, v in (("state", state), ("category", cat), ("file_name", file_name)) if v}
+    try:
+        cursor = decode_cursor(request.args.get('cursor'), filters)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     
-    params = {"limit": limit, "offset": offset}
+    # Keyset pagination: every page is an index range read of limit+1 rows, however deep
+    params = {"limit": limit + 1}
     where_clauses = []
     if state: where_clauses.append("state = :state"); params['state'] = state
     if cat: where_clauses.append("category = :cat"); params['cat'] = cat
     if file_name: where_clauses.append("drive_file_name = :file_name"); params['file_name'] = file_name
+    if cursor is not None: where_clauses.append("id < :cursor"); params['cursor'] = cursor
     where_str = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
     
     try:
-        rows = execute_read(f"SELECT id, name, address, website, phone_number, reviews_count, reviews_average, category, subcategory, city, state, area, drive_file_name, drive_file_path FROM {TABLE} {where_str} ORDER BY id DESC LIMIT :limit OFFSET :offset", params)
+        rows = execute_read(f"SELECT id, name, address, website, phone_number, reviews_count, reviews_average, category, subcategory, city, state, area, drive_file_name, drive_file_path FROM {TABLE} {where_str} ORDER BY id DESC LIMIT :limit", params)
+        rows, next_cursor, has_next = page_response(rows, limit, filters)
         data = []
         for r in rows:
             data.append({
@@ -124,7 +193,13 @@ def get_all():
                 "subcategory": r[8], "city": r[9], "state": r[10], "area": r[11], "drive_file_name": r[12],
                 "drive_file_path": r[13]
             })
-        return jsonify({"status": "success", "data": data, "page": page, "limit": limit})
+        try:
+            total = summary_total(state, cat, file_name)
+        except Exception as e:
+            logger.warning(f"Summary total unavailable: {e}")
+            total = None
+        return jsonify({"status": "success", "data": data, "limit": limit, "total": total,
+                        "next_cursor": next_cursor, "has_next": has_next})
     except Exception as e:
         logger.error(f"All Data Error: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -142,6 +217,7 @@ def get_files():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @dashboard_bp.route("/api/model/state-summary", methods=["GET"])
+@cached_response(STATE_SUMMARY)
 def get_state_summary():
     # Use Summary Table for Instant Category Explorer
     try:
@@ -7,6 +7,9 @@ from flask import Blueprint, jsonify, request
 from sqlalchemy import text
 from database.session import engine
 import logging
+from utils.keyset_cursor import decode_cursor, page_response
+from utils.validation_snapshot import read_snapshot
+from utils.response_cache import cached_response, RAW_TABLE as RAW_TAG, CLEAN_TABLE as CLEAN_TAG, VALIDATION_LOG
 
 logger = logging.getLogger("ValidationDashboard")
 validation_dashboard_bp = Blueprint("validation_dashboard", __name__)
@@ -30,59 +33,36 @@ def execute_read(query, params=None):
 # ═══════════════════════════════════════════════════════════════════
 
 @validation_dashboard_bp.route("/api/validation/dashboard", methods=["GET"])
+@cached_response(RAW_TAG, CLEAN_TAG, VALIDATION_LOG)
 def get_validation_dashboard():
-    """📊 Main dashboard endpoint — refactored for Tier 1/2/3 Architecture."""
+    """📊 Main dashboard endpoint — one snapshot row plus the latest clean rows."""
     try:
-        # 📈 1. Overall counts (Real-time)
-        raw_count = execute_read(f"SELECT COUNT(*) FROM {RAW_TABLE}")[0][0]
-        clean_count = execute_read(f"SELECT COUNT(*) FROM {CLEAN_TABLE}")[0][0]
-        
-        # 🔄 2. Processing Stats (from Logs)
-        log_totals = execute_read("""
-            SELECT SUM(total_processed), SUM(missing_count), SUM(valid_count), SUM(duplicate_count), MAX(last_id)
-            FROM data_validation_log
-        """)[0]
-        
-        total_p = int(log_totals[0] or 0)
-        missing = int(log_totals[1] or 0)
-        valid = int(log_totals[2] or 0)
-        duplicate = int(log_totals[3] or 0)
-        last_id = int(log_totals[4] or 0)
-        
-        # 🏷️ 3. Validation status breakdown (derived)
+        # 📈 1. Counters maintained by ValidationQualityProcessor (validation_dashboard_snapshot)
+        with engine.connect() as conn:
+            snap = read_snapshot(conn)
+        raw_count = snap["raw_count"]
+        clean_count = snap["clean_count"]
+        last_id = snap["last_id"]
+        missing = snap["missing_count"]
+        duplicate = snap["duplicate_count"]
+
+        # 🏷️ 2. Validation status breakdown (derived)
         pending = max(0, raw_count - last_id)
         
         validation_breakdown = {
             "PENDING": pending,
-            "VALID": clean_count,
+            "VALID": snap["valid_count"],
+            "INVALID": snap["invalid_count"],
             "MISSING": missing,
             "DUPLICATE": duplicate
         }
 
-        # 📊 4. Pipeline progress percentage
+        # 📊 3. Pipeline progress percentage
         ingestion_pct = 100 # Ingestion is direct now
         validation_pct = round((last_id / raw_count * 100), 2) if raw_count > 0 else 0
         cleaning_pct = round((clean_count / raw_count * 100), 2) if raw_count > 0 else 0
 
-        # ❌ 5. Error rows (most recent 100)
-        error_rows = execute_read(f"""
-            SELECT id, raw_id, name, city, state, category, phone_number, bank_number, 
-                   validation_label, error_reason, missing_fields, invalid_format_fields, created_at
-            FROM {INVALID_TABLE}
-            ORDER BY created_at DESC
-            LIMIT 100
-        """)
-        errors = []
-        for r in error_rows:
-            errors.append({
-                "id": r[0], "raw_id": r[1], "name": r[2], "city": r[3], "state": r[4],
-                "category": r[5], "phone_number": r[6], "bank_number": r[7],
-                "validation_status": r[8], "error_reason": r[9],
-                "missing_fields": r[10], "invalid_format_fields": r[11],
-                "processed_at": str(r[12]) if r[12] else None
-            })
-
-        # ✅ 6. Clean data sample
+        # ✅ 4. Clean data sample
         clean_rows = execute_read(f"""
             SELECT id, raw_id, name, address, phone_number, category, city, state, reviews_count, reviews_avg, created_at
             FROM {CLEAN_TABLE}
@@ -110,7 +90,7 @@ def get_validation_dashboard():
             },
             "summary": {
                 "pending": pending,
-                "valid": clean_count,
+                "valid": snap["valid_count"],
                 "missing": missing,
                 "duplicate": duplicate
             },
@@ -139,19 +119,28 @@ def get_validation_errors():
 
 @validation_dashboard_bp.route("/api/validation/clean", methods=["GET"])
 def get_clean_data():
-    """✅ Paginated clean/production data."""
-    page = int(request.args.get("page", 1))
-    limit = int(request.args.get("limit", 50))
-    offset = (page - 1) * limit
+    """✅ Keyset-paginated clean/production data (pass back `next_cursor` as `cursor`)."""
+    limit = max(1, min(request.args.get("limit", 50, type=int), 500))
+    try:
+        cursor = decode_cursor(request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
 
     try:
+        params = {"limit": limit + 1}
+        where_str = ""
+        if cursor is not None:
+            where_str = "WHERE id < :cursor"
+            params["cursor"] = cursor
         rows = execute_read(f"""
             SELECT id, raw_id, name, address, website, phone_number, toll_free_number, reviews_count, reviews_avg,
                    category, subcategory, city, state, area, created_at
             FROM {CLEAN_TABLE}
+            {where_str}
             ORDER BY id DESC
-            LIMIT :limit OFFSET :offset
-        """, {"limit": limit, "offset": offset})
+            LIMIT :limit
+        """, params)
+        rows, next_cursor, has_next = page_response(rows, limit)
 
         data = []
         for r in rows:
@@ -162,8 +151,11 @@ def get_clean_data():
                 "area": r[13], "created_at": str(r[14]) if r[14] else None
             })
 
-        total = execute_read(f"SELECT COUNT(*) FROM {CLEAN_TABLE}")[0][0]
-        return jsonify({"status": "success", "data": data, "page": page, "total": total})
+        # 📋 Clean-table row count from the validation snapshot (no COUNT(*) scan)
+        with engine.connect() as conn:
+            total = read_snapshot(conn)["clean_count"]
+        return jsonify({"status": "success", "data": data, "limit": limit, "total": total,
+                        "next_cursor": next_cursor, "has_next": has_next})
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
@@ -173,35 +165,31 @@ def get_clean_data():
 # ═══════════════════════════════════════════════════════════════════
 
 @validation_dashboard_bp.route("/api/validation/report", methods=["GET"])
+@cached_response(RAW_TAG, CLEAN_TAG, VALIDATION_LOG)
 def get_validation_report():
-    """📈 Detailed analytics from logs and production tables."""
+    """📈 Detailed analytics from the validation snapshot tables."""
     try:
         # 🎯 1. KPIs
-        raw_count = execute_read(f"SELECT COUNT(*) FROM {RAW_TABLE}")[0][0]
-        clean_count = execute_read(f"SELECT COUNT(*) FROM {CLEAN_TABLE}")[0][0]
-        
-        log_totals = execute_read("""
-            SELECT SUM(total_processed), MAX(timestamp)
-            FROM data_validation_log
-        """)[0]
+        with engine.connect() as conn:
+            snap = read_snapshot(conn)
+        total_p = snap["clean_count"]
+        valid = snap["valid_count"]
+        last_updated = snap["last_batch_at"]
         
-        total_p = int(log_totals[0] or 0)
-        last_updated = log_totals[1]
-        
-        accuracy = round((clean_count / total_p * 100), 2) if total_p > 0 else 0
+        accuracy = round((valid / total_p * 100), 2) if total_p > 0 else 0
 
-        # 🔍 2. Issues Report (derived from log)
+        # 🔍 2. Issues Report
         issue_report = [
-            {"type": "MISSING", "count": int(execute_read("SELECT SUM(missing_count) FROM data_validation_log")[0][0] or 0)},
-            {"type": "DUPLICATE", "count": int(execute_read("SELECT SUM(duplicate_count) FROM data_validation_log")[0][0] or 0)}
+            {"type": "MISSING", "count": snap["missing_count"]},
+            {"type": "INVALID", "count": snap["invalid_count"]},
+            {"type": "DUPLICATE", "count": snap["duplicate_count"]}
         ]
 
-        # 📈 3. 7-Day Trend (from log)
+        # 📈 3. 7-Day Trend
         trend_rows = execute_read("""
-            SELECT DATE(timestamp) as d, SUM(total_processed) 
-            FROM data_validation_log
-            WHERE timestamp >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-            GROUP BY d ORDER BY d ASC
+            SELECT day, clean_count FROM validation_daily_snapshot
+            WHERE day >= CURDATE() - INTERVAL 7 DAY
+            ORDER BY day ASC
         """)
         trend = [{"date": str(r[0]), "count": int(r[1])} for r in trend_rows]
 
@@ -209,7 +197,7 @@ def get_validation_report():
             "status": "success",
             "kpis": {
                 "total": total_p,
-                "valid": clean_count,
+                "valid": valid,
                 "accuracy": accuracy,
                 "last_updated": str(last_updated) if last_updated else None
             },
@@ -218,14 +206,10 @@ def get_validation_report():
             "state_stats": []
         }
 
-        # 🗺️ 4. State-wise Breakdown (Quality per state)
-        state_rows = execute_read(f"""
-            SELECT 
-                state,
-                COUNT(*) as total
-            FROM {CLEAN_TABLE}
-            GROUP BY state
-            ORDER BY total DESC
+        # 🗺️ 4. State-wise Breakdown
+        state_rows = execute_read("""
+            SELECT state, clean_count FROM validation_state_snapshot
+            ORDER BY clean_count DESC
             LIMIT 15
         """)
         
@@ -1,42 +1,50 @@
+import re
 from flask import Blueprint, jsonify, request
 from sqlalchemy import func
 from extensions import db
 from model.listing_master import ListingMaster
+from model.listing_entity import ListingEntity
 
 listing_master_bp = Blueprint('listing_master_bp', __name__)
 
+
+def _like_prefix(search):
+    """'Foo  Bar%' -> 'foo bar\\%%': matches name_key from its start, so idx(name_key) is usable."""
+    key = re.sub(r'\s+', ' ', search.strip().lower())
+    return key.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def _live_aggregation(search):
+    """Pre-index behaviour: full-table GROUP BY. Only used until the entity index has been built."""
+    query = db.session.query(
+        ListingMaster.business_name,
+        ListingMaster.category,
+        func.count(ListingMaster.id).label('total_count'),
+        func.group_concat(ListingMaster.source.distinct()).label('sources')
+    ).group_by(
+        ListingMaster.business_name,
+        ListingMaster.category
+    ).order_by(func.count(ListingMaster.id).desc())
+    if search:
+        query = query.filter(ListingMaster.business_name.ilike(f"%{search}%"))
+    return [
+        {"business_name": name, "category": category, "total_listings": count, "sources": sources}
+        for name, category, count, sources in query.limit(100).all()
+    ]
+
+
 @listing_master_bp.route('/listing-master', methods=['GET'])
 def get_aggregated_listings():
     try:
-        # SQL Query: Select Name, Category, Count(*), and list of Sources
-        # Group by Name and Category to find duplicates/branches
-        query = db.session.query(
-            ListingMaster.business_name,
-            ListingMaster.category,
-            func.count(ListingMaster.id).label('total_count'),
-            func.group_concat(ListingMaster.source.distinct()).label('sources')
-        ).group_by(
-            ListingMaster.business_name, 
-            ListingMaster.category
-        ).order_by(func.count(ListingMaster.id).desc()) # Show highest counts first
-
-        # Search Filters (Optional)
         search = request.args.get('search')
+        if db.session.query(ListingEntity.entity_id).first() is None:
+            return jsonify(_live_aggregation(search)), 200
+
+        # Cross-source entities, largest first: reads 100 rows off idx(listing_count)
+        query = db.session.query(ListingEntity).order_by(ListingEntity.listing_count.desc())
         if search:
-            query = query.filter(ListingMaster.business_name.ilike(f"%{search}%"))
-
-        results = query.limit(100).all()
-
-        # Format the data for Frontend
-        data = []
-        for name, category, count, sources in results:
-            data.append({
-                "business_name": name,
-                "category": category,
-                "total_listings": count,
-                "sources": sources  # e.g., "JustDial,GoogleMap"
-            })
-        
-        return jsonify(data), 200
+            query = query.filter(ListingEntity.name_key.like(_like_prefix(search), escape='\\'))
+
+        return jsonify([entity.to_dict() for entity in query.limit(100).all()]), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,147 @@
+"""
+Schema-driven bulk CSV uploader shared by services/csv_uploaders_listing and
+services/csv_uploaders_product.
+
+Each source is an UploadSpec: the target table, its ordered Columns (CSV header -> DB
+column, an optional transform, and whether ON DUPLICATE KEY UPDATE refreshes it) and the
+non-essential indexes to drop for the duration of the load (coordinated across
+concurrent loads by utils.index_maintenance). upload_csv_files() reads
+every file in chunks of `batch_size` rows and converts each chunk column-wise: transforms
+and null masking run on whole Series and a single zip() builds the row tuples, instead of
+a getattr + pd.isna per cell inside itertuples. Each chunk is written by a
+utils.bulk_writer.BulkWriter (multi-row upserts sized to max_allowed_packet) and
+committed; rows/sec and bytes/sec are logged per upload.
+"""
+import logging
+import pandas as pd
+
+from database.mysql_connection import get_mysql_connection
+from utils.to_valid_json import to_valid_json
+from utils.bulk_writer import BulkWriter
+from utils.csv_parts import open_csv_part
+from utils.index_maintenance import begin_bulk_load, end_bulk_load, renew_bulk_load
+
+logger = logging.getLogger("CsvUploadEngine")
+
+BATCH_SIZE = 10000
+
+
+def decimal_text(series):
+    """Vectorised utils.clean_data_decimal: '9876543210.0' -> '9876543210', one leading zero dropped."""
+    text = series.astype(str).str.strip().str.replace(r'\.0$', '', regex=True).str.strip()
+    empty = text.isin(["", "nan", "None"]) | series.isna()
+    text = text.where(~((text.str.len() > 1) & text.str.startswith('0')), text.str[1:])
+    return text.where(~empty)
+
+
+def json_text(series):
+    """utils.to_valid_json over the non-null values (literal_eval has no vectorised form)."""
+    return series.map(to_valid_json, na_action='ignore')
+
+
+class Column:
+    def __init__(self, name, csv=None, transform=None, update=True):
+        self.name = name
+        self.csv = csv or name
+        self.transform = transform
+        self.update = update
+
+
+class UploadSpec:
+    def __init__(self, table, columns, rename_spaces=False, indexes=(), batch_size=BATCH_SIZE):
+        self.table = table
+        self.columns = columns
+        # Headers like 'Branch Code' are read as 'Branch_Code'
+        self.rename_spaces = rename_spaces
+        self.indexes = list(indexes)
+        self.batch_size = batch_size
+
+    def writer(self, cursor, **kwargs):
+        return BulkWriter(cursor, self.table, [c.name for c in self.columns],
+                          [c.name for c in self.columns if c.update], **kwargs)
+
+
+def chunk_rows(chunk, spec):
+    """DataFrame chunk -> list of row tuples in spec column order, NaN as None."""
+    if spec.rename_spaces:
+        chunk = chunk.rename(columns=lambda c: c.replace(' ', '_'))
+    size = len(chunk)
+    values = []
+    for column in spec.columns:
+        if column.csv not in chunk.columns:
+            values.append([None] * size)
+            continue
+        series = chunk[column.csv]
+        if column.transform is not None:
+            series = column.transform(series)
+        series = series.astype(object)
+        values.append(series.where(series.notna(), None).tolist())
+    return list(zip(*values))
+
+
+def set_spec_indexes(spec, present, load_id):
+    """
+    Begins (present=False) or ends the bulk load `load_id` of spec.table on its own
+    connection: the indexes go away with the first concurrent load and come back with the last.
+    """
+    if not spec.indexes:
+        return
+    connection = get_mysql_connection()
+    cursor = connection.cursor()
+    try:
+        if present:
+            end_bulk_load(cursor, spec.table, spec.indexes, load_id)
+        else:
+            begin_bulk_load(cursor, spec.table, spec.indexes, load_id)
+        connection.commit()
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def upload_csv_files(spec, file_paths, manage_indexes=True, load_id=None):
+    """
+    Upserts every row of `file_paths` into spec.table. Returns the number of rows written.
+    Entries may also be byte-range parts (utils.csv_parts); parallel part uploads pass
+    manage_indexes=False and leave the index drop/recreate to whoever fanned them out,
+    passing its `load_id` so every committed chunk keeps that load's lease alive.
+    """
+    if not file_paths:
+        raise ValueError("No file paths provided for upload.")
+    manage_indexes = manage_indexes and bool(spec.indexes)
+    connection = get_mysql_connection()
+    cursor = connection.cursor()
+    inserted = 0
+    owned_load = None
+    try:
+        if manage_indexes:
+            owned_load = load_id = begin_bulk_load(cursor, spec.table, spec.indexes, load_id)
+            connection.commit()
+        writer = spec.writer(cursor)
+        for file in file_paths:
+            source = open_csv_part(file)
+            try:
+                for chunk in pd.read_csv(source, chunksize=spec.batch_size, encoding='utf-8'):
+                    chunk_data = chunk_rows(chunk, spec)
+                    try:
+                        inserted += writer.write(chunk_data)
+                        connection.commit()
+                        renew_bulk_load(spec.table, load_id)
+                    except Exception:
+                        logger.error(f"Upload into {spec.table} failed; rolling back the current chunk")
+                        connection.rollback()
+                        raise
+            finally:
+                if source is not file:
+                    source.close()
+        writer.log_summary()
+        return inserted
+    finally:
+        try:
+            if owned_load:
+                # Also on failure: a failed load must not leave the table without its indexes
+                end_bulk_load(cursor, spec.table, spec.indexes, owned_load)
+                connection.commit()
+        finally:
+            cursor.close()
+            connection.close()
@@ -1,62 +1,16 @@
-import pandas as pd
-from database.mysql_connection import get_mysql_connection
-from utils.safe_get import safe_get
-from utils.to_valid_json import to_valid_json
-from utils.drop_non_essential_indexes import drop_non_essential_indexes
-from utils.create_non_essential_indexes import create_non_essential_indexes
+from services.csv_upload_engine import Column, UploadSpec, upload_csv_files, json_text
 
-def upload_nearbuy_data(file_paths):
-
-    if not file_paths:
-        raise ValueError("No file paths provided for upload.")
-    connection = get_mysql_connection()
-    cursor = connection.cursor()
-    inserted = 0
-    batch_size = 10000
-    upload_success = False
-    try:
-        for file in file_paths:
-            with open(file,newline='',encoding='utf-8') as f:
-                chunkFile_data = pd.read_csv(file,chunksize = batch_size)
-                for chunk in chunkFile_data:
-                    chunk_data = []
-                    for row in chunk.itertuples(index=False):
-                        row_tuple = (
-                        safe_get(row, 'Name'),
-                        safe_get(row, 'Address'),
-                        safe_get(row, 'Latitude'),
-                        safe_get(row, 'Longitude'),
-                        to_valid_json(safe_get(row, 'Number')),
-                        safe_get(row, 'Rating'),
-                        safe_get(row, 'Country'),
-                        safe_get(row, 'City'),
-                        )
-                        chunk_data.append(row_tuple)
+NEARBUY_SPEC = UploadSpec('nearbuy', [
+    Column('name', 'Name'),
+    Column('address', 'Address'),
+    Column('latitude', 'Latitude', update=False),
+    Column('longitude', 'Longitude', update=False),
+    Column('number', 'Number', transform=json_text),
+    Column('rating', 'Rating'),
+    Column('country', 'Country'),
+    Column('city', 'City'),
+])
 
 
-                    # execute batch insert
-                    insert_query = '''
-                        INSERT INTO nearbuy (
-                            name, address, latitude, longitude, number, rating, country, city
-                        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
-                        ON DUPLICATE KEY UPDATE
-                            name = VALUES(name),
-                            address = VALUES(address),
-                            number = VALUES(number),
-                            rating = VALUES(rating),
-                            country = VALUES(country),
-                            city = VALUES(city);
-                        '''
-                    try:
-                        cursor.executemany(insert_query,chunk_data)
-                        connection.commit()
-                        inserted+=len(chunk_data)
-                    except Exception:
-                        print("roll error")
-                        connection.rollback()
-                        raise 
-        # upload_success = True
-        return inserted
-    finally:
-        cursor.close()
-        connection.close()
\ No newline at end of file
+def upload_nearbuy_data(file_paths):
+    return upload_csv_files(NEARBUY_SPEC, file_paths)
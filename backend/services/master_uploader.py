@@ -1,17 +1,55 @@
 import os
+import sys
+import time
+import bisect
 import pandas as pd
-from sqlalchemy.dialects.mysql import insert
 from sqlalchemy import func
 from model.master_table_model import MasterTable
 from utils.safe_get import safe_get
-from utils.drop_non_essential_indexes import drop_non_essential_indexes
-from utils.create_non_essential_indexes import create_non_essential_indexes
+from utils.index_maintenance import begin_bulk_load, end_bulk_load, renew_bulk_load
 from utils.clean_data_decimal import clean_data_decimal
+from utils.bulk_writer import BulkWriter
+from utils.csv_parts import open_csv_part, part_path
+from utils.hyperloglog import HyperLogLog
+from utils.bloom_filter import BloomFilter
 
 CHUNK_SIZE = 2000
-BATCH_SIZE = 100
+# Rows handed to the bulk writer at a time; it packs them into max_allowed_packet-sized statements
+BATCH_SIZE = 2000
 
-def upload_master_csv(file_paths, session, report):
+MASTER_COLUMNS = [
+    "global_business_id", "business_id", "business_name", "business_category", "business_subcategory",
+    "ratings", "primary_phone", "secondary_phone", "other_phones", "virtual_phone", "whatsapp_phone",
+    "email", "website_url", "address", "area", "city", "state", "pincode", "country", "data_source",
+]
+MASTER_UPDATE_COLUMNS = [
+    "business_name", "business_category", "ratings", "primary_phone", "email", "address", "city", "state",
+]
+
+NON_ESSENTIAL_INDEXES = ['business_category', 'area', 'city', 'email', 'data_source', 'created_at']
+
+# Distinct cities/areas/categories are HyperLogLog estimates (~0.8% error), so the upload's
+# memory does not grow with the number of distinct values in the files
+SKETCH_PRECISION = 14
+SKETCH_NAMES = ("cities", "areas", "categories")
+# Cities missing from master_table are remembered in a fixed-size Bloom filter, so each one
+# counts as unmatched once per upload (a false positive counts it as matched)
+NEW_CITY_CAPACITY = int(os.getenv("MASTER_NEW_CITY_CAPACITY", "100000"))
+# master_table's cities, loaded once per worker and reused by uploads for this long
+CITY_LOOKUP_TTL = int(os.getenv("MASTER_CITY_LOOKUP_TTL", "3600"))
+
+_city_lookup = None
+_city_lookup_loaded_at = 0
+
+
+def upload_master_csv(file_paths, session, report, manage_indexes=True, load_id=None):
+    """
+    Upserts the CSVs (or utils.csv_parts byte-range parts) into master_table and returns
+    the upload stats (see merge_upload_stats). `report` may be None for a part upload;
+    parallel parts pass manage_indexes=False and the fan-out's `load_id`: the fan-out owns
+    the index drop/recreate, the parts renew its lease as they commit (both go through
+    utils.index_maintenance leases, shared with concurrent uploads).
+    """
     inserted = 0
     total_processed = 0
     rows_since_commit = 0
@@ -24,195 +62,269 @@ def upload_master_csv(file_paths, session, report):
     city_matched = 0
     city_unmatched = 0
 
-    city_set = set()
-    area_set = set()
-    category_set = set()
+    sketches = {name: HyperLogLog(SKETCH_PRECISION) for name in SKETCH_NAMES}
     
-    # Load valid cities from master_table (one-time query)
-    valid_cities = _load_valid_cities(session)
+    # Frozen city lookup shared by the worker's uploads; new cities go to the Bloom filter
+    valid_cities = _valid_cities(session)
+    new_cities = BloomFilter(NEW_CITY_CAPACITY, 0.001)
 
-    connection = session.connection()
-    cursor = connection.connection.cursor()
-    
-    non_essential_indexes = ['business_category', 'area', 'city', 'email', 'data_source', 'created_at']
+    # Only reads @@max_allowed_packet here; every batch writes on its own fresh cursor
+    cursor = session.connection().connection.cursor()
+    try:
+        writer = BulkWriter(cursor, 'master_table', MASTER_COLUMNS, MASTER_UPDATE_COLUMNS)
+    finally:
+        cursor.close()
+    owned_load = None
     
     try:
-        print("🔧 Dropping indexes...")
-        drop_non_essential_indexes(cursor, 'master_table', non_essential_indexes)
+        if manage_indexes:
+            owned_load = load_id = set_master_indexes(session, present=False, load_id=load_id)
 
         for file in file_paths:
-            if not os.path.exists(file):
-                raise FileNotFoundError(f"File not found: {file}")
+            if not os.path.exists(part_path(file)):
+                raise FileNotFoundError(f"File not found: {part_path(file)}")
 
-            for chunk in pd.read_csv(file, chunksize=CHUNK_SIZE):
-                chunk = chunk.where(pd.notna(chunk), None)
-                batch = []
+            source = open_csv_part(file)
+            try:
+                for chunk in pd.read_csv(source, chunksize=CHUNK_SIZE):
+                    chunk = chunk.where(pd.notna(chunk), None)
+                    batch = []
+                    # Distinct values of this chunk only; folded into the sketches per chunk
+                    chunk_values = {name: set() for name in SKETCH_NAMES}
 
-                for row in chunk.itertuples(index=False):
-                    total_processed += 1
-                    rows_since_commit += 1
+                    for row in chunk.itertuples(index=False):
+                        total_processed += 1
+                        rows_since_commit += 1
 
-                    global_id = safe_get(row, "global_business_id")
-                    if not global_id:
-                        continue
+                        global_id = safe_get(row, "global_business_id")
+                        if not global_id:
+                            continue
                     
-                    primary_phone = clean_data_decimal(safe_get(row, "primary_phone"))
-                    email = safe_get(row, "email")
-                    address = safe_get(row, "address")
+                        primary_phone = clean_data_decimal(safe_get(row, "primary_phone"))
+                        email = safe_get(row, "email")
+                        address = safe_get(row, "address")
                     
-                    if not primary_phone:
-                        missing_phone += 1
-                    if not email:
-                        missing_email += 1
-                    if not address:
-                        missing_address += 1
-
-                    city = safe_get(row, "city")
-                    area = safe_get(row, "area")
-                    category = safe_get(row, "business_category")
+                        if not primary_phone:
+                            missing_phone += 1
+                        if not email:
+                            missing_email += 1
+                        if not address:
+                            missing_address += 1
+
+                        city = safe_get(row, "city")
+                        area = safe_get(row, "area")
+                        category = safe_get(row, "business_category")
                     
-                    # ✅ City matching check with in-memory update
-                    if city:
-                        city_lower = city.lower().strip()
+                        # ✅ City matching check with in-memory update
+                        if city:
+                            city_lower = city.lower().strip()
                         
-                        if city_lower in valid_cities:
-                            city_matched += 1
-                        else:
-                            city_unmatched += 1
-                            # Add new city to in-memory set for future matches
-                            valid_cities.add(city_lower)
+                            if _is_valid_city(valid_cities, city_lower) or city_lower in new_cities:
+                                city_matched += 1
+                            else:
+                                city_unmatched += 1
+                                # Remember the new city for future matches
+                                new_cities.add(city_lower)
                         
-                        city_set.add(city)
+                            chunk_values["cities"].add(city)
                     
-                    if area:
-                        area_set.add(area)
-                    if category:
-                        category_set.add(category)
-
-                    batch.append({
-                        "global_business_id": global_id,
-                        "business_id": safe_get(row, "business_id"),
-                        "business_name": safe_get(row, "business_name"),
-                        "business_category": category,
-                        "business_subcategory": safe_get(row, "business_subcategory"),
-                        "ratings": clean_data_decimal(safe_get(row, "ratings")),
-                        "primary_phone": primary_phone,
-                        "secondary_phone": clean_data_decimal(safe_get(row, "secondary_phone")),
-                        "other_phones": clean_data_decimal(safe_get(row, "other_phones")),
-                        "virtual_phone": clean_data_decimal(safe_get(row, "virtual_phone")),
-                        "whatsapp_phone": clean_data_decimal(safe_get(row, "whatsapp_phone")),
-                        "email": email,
-                        "website_url": safe_get(row, "website_url"),
-                        "address": address,
-                        "area": area,
-                        "city": city,
-                        "state": safe_get(row, "state") or "Unknown",
-                        "pincode": clean_data_decimal(safe_get(row, "pincode")),
-                        "country": safe_get(row, "country") or "India",
-                        "data_source": "CSV"
-                    })
-
-                    if len(batch) >= BATCH_SIZE:
-                        print(f"📝 Processing: {total_processed}")
-                        ins = _commit_batch_upsert(batch, session)
-                        inserted += ins
-                        batch.clear()
+                        if area:
+                            chunk_values["areas"].add(area)
+                        if category:
+                            chunk_values["categories"].add(category)
+
+                        batch.append({
+                            "global_business_id": global_id,
+                            "business_id": safe_get(row, "business_id"),
+                            "business_name": safe_get(row, "business_name"),
+                            "business_category": category,
+                            "business_subcategory": safe_get(row, "business_subcategory"),
+                            "ratings": clean_data_decimal(safe_get(row, "ratings")),
+                            "primary_phone": primary_phone,
+                            "secondary_phone": clean_data_decimal(safe_get(row, "secondary_phone")),
+                            "other_phones": clean_data_decimal(safe_get(row, "other_phones")),
+                            "virtual_phone": clean_data_decimal(safe_get(row, "virtual_phone")),
+                            "whatsapp_phone": clean_data_decimal(safe_get(row, "whatsapp_phone")),
+                            "email": email,
+                            "website_url": safe_get(row, "website_url"),
+                            "address": address,
+                            "area": area,
+                            "city": city,
+                            "state": safe_get(row, "state") or "Unknown",
+                            "pincode": clean_data_decimal(safe_get(row, "pincode")),
+                            "country": safe_get(row, "country") or "India",
+                            "data_source": "CSV"
+                        })
+
+                        if len(batch) >= BATCH_SIZE:
+                            print(f"📝 Processing: {total_processed}")
+                            ins = _commit_batch_upsert(batch, session, writer)
+                            inserted += ins
+                            batch.clear()
                     
-                    # Har 50K rows pe commit
-                    if rows_since_commit >= 50000:
-                        print(f"💾 Committing at {total_processed} rows...")
-                        session.commit()
-                        rows_since_commit = 0
+                        # Har 50K rows pe commit
+                        if rows_since_commit >= 50000:
+                            print(f"💾 Committing at {total_processed} rows...")
+                            session.commit()
+                            rows_since_commit = 0
+                            renew_bulk_load('master_table', load_id)
                         
-                        # Report update
-                        _update_report(session, report, total_processed, inserted, 
-                                     city_set, area_set, category_set, 
-                                     missing_phone, missing_email, missing_address,
-                                     city_matched, city_unmatched)
-
-                if batch:
-                    ins = _commit_batch_upsert(batch, session)
-                    inserted += ins
+                            # Report update
+                            if report is not None:
+                                update_report(session, report, _upload_stats(
+                                    total_processed, inserted, sketches,
+                                    missing_phone, missing_email, missing_address,
+                                    city_matched, city_unmatched))
+
+                    for name, values in chunk_values.items():
+                        sketches[name].update(values)
+
+                    if batch:
+                        ins = _commit_batch_upsert(batch, session, writer)
+                        inserted += ins
+            finally:
+                if source is not file:
+                    source.close()
         
         # Final commit
         session.commit()
+        writer.log_summary()
 
     finally:
-        print("🔧 Recreating indexes...")
-        try:
-            create_non_essential_indexes(cursor, 'master_table', non_essential_indexes)
-            print("✅ Indexes recreated")
-        except Exception as e:
-            print(f"⚠️ Index error: {e}")
-        finally:
-            cursor.close()
+        if owned_load:
+            set_master_indexes(session, present=True, load_id=owned_load)
+
+    stats = _upload_stats(total_processed, inserted, sketches,
+                          missing_phone, missing_email, missing_address, city_matched, city_unmatched)
+    if report is not None:
+        update_report(session, report, stats)
+    return stats
+
+
+def set_master_indexes(session, present, load_id=None):
+    """
+    Drops (present=False) or recreates the indexes on a cursor of its own: after a
+    session.commit() the session may be on another pooled connection, so a cursor is
+    never kept across commits. Returns the load id.
+    """
+    cursor = session.connection().connection.cursor()
+    try:
+        if present:
+            recreate_master_indexes(cursor, load_id)
+            return load_id
+        return drop_master_indexes(cursor, load_id)
+    finally:
+        cursor.close()
+
+
+def drop_master_indexes(cursor, load_id=None):
+    """Starts a master_table bulk load; returns its load id for recreate_master_indexes."""
+    print("🔧 Dropping indexes...")
+    return begin_bulk_load(cursor, 'master_table', NON_ESSENTIAL_INDEXES, load_id)
 
-    _update_report(session, report, total_processed, inserted, 
-                 city_set, area_set, category_set, 
-                 missing_phone, missing_email, missing_address,
-                 city_matched, city_unmatched)
+
+def recreate_master_indexes(cursor, load_id):
+    print("🔧 Recreating indexes...")
+    try:
+        if end_bulk_load(cursor, 'master_table', NON_ESSENTIAL_INDEXES, load_id):
+            print("✅ Indexes recreated")
+        else:
+            print("⏳ Other uploads still running; the last one recreates the indexes")
+    except Exception as e:
+        print(f"⚠️ Index error: {e}")
 
 
 def _load_valid_cities(session):
-    """Load unique cities from master_table (one-time query)"""
+    """Unique lower-cased cities of master_table as a sorted tuple of interned strings"""
     try:
         result = session.query(
             func.lower(MasterTable.city)
         ).distinct().all()
         
-        return {city[0].strip() for city in result if city[0]}
+        return tuple(sorted({sys.intern(city[0].strip()) for city in result if city[0]}))
     except Exception as e:
         print(f"⚠️ Error loading cities: {e}")
-        return set()
+        return ()
+
+
+def _valid_cities(session):
+    """The worker's cached city lookup, reloaded after CITY_LOOKUP_TTL seconds"""
+    global _city_lookup, _city_lookup_loaded_at
+    if _city_lookup is None or time.time() - _city_lookup_loaded_at > CITY_LOOKUP_TTL:
+        _city_lookup = _load_valid_cities(session)
+        _city_lookup_loaded_at = time.time()
+    return _city_lookup
 
 
-def _commit_batch_upsert(batch, session):
+def _is_valid_city(valid_cities, city_lower):
+    i = bisect.bisect_left(valid_cities, city_lower)
+    return i < len(valid_cities) and valid_cities[i] == city_lower
+
+
+def _commit_batch_upsert(batch, session, writer):
+    """Upserts the batch on the session's current connection, so session.commit() covers it."""
     try:
-        stmt = insert(MasterTable).values(batch)
-        
-        update_dict = {
-            "business_name": stmt.inserted.business_name,
-            "business_category": stmt.inserted.business_category,
-            "ratings": stmt.inserted.ratings,
-            "primary_phone": stmt.inserted.primary_phone,
-            "email": stmt.inserted.email,
-            "address": stmt.inserted.address,
-            "city": stmt.inserted.city,
-            "state": stmt.inserted.state,
-        }
-        
-        stmt = stmt.on_duplicate_key_update(**update_dict)
-        session.execute(stmt)
-        session.flush()
-        
-        return len(batch)
-            
+        # After a session.commit() the session may be on another pooled connection: never reuse a cursor
+        cursor = session.connection().connection.cursor()
+        try:
+            return writer.write([tuple(row[c] for c in MASTER_COLUMNS) for row in batch], cursor)
+        finally:
+            cursor.close()
     except Exception as e:
         session.rollback()
         print(f"❌ Error: {str(e)[:100]}")
         raise
 
 
-def _update_report(session, report, total_processed, inserted, city_set, area_set, 
-                  category_set, missing_phone, missing_email, missing_address,
-                  city_matched, city_unmatched):
+def _upload_stats(total_processed, inserted, sketches,
+                  missing_phone, missing_email, missing_address, city_matched, city_unmatched):
+    return {
+        "total_processed": total_processed,
+        "inserted": inserted,
+        "missing_phone": missing_phone,
+        "missing_email": missing_email,
+        "missing_address": missing_address,
+        "city_matched": city_matched,
+        "city_unmatched": city_unmatched,
+        "total_cities": sketches["cities"].count(),
+        "total_areas": sketches["areas"].count(),
+        "total_categories": sketches["categories"].count(),
+        # Serialized, so parallel part uploads can be merged (merge_upload_stats)
+        "sketches": {name: sketch.to_text() for name, sketch in sketches.items()},
+    }
+
+
+def merge_upload_stats(parts):
+    """Combines the stats of parallel part uploads: counters add up, distinct-value sketches merge."""
+    merged = {key: 0 for key in ("total_processed", "inserted", "missing_phone", "missing_email",
+                                 "missing_address", "city_matched", "city_unmatched")}
+    sketches = {name: HyperLogLog(SKETCH_PRECISION) for name in SKETCH_NAMES}
+    for part in parts:
+        for key in merged:
+            merged[key] += part.get(key, 0)
+        for name, text in part.get("sketches", {}).items():
+            sketches[name].merge(HyperLogLog.from_text(text))
+    return _upload_stats(sketches=sketches, **merged)
+
+
+def update_report(session, report, stats):
     try:
-        report.total_processed = total_processed
-        report.inserted = inserted
-        report.total_cities = len(city_set)
-        report.total_areas = len(area_set)
-        report.total_categories = len(category_set)
-        report.missing_primary_phone = missing_phone
-        report.missing_email = missing_email
-        report.missing_address = missing_address
+        report.total_processed = stats["total_processed"]
+        report.inserted = stats["inserted"]
+        report.total_cities = stats["total_cities"]
+        report.total_areas = stats["total_areas"]
+        report.total_categories = stats["total_categories"]
+        report.missing_primary_phone = stats["missing_phone"]
+        report.missing_email = stats["missing_email"]
+        report.missing_address = stats["missing_address"]
         
         report.stats = {
             "city_match_status": {
-                "matched": city_matched,
-                "unmatched": city_unmatched
+                "matched": stats["city_matched"],
+                "unmatched": stats["city_unmatched"]
             }
         }
         
         session.commit()
     except:
-        session.rollback()
\ No newline at end of file
+        session.rollback()
@@ -35,14 +35,17 @@ CREATE TABLE IF NOT EXISTS raw_google_map_drive_data (
     etl_version VARCHAR(50),
     task_id VARCHAR(255),
     file_hash VARCHAR(255),
+    row_signature VARCHAR(32) NULL COMMENT 'md5 of the 11 business columns; NULL = not yet deduped',
     
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE INDEX idx_raw_signature (row_signature),
     INDEX idx_drive_file_id (drive_file_id),
     INDEX idx_name (name(100)),
     INDEX idx_state (state(50)),
     INDEX idx_category (category(50)),
     INDEX idx_city (city(50)),
-    INDEX idx_state_category (state(50), category(50))
+    INDEX idx_state_category (state(50), category(50)),
+    INDEX idx_drive_file_name (drive_file_name)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- -----------------------------------------------------------------------------
@@ -122,6 +125,8 @@ CREATE TABLE IF NOT EXISTS file_registry (
     filename VARCHAR(500),
     status ENUM('PENDING', 'IN_PROGRESS', 'PROCESSED', 'ERROR') DEFAULT 'PENDING',
     last_processed_row INT DEFAULT 0,
+    last_byte_offset BIGINT NULL COMMENT 'Byte offset where last_processed_row ends (ranged resume)',
+    header_row TEXT NULL COMMENT 'JSON list of CSV header names, replayed on ranged resume',
     error_message TEXT,
     file_hash VARCHAR(255),
     processed_at DATETIME
@@ -136,6 +141,71 @@ CREATE TABLE IF NOT EXISTS drive_folder_registry (
     scanned_at DATETIME
 );
 
+-- Folder metadata cache for Drive ancestor/path resolution (ingestion_newest_only)
+CREATE TABLE IF NOT EXISTS drive_folder_paths (
+    folder_id VARCHAR(200) PRIMARY KEY,
+    folder_name VARCHAR(500),
+    parent_id VARCHAR(200),
+    resolved_at DATETIME,
+    INDEX idx_parent_id (parent_id)
+);
+
+-- Dashboard summary deltas staged by commit_batch (same transaction as the raw rows),
+-- folded into state_category_summary_v5 / file_record_summary by tasks.gdrive.merge_stats
+CREATE TABLE IF NOT EXISTS stats_delta_staging (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    state VARCHAR(255) NOT NULL DEFAULT '',
+    category VARCHAR(255) NOT NULL DEFAULT '',
+    drive_file_id VARCHAR(255) NOT NULL DEFAULT '',
+    delta INT NOT NULL
+);
+
+-- Raw record count per Drive file (source of dashboard total_csvs)
+CREATE TABLE IF NOT EXISTS file_record_summary (
+    drive_file_id VARCHAR(255) PRIMARY KEY,
+    record_count BIGINT NOT NULL DEFAULT 0
+);
+
+-- Validation dashboard counters, incremented by ValidationQualityProcessor in the same
+-- transaction as the clean rows they count (see utils/validation_snapshot.py)
+CREATE TABLE IF NOT EXISTS validation_dashboard_snapshot (
+    id TINYINT PRIMARY KEY,
+    clean_count BIGINT NOT NULL DEFAULT 0,
+    valid_count BIGINT NOT NULL DEFAULT 0,
+    missing_count BIGINT NOT NULL DEFAULT 0,
+    invalid_count BIGINT NOT NULL DEFAULT 0,
+    duplicate_count BIGINT NOT NULL DEFAULT 0,
+    last_id BIGINT NOT NULL DEFAULT 0,
+    last_batch_at DATETIME NULL
+);
+
+CREATE TABLE IF NOT EXISTS validation_state_snapshot (
+    state VARCHAR(255) PRIMARY KEY,
+    clean_count BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS validation_daily_snapshot (
+    day DATE PRIMARY KEY,
+    clean_count BIGINT NOT NULL DEFAULT 0
+);
+
+-- Near-duplicate detection over g_map_master_table (model/near_dupes.py)
+CREATE TABLE IF NOT EXISTS master_dupe_blocks (
+    block_key VARCHAR(191) NOT NULL,
+    master_id BIGINT NOT NULL,
+    PRIMARY KEY (block_key, master_id)
+);
+
+CREATE TABLE IF NOT EXISTS master_duplicate_clusters (
+    master_id BIGINT PRIMARY KEY,
+    cluster_id BIGINT NOT NULL COMMENT 'Lowest master id in the cluster',
+    matched_id BIGINT NOT NULL COMMENT 'Best-scoring match that put this row in the cluster',
+    score FLOAT NOT NULL,
+    method VARCHAR(32) NOT NULL,
+    detected_at DATETIME NOT NULL,
+    INDEX idx_cluster (cluster_id)
+);
+
 CREATE TABLE IF NOT EXISTS etl_metadata (
     meta_key VARCHAR(100) PRIMARY KEY,
     meta_value TEXT
@@ -4,8 +4,9 @@ import io
 import logging
 import time
 import signal
+import json
 import hashlib
-import threading
+import uuid
 from contextlib import contextmanager
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
@@ -19,9 +20,22 @@ from config import config
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 from celery import shared_task
+from celery.signals import worker_process_init
 from dotenv import load_dotenv
 
 from model.normalizer import UniversalNormalizer
+from model.raw_dedupe import raw_row_signature
+from model.near_dupes import NearDuplicateDetector
+from utils.drive_stream import DriveLineStream, next_chunk_with_retry
+from utils.tsv_loader import load_data_infile
+from utils.column_plan_cache import ColumnPlanCache
+from utils.drive_client_pool import DriveClientPool
+from utils.redis_lock import redis_lock as shared_redis_lock, extend_lock as shared_extend_lock
+from utils.stats_deltas import existing_signatures, aggregate_new_rows, record_stats_deltas, \
+    merge_stats_deltas, reconcile_summaries
+from utils.file_sketches import add_file_ids, rebuild_sketches
+from utils.response_cache import invalidate_tags, RAW_TABLE as RAW_TAG, CLEAN_TABLE as CLEAN_TAG, STATE_SUMMARY, STATS_SUMMARY
+from utils.validation_snapshot import reconcile_validation_snapshot
 
 from celery.utils.log import get_task_logger
 import redis as redis_lib
@@ -43,6 +57,13 @@ DATABASE_URI = config.DATABASE_URI
 MAX_FILE_SIZE_MB = config.MAX_FILE_SIZE_MB
 ETL_VERSION = config.ETL_VERSION
 BATCH_SIZE = config.BATCH_SIZE
+CSV_STREAMING = config.CSV_STREAMING
+DOWNLOAD_CHUNK_SIZE = config.DOWNLOAD_CHUNK_SIZE
+RAW_INGEST_ENGINE = config.RAW_INGEST_ENGINE
+DB_LOCAL_INFILE = config.DB_LOCAL_INFILE
+COLUMN_PLAN_CACHE_SIZE = config.COLUMN_PLAN_CACHE_SIZE
+DRIVE_CLIENT_POOL_SIZE = config.DRIVE_CLIENT_POOL_SIZE
+DRIVE_CLIENT_CHECKOUT_TIMEOUT = config.DRIVE_CLIENT_CHECKOUT_TIMEOUT
 # Configuration
 SERVICE_ACCOUNT_FILE = os.path.join(os.getcwd(), 'model', 'honey-bee-digital-d96daf6e6faf.json')
 DB_USER = os.getenv('DB_USER')
@@ -62,7 +83,9 @@ engine = create_engine(
     max_overflow=5,          # Limited burst capacity
     pool_timeout=30,        
     pool_recycle=1800,      
-    pool_pre_ping=True      
+    pool_pre_ping=True,
+    # Required by the 'load_data' ingest engine (LOAD DATA LOCAL INFILE)
+    connect_args={"local_infile": True} if DB_LOCAL_INFILE else {}
 )
 
 # Global Redis Pool for metrics and locks
@@ -75,6 +98,12 @@ redis_pool = redis_lib.ConnectionPool.from_url(
 )
 redis_client = redis_lib.Redis(connection_pool=redis_pool)
 
+# Shared CSV header -> column plan cache: a header layout seen by any worker skips fuzzy resolution
+UniversalNormalizer.plan_cache = ColumnPlanCache(
+    UniversalNormalizer.resolve_column_plan, redis_client,
+    max_entries=COLUMN_PLAN_CACHE_SIZE, version=UniversalNormalizer.mappings_fingerprint()
+)
+
 # Fix 7: Graceful Shutdown
 shutdown_requested = False
 
@@ -105,38 +134,47 @@ def get_service():
     return build('drive', 'v3', credentials=creds, cache_discovery=False)
 
 
+# Per-process pool of authorised Drive clients (credentials + discovery built once per process)
+drive_pool = DriveClientPool(SERVICE_ACCOUNT_FILE, size=DRIVE_CLIENT_POOL_SIZE,
+                             checkout_timeout=DRIVE_CLIENT_CHECKOUT_TIMEOUT)
+
+
+@worker_process_init.connect
+def init_drive_pool(**kwargs):
+    """Builds the pool in each prefork child. Gevent/solo workers build it lazily on first use."""
+    try:
+        drive_pool.init()
+    except Exception as e:
+        logger.warning(f"Drive client pool init failed (will retry on first task): {e}")
+
+
 # Fix 1 + Fix 2: File size protection + Context manager (no memory leak)
 @contextmanager
-def download_csv(service, file_id, max_size_mb=None):
+def download_csv(service, file_id, max_size_mb=None, stream=None, start_offset=0):
     """
-    Downloads a CSV file from Google Drive into memory.
-    Note: Buffers fully into memory before yielding to the reader.
+    Opens a CSV file from Google Drive for reading.
+    stream=True (default via CSV_STREAMING): yields a DriveLineStream whose lines are
+    decoded as chunks arrive, so rows reach commit_batch while the download runs.
+    start_offset > 0 issues ranged requests beginning at that byte (resume).
+    stream=False: legacy mode, buffers fully into memory before yielding the reader.
     """
-    import gevent
+    if stream is None:
+        stream = CSV_STREAMING
     request = service.files().get_media(fileId=file_id)
-    
-    import io
-    from googleapiclient.http import MediaIoBaseDownload
-    
+
+    if stream:
+        yield DriveLineStream(request, chunk_size=DOWNLOAD_CHUNK_SIZE, start_offset=start_offset)
+        return
+
     fh = io.BytesIO()
-    downloader = MediaIoBaseDownload(fh, request, chunksize=1024*1024) # 1MB chunks
+    downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK_SIZE)
     
     done = False
     while not done:
         # Crucial: Yield control to gevent hub every chunk to handle Redis heartbeats
-        gevent.sleep(0.01)
-        
+        time.sleep(0.01)
         # Retry logic for transient SSL / Network errors during download
-        for attempt in range(5):
-            try:
-                _, done = downloader.next_chunk()
-                break
-            except Exception as e:
-                if (attempt < 4 and ("SSL" in str(e) or "EOF" in str(e) or "connection" in str(e).lower())):
-                    wait = 2 ** attempt
-                    time.sleep(wait)
-                    continue
-                raise
+        _, done = next_chunk_with_retry(downloader)
     
     fh.seek(0)
     wrapper = io.TextIOWrapper(fh, encoding='utf-8', errors='replace')
@@ -153,15 +191,38 @@ def get_file_hash(file_id, modified_time):
 
 # SECTION 3: Batched Insert Optimization (with Deadlock Retry + Rate Limiting)
 
-def commit_batch(batch, task_id=None, **kwargs):
-    """
-    Inserts a BATCH of rows efficiently. 
-    NO deduplication - inserts EVERYTHING as requested.
-    Includes retry logic for transient DB errors.
-    """
-    if not batch:
-        return 0
-    
+# Column order shared by both raw ingest engines (dict key -> table column)
+RAW_INSERT_KEYS = [
+    'name', 'address', 'website', 'phone_number',
+    'reviews_count', 'reviews_average',
+    'category', 'subcategory', 'city', 'state', 'area',
+    'drive_file_id', 'drive_file_name', 'drive_file_path',
+    'drive_uploaded_time', 'etl_version', 'task_id', 'file_hash', 'row_signature'
+]
+RAW_INSERT_COLUMNS = [('full_drive_path' if k == 'drive_file_path' else k) for k in RAW_INSERT_KEYS]
+
+RAW_INSERT_SQL = """
+    INSERT IGNORE INTO {table} (
+        name, address, website, phone_number, 
+        reviews_count, reviews_average, 
+        category, subcategory, city, state, area, 
+        drive_file_id, drive_file_name, full_drive_path, 
+        drive_uploaded_time, source,
+        etl_version, task_id, file_hash, row_signature
+    )
+    VALUES (
+        :name, :address, :website, :phone_number, 
+        :reviews_count, :reviews_average, 
+        :category, :subcategory, :city, :state, :area, 
+        :drive_file_id, :drive_file_name, :drive_file_path, 
+        :drive_uploaded_time, 'google_drive',
+        :etl_version, :task_id, :file_hash, :row_signature
+    )
+"""
+
+
+def prepare_raw_batch(batch, task_id=None):
+    """Sanitizes rows in place and stamps lineage + row_signature. Shared by all ingest engines."""
     # Sanitize all values before insertion to prevent ANY DB error
     for row in batch:
         row['etl_version'] = ETL_VERSION
@@ -186,41 +247,70 @@ def commit_batch(batch, task_id=None, **kwargs):
             if val and isinstance(val, str) and len(val) > 500:
                 row[key] = val[:500]
         
-        # Calculate Row Signature for exact deduplication in Raw Table
-        # (Using all 11 business columns to only block TRUE exact copies)
-        sig_str = "|".join([
-            str(row.get('name') or "").lower().strip(),
-            str(row.get('address') or "").lower().strip(),
-            str(row.get('website') or "").lower().strip(),
-            str(row.get('phone_number') or "").lower().strip(),
-            str(row.get('reviews_count') or 0),
-            str(row.get('reviews_average') or 0.0),
-            str(row.get('category') or "").lower().strip(),
-            str(row.get('subcategory') or "").lower().strip(),
-            str(row.get('city') or "").lower().strip(),
-            str(row.get('state') or "").lower().strip(),
-            str(row.get('area') or "").lower().strip()
-        ])
-        row['row_signature'] = hashlib.md5(sig_str.encode('utf-8', errors='ignore')).hexdigest()
-        
-    sql = text("""
-        INSERT IGNORE INTO raw_google_map_drive_data (
-            name, address, website, phone_number, 
-            reviews_count, reviews_average, 
-            category, subcategory, city, state, area, 
-            drive_file_id, drive_file_name, full_drive_path, 
-            drive_uploaded_time, source,
-            etl_version, task_id, file_hash, row_signature
-        )
-        VALUES (
-            :name, :address, :website, :phone_number, 
-            :reviews_count, :reviews_average, 
-            :category, :subcategory, :city, :state, :area, 
-            :drive_file_id, :drive_file_name, :drive_file_path, 
-            :drive_uploaded_time, 'google_drive',
-            :etl_version, :task_id, :file_hash, :row_signature
+        # Row Signature for exact deduplication in Raw Table (all 11 business columns,
+        # so only TRUE exact copies are blocked; the raw dedupe engine uses the same key)
+        row['row_signature'] = raw_row_signature(row)
+    return batch
+
+
+def resolve_ingest_engine(ingest_engine=None):
+    """Picks the raw write path: 'executemany' (default) or 'load_data' (needs DB_LOCAL_INFILE)."""
+    choice = (ingest_engine or RAW_INGEST_ENGINE or 'executemany').lower()
+    if choice == 'load_data' and not DB_LOCAL_INFILE:
+        logger.warning("load_data ingest engine requested but DB_LOCAL_INFILE is off; using executemany.")
+        return 'executemany'
+    return choice if choice in ('executemany', 'load_data') else 'executemany'
+
+
+def write_raw_batch(conn, batch, ingest_engine='executemany', table='raw_google_map_drive_data'):
+    """Writes an already-prepared batch; both engines skip rows whose row_signature already exists."""
+    if ingest_engine == 'load_data':
+        return load_data_infile(
+            conn, table, RAW_INSERT_KEYS, batch,
+            target_columns=RAW_INSERT_COLUMNS, set_clause="source = 'google_drive'"
         )
-    """)
+    return conn.execute(text(RAW_INSERT_SQL.format(table=table)), batch).rowcount
+
+
+def write_raw_batch_with_deltas(conn, batch, ingest_engine='executemany'):
+    """
+    write_raw_batch plus, in the same transaction, the dashboard summary deltas of the rows
+    it actually inserts (rows whose row_signature is not in the table yet). A concurrent
+    writer racing on the same signature can over-count; the reconcile job corrects that.
+    Delta failures never fail the data write.
+    """
+    deltas = None
+    try:
+        deltas = aggregate_new_rows(batch, existing_signatures(conn, batch))
+    except Exception as e:
+        logger.warning(f"Stats delta lookup failed (reconcile will correct): {e}")
+    inserted = write_raw_batch(conn, batch, ingest_engine)
+    if deltas:
+        try:
+            record_stats_deltas(conn, deltas)
+        except Exception as e:
+            logger.warning(f"Stats delta staging failed (reconcile will correct): {e}")
+        try:
+            # Distinct-file HLL per (state, category); add-only, so a rolled-back batch is harmless
+            add_file_ids(redis_client, deltas)
+        except Exception as e:
+            logger.warning(f"File sketch update failed (reconcile will rebuild): {e}")
+    return inserted
+
+
+def commit_batch(batch, task_id=None, ingest_engine=None, **kwargs):
+    """
+    Inserts a BATCH of rows efficiently. 
+    NO deduplication - inserts EVERYTHING as requested.
+    ingest_engine selects executemany INSERT IGNORE or LOAD DATA LOCAL INFILE ... IGNORE
+    (defaults to RAW_INGEST_ENGINE).
+    Includes retry logic for transient DB errors.
+    """
+    if not batch:
+        return 0
+    
+    prepare_raw_batch(batch, task_id)
+    ingest_engine = resolve_ingest_engine(ingest_engine)
     
     # Retry logic for transient DB errors (deadlocks, connection resets)
     max_retries = 3
@@ -229,12 +319,11 @@ def commit_batch(batch, task_id=None, **kwargs):
             # If a connection is passed, use it (transactional), else create a new one
             inserted = len(batch)
             if kwargs.get('conn'):
-                kwargs['conn'].execute(sql, batch)
+                write_raw_batch_with_deltas(kwargs['conn'], batch, ingest_engine)
             else:
                 with engine.begin() as conn:
-                    result = conn.execute(sql, batch)
                     # Use actual rowcount because IGNORE might skip duplicates
-                    inserted = result.rowcount
+                    inserted = write_raw_batch_with_deltas(conn, batch, ingest_engine)
 
             if inserted > 0:
                 rows_inserted.inc(inserted)
@@ -262,48 +351,105 @@ def commit_batch(batch, task_id=None, **kwargs):
     return 0
 
 
-def update_file_checkpoint(file_id, filename, status, row_number=0, error_msg=None, file_hash=None, conn=None):
+def normalize_raw_batch(rows, file_meta, file_hash, file_name, first_row_idx):
+    """Batch-normalises raw CSV rows of one file. Rows that fail are logged and dropped."""
+    def _log_failure(i, err):
+        logger.warning(f"Row {first_row_idx + i} normalization failed in {file_name}: {err}")
+
+    batch = []
+    for norm_row in UniversalNormalizer.normalize_batch(rows, extra=file_meta, on_error=_log_failure):
+        if norm_row is not None:
+            norm_row['file_hash'] = file_hash
+            batch.append(norm_row)
+    return batch
+
+
+CHECKPOINT_SQL = text("""
+    INSERT INTO file_registry (drive_file_id, filename, status, last_processed_row, last_byte_offset, header_row,
+                               error_message, file_hash, processed_at)
+    VALUES (:file_id, :filename, :status, :row_num, :byte_offset, :header, :error_msg, :file_hash, NOW())
+    ON DUPLICATE KEY UPDATE 
+        status = VALUES(status),
+        last_processed_row = VALUES(last_processed_row),
+        last_byte_offset = VALUES(last_byte_offset),
+        header_row = COALESCE(VALUES(header_row), header_row),
+        error_message = VALUES(error_message),
+        file_hash = COALESCE(VALUES(file_hash), file_hash),
+        processed_at = NOW()
+""")
+
+
+def checkpoint_params(file_id, filename, status, row_number=0, error_msg=None, file_hash=None,
+                      byte_offset=None, header=None):
+    """Bind parameters for one CHECKPOINT_SQL row."""
+    return {
+        "file_id": file_id, "filename": filename, "status": status,
+        "row_num": row_number, "byte_offset": byte_offset,
+        "header": json.dumps(header, ensure_ascii=False) if header else None,
+        "error_msg": str(error_msg)[:2000] if error_msg else None,
+        "file_hash": file_hash
+    }
+
+
+def update_file_checkpoint(file_id, filename, status, row_number=0, error_msg=None, file_hash=None, conn=None,
+                           byte_offset=None, header=None):
     """
     Updates file status and row checkpoint for crash-safe resumption.
+    byte_offset is where the row `row_number` ends in the source file; NULL disables
+    ranged resume. header is the parsed CSV header (needed to resume mid-file).
     If conn is provided, uses it (for transactional atomicity).
     """
     try:
-        sql = text("""
-            INSERT INTO file_registry (drive_file_id, filename, status, last_processed_row, error_message, file_hash, processed_at)
-            VALUES (:file_id, :filename, :status, :row_num, :error_msg, :file_hash, NOW())
-            ON DUPLICATE KEY UPDATE 
-                status = VALUES(status),
-                last_processed_row = VALUES(last_processed_row),
-                error_message = VALUES(error_message),
-                file_hash = COALESCE(VALUES(file_hash), file_hash),
-                processed_at = NOW()
-        """)
+        params = checkpoint_params(file_id, filename, status, row_number, error_msg, file_hash, byte_offset, header)
         if conn:
-            conn.execute(sql, {
-                "file_id": file_id, "filename": filename, "status": status,
-                "row_num": row_number, "error_msg": str(error_msg)[:2000] if error_msg else None,
-                "file_hash": file_hash
-            })
+            conn.execute(CHECKPOINT_SQL, params)
         else:
             with engine.begin() as conn:
-                conn.execute(sql, {
-                    "file_id": file_id, "filename": filename, "status": status,
-                    "row_num": row_number, "error_msg": str(error_msg)[:2000] if error_msg else None,
-                    "file_hash": file_hash
-                })
+                conn.execute(CHECKPOINT_SQL, params)
     except Exception as e:
         logger.warning(f"Checkpoint update failed for {filename}: {e}")
 
-def get_file_checkpoint(file_id):
-    """Retrieves the last processed row for a file."""
+
+def _checkpoint_from_row(res, file_hash=None):
+    byte_offset, header = None, None
+    if res[2] and res[3] and (file_hash is None or res[4] == file_hash):
+        byte_offset, header = int(res[2]), json.loads(res[3])
+    return res[0], res[1] or 0, byte_offset, header
+
+
+def get_file_checkpoint(file_id, file_hash=None):
+    """
+    Retrieves the resume point for a file: (status, last_row, byte_offset, header).
+    byte_offset/header are only returned when the stored file_hash matches, since
+    offsets into an older revision of the file are meaningless.
+    """
     try:
         with engine.connect() as conn:
-            res = conn.execute(text("SELECT status, last_processed_row FROM file_registry WHERE drive_file_id = :id"), {"id": file_id}).fetchone()
+            res = conn.execute(text("""
+                SELECT status, last_processed_row, last_byte_offset, header_row, file_hash
+                FROM file_registry WHERE drive_file_id = :id
+            """), {"id": file_id}).fetchone()
             if res:
-                return res[0], res[1]
+                return _checkpoint_from_row(res, file_hash)
     except Exception:
         pass
-    return None, 0
+    return None, 0, None, None
+
+
+def get_file_checkpoints(conn, file_hashes):
+    """
+    Batch form of get_file_checkpoint: one query for {file_id: file_hash}.
+    Returns {file_id: (status, last_row, byte_offset, header)}; unknown files are absent.
+    """
+    if not file_hashes:
+        return {}
+    ids = list(file_hashes)
+    placeholders = ", ".join(f":id{i}" for i in range(len(ids)))
+    rows = conn.execute(text(f"""
+        SELECT drive_file_id, status, last_processed_row, last_byte_offset, header_row, file_hash
+        FROM file_registry WHERE drive_file_id IN ({placeholders})
+    """), {f"id{i}": fid for i, fid in enumerate(ids)}).fetchall()
+    return {row[0]: _checkpoint_from_row(row[1:], file_hashes[row[0]]) for row in rows}
 
 
 # Fix 4: Dead Letter Queue
@@ -329,66 +475,181 @@ def send_to_dlq(file_id, file_name, error, task_id, retry_count=0):
 
 
 # SECTION 6: Dashboard Stats Refresh — Zero Downtime
+# Summaries are maintained incrementally: commit_batch stages per-(state, category, file)
+# deltas, merge_dashboard_stats folds them in. refresh_dashboard_stats is the full
+# recompute, scheduled rarely as a reconciliation job.
+STATS_LOCK = "dashboard_stats_summary"
+
+
+@shared_task(name="tasks.gdrive.merge_stats", ignore_result=True)
+def merge_dashboard_stats(max_rows=50000):
+    """Folds staged stats deltas into the summary tables. Cheap: never touches the raw table."""
+    try:
+        with redis_lock(STATS_LOCK, timeout=600) as acquired:
+            if not acquired:
+                return
+            merged = 0
+            while True:
+                with engine.begin() as conn:
+                    n = merge_stats_deltas(conn, max_rows=max_rows)
+                merged += n
+                if n < max_rows:
+                    break
+            if merged:
+                # Raw-table readers are refreshed here too: new rows show up once they are summarised
+                invalidate_tags(redis_client, STATS_SUMMARY, STATE_SUMMARY, RAW_TAG)
+                logger.info(f"Dashboard stats: merged {merged} staged deltas.")
+    except Exception as e:
+        logger.warning(f"Stats Merge Failed (non-fatal): {e}")
+
+
 @shared_task(name="tasks.gdrive.refresh_stats", ignore_result=True)
 def refresh_dashboard_stats():
-    """Recalculates dashboard statistics using UPSERT logic."""
+    """Reconciliation: recomputes the summaries from raw_google_map_drive_data (slow, run rarely)."""
     try:
-        with engine.begin() as conn:
-            # 1. UPSERT Global Summary (id=1)
-            res = conn.execute(text("SELECT COUNT(*), COUNT(DISTINCT state), COUNT(DISTINCT category), COUNT(DISTINCT drive_file_id) FROM raw_google_map_drive_data")).fetchone()
-            
-            conn.execute(text("""
-                INSERT INTO dashboard_stats_summary_v5 
-                (id, total_records, total_states, total_categories, total_csvs, last_updated)
-                VALUES (1, :total, :states, :cats, :csvs, NOW())
-                ON DUPLICATE KEY UPDATE 
-                    total_records = VALUES(total_records),
-                    total_states = VALUES(total_states),
-                    total_categories = VALUES(total_categories),
-                    total_csvs = VALUES(total_csvs),
-                    last_updated = NOW()
-            """), {"total": res[0], "states": res[1], "cats": res[2], "csvs": res[3]})
-
-            # 2. UPSERT State-Category Summary
-            conn.execute(text("SET SESSION TRANSACTION ISOLATION LEVEL READ UNCOMMITTED"))
-            conn.execute(text("""
-                INSERT INTO state_category_summary_v5 (state, category, record_count)
-                SELECT state, category, COUNT(*) 
-                FROM raw_google_map_drive_data 
-                GROUP BY state, category
-                ON DUPLICATE KEY UPDATE 
-                    record_count = VALUES(record_count)
-            """))
-            conn.execute(text("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ"))
-            
-        logger.info("Dashboard stats refreshed successfully without locking tables.")
+        with redis_lock(STATS_LOCK, timeout=4 * 3600) as acquired:
+            if not acquired:
+                logger.info("Stats reconcile skipped: a merge/reconcile is already running.")
+                return
+            with engine.connect() as conn:
+                conn = conn.execution_options(isolation_level="REPEATABLE READ")
+                with conn.begin():
+                    discarded = reconcile_summaries(conn)
+            with engine.connect() as conn:
+                rebuild_sketches(conn, redis_client)
+            invalidate_tags(redis_client, STATS_SUMMARY, STATE_SUMMARY, RAW_TAG)
+            with engine.connect() as conn:
+                conn = conn.execution_options(isolation_level="REPEATABLE READ")
+                with conn.begin():
+                    reconcile_validation_snapshot(conn)
+            invalidate_tags(redis_client, CLEAN_TAG)
+        logger.info(f"Dashboard stats reconciled without locking tables ({discarded} staged deltas superseded).")
     except Exception as e:
         logger.warning(f"Stats Refresh Failed (non-fatal): {e}")
 
-def trigger_stats_refresh():
+@shared_task(name="tasks.gdrive.near_dupes", ignore_result=True)
+def detect_near_duplicates(max_chunks=50):
+    """Incremental near-duplicate scan of master rows added since the last run."""
+    try:
+        with redis_lock("near_dupes", timeout=3600) as acquired:
+            if not acquired:
+                logger.info("Near-duplicate scan skipped: already running.")
+                return
+            NearDuplicateDetector(engine).run(max_chunks=max_chunks)
+    except Exception as e:
+        logger.warning(f"Near-duplicate scan failed (non-fatal): {e}")
+
+def trigger_stats_refresh(count=1):
     """Call this inside process_csv_task on success. Fully guarded — never throws."""
     try:
-        val = redis_client.incr("gdrive_etl_file_count")
-        if val % 50 == 0:
-            refresh_dashboard_stats.delay()
+        val = redis_client.incr("gdrive_etl_file_count", count)
+        # Fires once every 50 files, even when a batch task adds several at once
+        if val // 50 > (val - count) // 50:
+            merge_dashboard_stats.delay()
     except Exception:
         # Redis down is non-fatal — just skip stats trigger silently
         pass
 
 
-@contextmanager
 def redis_lock(lock_name, timeout=3600):
-    """Simple redis-based distributed lock."""
-    lock_id = threading.get_ident()
-    # set nx=True means only set if it doesn't exist
-    acquired = redis_client.set(f"lock:{lock_name}", lock_id, ex=timeout, nx=True)
+    """Simple redis-based distributed lock. Yields the owner token (None when not acquired)."""
+    return shared_redis_lock(redis_client, lock_name, timeout)
+
+
+def extend_lock(lock_name, lock_id, timeout):
+    """Renews a held redis_lock; False once it has been lost (see utils.redis_lock)."""
+    return shared_extend_lock(redis_client, lock_name, lock_id, timeout)
+
+
+@contextmanager
+def redis_locks(lock_names, timeout=3600):
+    """redis_lock for many names in one round trip. Yields the set of names acquired."""
+    lock_id = uuid.uuid4().hex
+    pipe = redis_client.pipeline(transaction=False)
+    for name in lock_names:
+        pipe.set(f"lock:{name}", lock_id, ex=timeout, nx=True)
+    acquired = {name for name, ok in zip(lock_names, pipe.execute()) if ok}
     try:
         yield acquired
     finally:
         if acquired:
-            # Only delete if we own it (simple check)
-            if redis_client.get(f"lock:{lock_name}") == str(lock_id).encode():
-                redis_client.delete(f"lock:{lock_name}")
+            names = list(acquired)
+            owners = redis_client.mget([f"lock:{n}" for n in names])
+            mine = [f"lock:{n}" for n, owner in zip(names, owners) if owner == lock_id.encode()]
+            if mine:
+                redis_client.delete(*mine)
+
+
+def normalize_modified_time(modified_time):
+    """Normalize datetime ONCE — handles all ISO formats safely."""
+    if modified_time:
+        modified_time = str(modified_time).strip()
+        if 'T' in modified_time:
+            modified_time = modified_time.replace('T', ' ').replace('Z', '').split('.')[0]
+    return modified_time
+
+
+def iter_file_batches(service, file_id, file_name, folder_id, folder_name, path, modified_time, file_hash,
+                      last_row=0, resume_offset=None, header=None, batch_threshold=1000):
+    """
+    Streams one CSV from Drive and yields normalised batches as
+    (kind, batch, row_idx, byte_offset, header) where kind is:
+      'batch'  - a full batch; checkpoint row_idx / byte_offset with it
+      'paused' - graceful shutdown; the batch holds the rows before row_idx
+      'done'   - end of file; the batch holds the remaining rows (may be empty)
+    Resumes from (last_row, resume_offset, header) when a ranged resume is possible.
+    """
+    ranged_resume = bool(CSV_STREAMING and last_row and resume_offset and header)
+    if not ranged_resume:
+        resume_offset, header = None, None
+
+    with download_csv(service, file_id, start_offset=resume_offset or 0) as stream:
+        if ranged_resume:
+            logger.info(f"Resuming {file_name} at row {last_row} (byte {resume_offset}).")
+            reader = csv.DictReader(stream, fieldnames=header)
+            current_row_idx = last_row
+        else:
+            reader = csv.DictReader(stream)
+            current_row_idx = 0
+        # Raw CSV rows awaiting batch normalisation (header mapping resolved once per batch)
+        pending = []
+        file_meta = {
+            "drive_file_id": file_id, "drive_file_name": file_name,
+            "drive_folder_id": folder_id, "drive_folder_name": folder_name,
+            "drive_file_path": path, "drive_uploaded_time": modified_time
+        }
+        # Byte offset where the previous / current row ends (None in buffered mode)
+        prev_offset = row_offset = getattr(stream, 'offset', None)
+
+        for row in reader:
+            current_row_idx += 1
+            prev_offset, row_offset = row_offset, getattr(stream, 'offset', None)
+            if header is None:
+                header = reader.fieldnames
+
+            # Yield control to gevent hub every 250 rows to handle Redis heartbeats
+            if current_row_idx % 250 == 0:
+                time.sleep(0.01)
+
+            # Resume logic: Skip rows already processed
+            if current_row_idx <= last_row:
+                continue
+
+            if shutdown_requested:
+                batch = normalize_raw_batch(pending, file_meta, file_hash, file_name, current_row_idx - len(pending))
+                yield 'paused', batch, current_row_idx - 1, prev_offset, header
+                return
+
+            pending.append(row)
+
+            if len(pending) >= batch_threshold:
+                batch = normalize_raw_batch(pending, file_meta, file_hash, file_name,
+                                            current_row_idx - len(pending) + 1)
+                pending = []
+                yield 'batch', batch, current_row_idx, row_offset, header
+
+        batch = normalize_raw_batch(pending, file_meta, file_hash, file_name, current_row_idx - len(pending) + 1)
+        yield 'done', batch, current_row_idx, row_offset, header
 
 
 # SECTION 4: Main Processing Task (with all fixes applied)
@@ -401,18 +662,13 @@ def redis_lock(lock_name, timeout=3600):
     retry_backoff_max=60,
     retry_jitter=True
 )
-def process_csv_task(self, file_id, file_name, folder_id, folder_name, path, modified_time):
-    global shutdown_requested
+def process_csv_task(self, file_id, file_name, folder_id, folder_name, path, modified_time, ingest_engine=None):
     start_time = time.time()
     task_id = self.request.id
     
-    # Normalize datetime ONCE — handles all ISO formats safely
-    if modified_time:
-        modified_time = str(modified_time).strip()
-        if 'T' in modified_time:
-            modified_time = modified_time.replace('T', ' ').replace('Z', '').split('.')[0]
-        
+    modified_time = normalize_modified_time(modified_time)
     file_hash = get_file_hash(file_id, modified_time or '')
+    last_row, resume_offset, header = 0, None, None
     
     try:
         # Use Redis Lock to prevent concurrent processing (Improves Idempotency)
@@ -422,69 +678,45 @@ def process_csv_task(self, file_id, file_name, folder_id, folder_name, path, mod
                 return f"Locked: {file_name}"
 
             # 1. Check for existing checkpoint (Idempotency Phase 3)
-            status, last_row = get_file_checkpoint(file_id)
+            status, last_row, resume_offset, header = get_file_checkpoint(file_id, file_hash)
             if status == 'PROCESSED':
                 logger.info(f"Skip: {file_name} already fully processed.")
                 return f"Skipped processed file: {file_name}"
+
+            # Resume by byte offset: ranged download from the last committed row,
+            # instead of re-downloading and re-parsing everything before it
+            if not (CSV_STREAMING and last_row and resume_offset and header):
+                resume_offset, header = None, None
             
-            service = get_service()
-            update_file_checkpoint(file_id, file_name, 'IN_PROGRESS', last_row, file_hash=file_hash)
+            update_file_checkpoint(file_id, file_name, 'IN_PROGRESS', last_row, file_hash=file_hash,
+                                   byte_offset=resume_offset, header=header)
             
-            with download_csv(service, file_id) as stream:
-                reader = csv.DictReader(stream)
-                current_row_idx = 0
-                batch = []
-                BATCH_THRESHOLD = 1000 # Reduced for smoother gevent task switching
-                
-                for row in reader:
-                    current_row_idx += 1
-                    
-                    # Yield control to gevent hub every 250 rows to handle Redis heartbeats
-                    if current_row_idx % 250 == 0:
-                        time.sleep(0.01)
-
-                    # Resume logic: Skip rows already processed
-                    if current_row_idx <= last_row:
-                        continue
+            with drive_pool.client() as service:
+                # BATCH INSERT (High Speed + Transactional Safety): rows and checkpoint commit together
+                # BATCH_THRESHOLD reduced to 1000 for smoother gevent task switching
+                for kind, batch, row_idx, row_offset, header in iter_file_batches(
+                        service, file_id, file_name, folder_id, folder_name, path, modified_time, file_hash,
+                        last_row, resume_offset, header, batch_threshold=1000):
+                    if kind == 'paused':
+                        if batch:
+                            commit_batch(batch, task_id=task_id, ingest_engine=ingest_engine)
+                        update_file_checkpoint(file_id, file_name, 'IN_PROGRESS', row_idx,
+                                               error_msg="Graceful shutdown", byte_offset=row_offset, header=header)
+                        return f"Paused: {file_name} at row {row_idx}"
 
-                    if shutdown_requested:
+                    # Remaining rows ('done') — commit and mark PROCESSED in ONE TRANSACTION
+                    with engine.begin() as conn:
                         if batch:
-                            commit_batch(batch, task_id=task_id)
-                        update_file_checkpoint(file_id, file_name, 'IN_PROGRESS', current_row_idx-1, 
-                                              error_msg="Graceful shutdown")
-                        return f"Paused: {file_name} at row {current_row_idx-1}"
-                    
-                    # Normalize — wrapped in try/except to skip bad rows instead of crashing
-                    try:
-                        norm_row = UniversalNormalizer.normalize_row_raw({
-                            **row, "drive_file_id": file_id, "drive_file_name": file_name,
-                            "drive_folder_id": folder_id, "drive_folder_name": folder_name,
-                            "drive_file_path": path, "drive_uploaded_time": modified_time
-                        })
-                        norm_row['file_hash'] = file_hash
-                        batch.append(norm_row)
-                    except Exception as norm_err:
-                        logger.warning(f"Row {current_row_idx} normalization failed in {file_name}: {norm_err}")
-                        continue
-                    
-                    # BATCH INSERT (High Speed + Transactional Safety)
-                    if len(batch) >= BATCH_THRESHOLD:
-                        with engine.begin() as conn:
-                            commit_batch(batch, task_id=task_id, conn=conn)
-                            update_file_checkpoint(file_id, file_name, 'IN_PROGRESS', 
-                                                  current_row_idx, file_hash=file_hash, conn=conn)
-                        batch = []
-
-                # Remaining rows — commit and mark PROCESSED in ONE TRANSACTION
-                with engine.begin() as conn:
-                    if batch:
-                        commit_batch(batch, task_id=task_id, conn=conn)
-                    update_file_checkpoint(file_id, file_name, 'PROCESSED', current_row_idx, file_hash=file_hash, conn=conn)
+                            commit_batch(batch, task_id=task_id, ingest_engine=ingest_engine, conn=conn)
+                        update_file_checkpoint(file_id, file_name, 'PROCESSED' if kind == 'done' else 'IN_PROGRESS',
+                                               row_idx, file_hash=file_hash, conn=conn,
+                                               byte_offset=row_offset, header=header)
+                    last_row, resume_offset = row_idx, row_offset
 
             processing_time.observe(time.time() - start_time)
             files_processed.inc()
             trigger_stats_refresh()
-            return f"Completed {file_name}: {current_row_idx} rows"
+            return f"Completed {file_name}: {last_row} rows"
 
     except Exception as e:
         err_msg = str(e)
@@ -492,9 +724,145 @@ def process_csv_task(self, file_id, file_name, folder_id, folder_name, path, mod
         if "[parameters:" in err_msg:
             err_msg = err_msg.split("[parameters:")[0].strip()
         logger.error(f"[CRASH] {file_name}: {err_msg[:300]}")
-        update_file_checkpoint(file_id, file_name, 'ERROR', last_row, error_msg=err_msg[:2000], file_hash=file_hash)
+        # Keep the last committed checkpoint so the retry resumes from it
+        update_file_checkpoint(file_id, file_name, 'ERROR', last_row, error_msg=err_msg[:2000], file_hash=file_hash,
+                               byte_offset=resume_offset, header=header)
         if self.request.retries >= self.max_retries:
             send_to_dlq(file_id, file_name, err_msg[:2000], task_id, self.request.retries)
             # Don't raise — file is in DLQ, no more retries
             return f"DLQ: {file_name} after {self.request.retries} retries"
         raise self.retry(exc=e)
+
+
+# SECTION 5: Coalesced Processing Task (many small files per Celery task)
+@shared_task(
+    bind=True,
+    max_retries=3,
+    name="tasks.gdrive.process_csv_batch",
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    retry_backoff_max=60,
+    retry_jitter=True
+)
+def process_csv_batch_task(self, files, ingest_engine=None):
+    """
+    Processes a list of file descriptors (the keyword arguments of process_csv_task)
+    with one Drive service and one DB connection. Locks and checkpoints are read for the
+    whole batch in one round trip each. The tail rows of each finished file are buffered
+    and written, together with their PROCESSED checkpoints, in one transaction per
+    ~BATCH_THRESHOLD rows, so a folder of tiny CSVs costs a handful of commits instead of
+    one task, lock, checkpoint read and commit per file.
+    A file that fails is checkpointed as ERROR and handed to process_csv_task, which owns
+    per-file retries and the DLQ.
+    """
+    start_time = time.time()
+    task_id = self.request.id
+    BATCH_THRESHOLD = 1000
+
+    for f in files:
+        f['modified_time'] = normalize_modified_time(f.get('modified_time'))
+        f['file_hash'] = get_file_hash(f['file_id'], f['modified_time'] or '')
+    by_id = {f['file_id']: f for f in files}
+    completed, skipped, failed = [], 0, []
+
+    try:
+        with redis_locks([f"file_proc_{fid}" for fid in by_id]) as acquired:
+            owned = [f for f in files if f"file_proc_{f['file_id']}" in acquired]
+            skipped += len(files) - len(owned)
+
+            with engine.connect() as conn, drive_pool.client() as service:
+                checkpoints = get_file_checkpoints(conn, {f['file_id']: f['file_hash'] for f in owned})
+                conn.commit()
+
+                # Finished files whose tail rows / PROCESSED checkpoint are not yet committed
+                buffered_rows, buffered_checkpoints, buffered_files = [], [], []
+
+                def flush():
+                    if not buffered_checkpoints:
+                        return
+                    with conn.begin():
+                        if buffered_rows:
+                            commit_batch(buffered_rows, task_id=task_id, ingest_engine=ingest_engine, conn=conn)
+                        conn.execute(CHECKPOINT_SQL, buffered_checkpoints)
+                    completed.extend(buffered_files)
+                    buffered_rows.clear()
+                    buffered_checkpoints.clear()
+                    buffered_files.clear()
+
+                for f in owned:
+                    if shutdown_requested:
+                        break
+                    file_id, file_name, file_hash = f['file_id'], f['file_name'], f['file_hash']
+                    status, last_row, resume_offset, header = checkpoints.get(file_id, (None, 0, None, None))
+                    if status == 'PROCESSED':
+                        skipped += 1
+                        continue
+
+                    try:
+                        for kind, batch, row_idx, row_offset, header in iter_file_batches(
+                                service, file_id, file_name, f.get('folder_id'), f.get('folder_name'), f.get('path'),
+                                f['modified_time'], file_hash, last_row, resume_offset, header,
+                                batch_threshold=BATCH_THRESHOLD):
+                            if kind == 'done':
+                                buffered_rows.extend(batch)
+                                buffered_checkpoints.append(checkpoint_params(
+                                    file_id, file_name, 'PROCESSED', row_idx, file_hash=file_hash,
+                                    byte_offset=row_offset, header=header))
+                                buffered_files.append(file_name)
+                                if len(buffered_rows) >= BATCH_THRESHOLD:
+                                    flush()
+                                continue
+
+                            # Large file: its full batches commit with its own checkpoint, as in process_csv_task
+                            flush()
+                            with conn.begin():
+                                if batch:
+                                    commit_batch(batch, task_id=task_id, ingest_engine=ingest_engine, conn=conn)
+                                conn.execute(CHECKPOINT_SQL, checkpoint_params(
+                                    file_id, file_name, 'IN_PROGRESS', row_idx,
+                                    error_msg="Graceful shutdown" if kind == 'paused' else None,
+                                    file_hash=file_hash, byte_offset=row_offset, header=header))
+                            last_row, resume_offset = row_idx, row_offset
+                    except OperationalError:
+                        # Connection-level failure: retry the whole batch (finished files are skipped by checkpoint)
+                        raise
+                    except Exception as e:
+                        err_msg = str(e)
+                        if "[parameters:" in err_msg:
+                            err_msg = err_msg.split("[parameters:")[0].strip()
+                        logger.error(f"[CRASH] {file_name} (batch {task_id}): {err_msg[:300]}")
+                        update_file_checkpoint(file_id, file_name, 'ERROR', last_row, error_msg=err_msg[:2000],
+                                               file_hash=file_hash, byte_offset=resume_offset, header=header)
+                        failed.append(f)
+
+                flush()
+
+        # Hand failed files to the per-file task (own retries + DLQ)
+        for f in failed:
+            process_csv_task.delay(
+                file_id=f['file_id'], file_name=f['file_name'], folder_id=f.get('folder_id'),
+                folder_name=f.get('folder_name'), path=f.get('path'), modified_time=f['modified_time'],
+                ingest_engine=ingest_engine
+            )
+
+        if completed:
+            processing_time.observe(time.time() - start_time)
+            files_processed.inc(len(completed))
+            trigger_stats_refresh(len(completed))
+        return f"Batch of {len(files)}: {len(completed)} completed, {skipped} skipped, {len(failed)} re-queued"
+
+    except Exception as e:
+        err_msg = str(e)
+        if "[parameters:" in err_msg:
+            err_msg = err_msg.split("[parameters:")[0].strip()
+        logger.error(f"[CRASH] CSV batch of {len(files)} files: {err_msg[:300]}")
+        if self.request.retries >= self.max_retries:
+            # Give every file its own task (and DLQ path) instead of dropping the batch
+            for f in files:
+                process_csv_task.delay(
+                    file_id=f['file_id'], file_name=f['file_name'], folder_id=f.get('folder_id'),
+                    folder_name=f.get('folder_name'), path=f.get('path'), modified_time=f['modified_time'],
+                    ingest_engine=ingest_engine
+                )
+            return f"Split: batch of {len(files)} files after {self.request.retries} retries"
+        raise self.retry(exc=e)
@@ -0,0 +1,49 @@
+import threading
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from sqlalchemy.exc import OperationalError
+
+from tasks.gdrive_task.etl_tasks import engine, redis_lock, extend_lock
+from model.robust_gdrive_etl_v2 import ValidationQualityProcessor, VALIDATION_RANGE_LEASE_SECONDS
+from model.validation_shards import range_key
+
+logger = get_task_logger("Validation_Celery_Task")
+
+# One processor per worker process, so its signature filter warms once and then stays hot
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def get_processor():
+    global _processor
+    with _processor_lock:
+        if _processor is None:
+            _processor = ValidationQualityProcessor(engine, threading.Event())
+            if _processor.signature_filter:
+                _processor.signature_filter.start_warming(_processor.shutdown_event)
+        return _processor
+
+
+@shared_task(
+    bind=True,
+    max_retries=5,
+    name="tasks.validation.process_range",
+    autoretry_for=(OperationalError,),
+    retry_backoff=True,
+    retry_backoff_max=120,
+    retry_jitter=True,
+    ignore_result=True
+)
+def process_validation_range(self, start, end, watermark):
+    """Validates raw ids (start, end] for the shard coordinator; resumes from the range checkpoint."""
+    # A re-dispatched range must not run twice at once: snapshot counters count each insert once
+    lock_name = range_key(start, end)
+    with redis_lock(lock_name, timeout=VALIDATION_RANGE_LEASE_SECONDS) as lock_id:
+        if not lock_id:
+            logger.info(f"Validation range ({start}, {end}] already running elsewhere; skipping.")
+            return False
+        # Renewed after every batch, so a slow range keeps its lease until it finishes
+        return get_processor().process_range(
+            start, end, watermark,
+            keep_alive=lambda: extend_lock(lock_name, lock_id, VALIDATION_RANGE_LEASE_SECONDS)
+        )
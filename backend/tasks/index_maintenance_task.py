@@ -0,0 +1,25 @@
+from celery_app import celery
+from database.mysql_connection import get_mysql_connection
+from tasks.gdrive_task.etl_tasks import redis_lock
+from utils.file_sketches import get_redis
+from utils.index_maintenance import reconcile_indexes, LEASE_TTL
+
+LOCK_NAME = "index_reconcile"
+
+
+@celery.task(name="tasks.indexes.reconcile", ignore_result=True)
+def reconcile_non_essential_indexes():
+    """Restores non-essential indexes a crashed bulk load left dropped."""
+    # Online index builds on large tables can run for hours: hold the lock as long as a load lease
+    with redis_lock(LOCK_NAME, timeout=LEASE_TTL) as acquired:
+        if not acquired:
+            return {"skipped": "already running"}
+        connection = get_mysql_connection()
+        cursor = connection.cursor()
+        try:
+            repaired = reconcile_indexes(cursor, get_redis())
+            connection.commit()
+            return repaired
+        finally:
+            cursor.close()
+            connection.close()
@@ -0,0 +1,14 @@
+from celery_app import celery
+from model.listing_entity_index import ListingEntityIndexer
+from tasks.gdrive_task.etl_tasks import engine, redis_lock
+
+LOCK_NAME = "listing_entity_index"
+
+
+@celery.task(name="tasks.listings.entity_index", ignore_result=True)
+def update_listing_entity_index(max_chunks=50):
+    """Links listings added since the last run into cross-source entities."""
+    with redis_lock(LOCK_NAME, timeout=3600) as acquired:
+        if not acquired:
+            return {"skipped": "already running"}
+        return ListingEntityIndexer(engine).run(max_chunks=max_chunks)
@@ -1,17 +1,18 @@
 from services.csv_uploaders_listing.upload_justdial import upload_justdial_data
+from tasks.upload_fanout import fan_out_csv_upload, remove_uploaded_files
 from celery_app import celery
-import os
+
+JUSTDIAL_SPEC_REF = "services.csv_uploaders_listing.upload_justdial:JUSTDIAL_SPEC"
 
 @celery.task(bind=True,autoretry_for=(Exception,),retry_kwargs={'max_retries':3,'countdown':5},retry_jitter=True,acks_late=True,retry_backoff=True)
 def process_justdial_task(self,file_paths):
     if not file_paths:
         raise ValueError("No file provided")
-    result = upload_justdial_data(file_paths)
+    # Several files (or one large one): one subtask per part, reduced by a chord callback
+    fanned_out = fan_out_csv_upload(JUSTDIAL_SPEC_REF, file_paths)
+    if fanned_out:
+        return fanned_out
 
-    for path in file_paths:
-        try:
-            if os.path.exists(path):
-                os.remove(path)
-        except PermissionError:
-            pass
-    return result
\ No newline at end of file
+    result = upload_justdial_data(file_paths)
+    remove_uploaded_files(file_paths)
+    return result
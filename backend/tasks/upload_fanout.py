@@ -0,0 +1,97 @@
+"""
+Fan-out mode for multi-file CSV uploads.
+
+Instead of loading the uploaded files one after another on one connection, the upload
+task splits them into parts (whole files, and byte ranges of files over
+UPLOAD_PART_BYTES; see utils/csv_parts.py) and runs them as a Celery chord: one
+upload_csv_part subtask per part, on every free worker slot, then finish_csv_upload
+adds up the row counts, ends the bulk load (the spec's non-essential indexes are
+dropped once before the fan-out instead of per part, under one utils.index_maintenance
+lease) and removes the uploaded files. Parts upsert
+(ON DUPLICATE KEY UPDATE), so a retried part is harmless. If a part fails for good,
+abort_csv_upload releases the lease and leaves the files for a re-upload.
+
+Specs are passed by reference ("module:ATTRIBUTE") so subtask arguments stay JSON.
+"""
+import os
+import importlib
+import uuid
+import logging
+from celery import chord
+
+from celery_app import celery
+from services.csv_upload_engine import upload_csv_files, set_spec_indexes
+from utils.csv_parts import plan_csv_parts
+
+logger = logging.getLogger("UploadFanout")
+
+UPLOAD_FANOUT = os.getenv("UPLOAD_FANOUT", "true").lower() in ("1", "true", "yes")
+UPLOAD_PART_BYTES = int(os.getenv("UPLOAD_PART_BYTES", str(64 * 1024 * 1024)))
+
+
+def plan_upload_parts(file_paths):
+    """The parts to fan out, or [] when fan-out is off or there is only one part."""
+    if not UPLOAD_FANOUT:
+        return []
+    parts = plan_csv_parts(file_paths, UPLOAD_PART_BYTES)
+    return parts if len(parts) > 1 else []
+
+
+def remove_uploaded_files(file_paths):
+    for path in file_paths:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except PermissionError:
+            pass
+
+
+def load_spec(spec_ref):
+    module, name = spec_ref.split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+@celery.task(name="tasks.upload.csv_part", ignore_result=False, acks_late=True,
+             autoretry_for=(Exception,), retry_backoff=True, retry_jitter=True,
+             retry_kwargs={'max_retries': 3, 'countdown': 5})
+def upload_csv_part(spec_ref, part, load_id=None):
+    return upload_csv_files(load_spec(spec_ref), [part], manage_indexes=False, load_id=load_id)
+
+
+@celery.task(name="tasks.upload.csv_done", ignore_result=False)
+def finish_csv_upload(results, spec_ref, file_paths, load_id):
+    spec = load_spec(spec_ref)
+    set_spec_indexes(spec, present=True, load_id=load_id)
+    remove_uploaded_files(file_paths)
+    inserted = sum(results)
+    logger.info(f"{spec.table}: {inserted:,} rows from {len(file_paths)} files in {len(results)} parts")
+    return inserted
+
+
+@celery.task(name="tasks.upload.csv_failed")
+def abort_csv_upload(request, exc, traceback, spec_ref=None, load_id=None):
+    logger.error(f"Parallel upload via {spec_ref} failed: {exc}")
+    set_spec_indexes(load_spec(spec_ref), present=True, load_id=load_id)
+
+
+def fan_out_csv_upload(spec_ref, file_paths):
+    """
+    Starts the chord for `file_paths` and returns {"parts", "chord_id"}, or None when
+    the upload should run inline (fan-out off, or a single part).
+    """
+    parts = plan_upload_parts(file_paths)
+    if not parts:
+        return None
+    load_id = uuid.uuid4().hex
+    spec = load_spec(spec_ref)
+    set_spec_indexes(spec, present=False, load_id=load_id)
+    try:
+        body = finish_csv_upload.s(spec_ref, file_paths, load_id).on_error(
+            abort_csv_upload.s(spec_ref=spec_ref, load_id=load_id))
+        result = chord(upload_csv_part.s(spec_ref, part, load_id) for part in parts)(body)
+    except Exception:
+        # No reducer or errback was queued to end the load: restore the indexes here
+        set_spec_indexes(spec, present=True, load_id=load_id)
+        raise
+    logger.info(f"Fanned out {len(file_paths)} files as {len(parts)} upload parts ({spec_ref})")
+    return {"parts": len(parts), "chord_id": result.id}
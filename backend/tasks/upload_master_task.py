@@ -1,13 +1,19 @@
+from celery import chord
 from celery_app import celery
-from services.master_uploader import upload_master_csv
+from services.master_uploader import (
+    upload_master_csv, merge_upload_stats, update_report, set_master_indexes
+)
 from database.session import get_db_session
 from model.upload_master_reports_model import UploadReport
+from tasks.upload_fanout import plan_upload_parts
 from datetime import datetime
 
+
 @celery.task(bind=True, task_time_limit=14400)  # 4 hours
 def process_master_upload_task(self, file_paths):
     session = get_db_session()
     task_id = self.request.id
+    report = None
 
     try:
         report = session.query(UploadReport).filter_by(task_id=task_id).first()
@@ -17,6 +23,20 @@ def process_master_upload_task(self, file_paths):
             session.commit()
             updated_at=datetime.utcnow()
 
+        # Several files (or one large one): parts run in parallel, finish_master_upload merges the report
+        parts = plan_upload_parts(file_paths)
+        if parts:
+            set_master_indexes(session, present=False, load_id=task_id)
+            try:
+                body = finish_master_upload.s(task_id).on_error(fail_master_upload.s(task_id=task_id))
+                chord(process_master_upload_part.s(part, task_id) for part in parts)(body)
+            except Exception:
+                # No reducer or errback was queued to end the load: restore the indexes here
+                set_master_indexes(session, present=True, load_id=task_id)
+                raise
+            print(f"🔀 Master upload fanned out as {len(parts)} parts")
+            return {"task_id": task_id, "status": "PROCESSING", "parts": len(parts)}
+
         upload_master_csv(file_paths, session, report)
 
         report.status = "COMPLETED"
@@ -37,4 +57,49 @@ def process_master_upload_task(self, file_paths):
         raise
 
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+
+@celery.task(name="tasks.upload.master_part", ignore_result=False, acks_late=True, task_time_limit=14400,
+             autoretry_for=(Exception,), retry_backoff=True, retry_jitter=True,
+             retry_kwargs={'max_retries': 3, 'countdown': 5})
+def process_master_upload_part(part, load_id=None):
+    """Loads one part; its stats go to finish_master_upload. Upserts, so a retry is harmless."""
+    session = get_db_session()
+    try:
+        return upload_master_csv([part], session, None, manage_indexes=False, load_id=load_id)
+    finally:
+        session.close()
+
+
+@celery.task(name="tasks.upload.master_done", ignore_result=False)
+def finish_master_upload(part_stats, task_id):
+    session = get_db_session()
+    try:
+        set_master_indexes(session, present=True, load_id=task_id)
+        report = session.query(UploadReport).filter_by(task_id=task_id).first()
+        stats = merge_upload_stats(part_stats)
+        if report:
+            update_report(session, report, stats)
+            report.status = "COMPLETED"
+            session.commit()
+        return {"task_id": task_id, "status": "COMPLETED", "parts": len(part_stats)}
+    finally:
+        session.close()
+
+
+@celery.task(name="tasks.upload.master_failed")
+def fail_master_upload(request, exc, traceback, task_id=None):
+    print(f"❌ FAILED: {str(exc)}")
+    session = get_db_session()
+    try:
+        set_master_indexes(session, present=True, load_id=task_id)
+        report = session.query(UploadReport).filter_by(task_id=task_id).first()
+        if report:
+            report.status = "FAILED"
+            report.stats = {"error": str(exc)[:1000]}
+            session.commit()
+    except Exception:
+        session.rollback()
+    finally:
+        session.close()
@@ -0,0 +1,34 @@
+from utils.bulk_writer import BulkWriter, row_size
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, sql, params=None):
+        self.calls.append((sql, params))
+
+
+def test_rows_are_packed_within_packet_budget():
+    cursor = RecordingCursor()
+    writer = BulkWriter(cursor, "t", ["a", "b"], ["b"], max_packet=20000, packet_fraction=0.5)
+    rows = [(i, "x" * 40) for i in range(1000)]
+    assert writer.write(rows) == 1000
+
+    assert sum(len(params) for _, params in cursor.calls) == 2000
+    assert [p[:2] for _, p in cursor.calls[:1]] == [[0, "x" * 40]]
+    for sql, params in cursor.calls:
+        assert sql.count("(%s, %s)") == len(params) // 2
+        assert row_size(rows[0]) * (len(params) // 2) <= writer.budget
+    # Full statements share one statement text
+    assert len({sql for sql, _ in cursor.calls[:-1]}) == 1
+    assert cursor.calls[0][0].endswith("ON DUPLICATE KEY UPDATE b = VALUES(b)")
+    assert writer.stats()["statements"] == len(cursor.calls)
+
+
+def test_oversized_row_goes_alone():
+    cursor = RecordingCursor()
+    writer = BulkWriter(cursor, "t", ["a"], max_packet=1000, packet_fraction=0.5)
+    writer.write([("s",), ("y" * 2000,), ("s",)])
+    assert [len(params) for _, params in cursor.calls] == [1, 1, 1]
+    assert "ON DUPLICATE" not in cursor.calls[0][0]
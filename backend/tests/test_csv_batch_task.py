@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+
+import tasks.gdrive_task.etl_tasks as etl
+from model.robust_gdrive_etl_v2 import GDriveHighSpeedIngestor
+
+KB = 1024
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def delay(self, *args, **kwargs):
+        self.calls.append(args or kwargs)
+
+
+def test_small_files_go_out_as_one_batch_task(monkeypatch):
+    single, batched = Recorder(), Recorder()
+    monkeypatch.setattr(etl, "process_csv_task", single)
+    monkeypatch.setattr(etl, "process_csv_batch_task", batched)
+    descriptors = [{"file_id": f"f{i}", "file_name": f"f{i}.csv", "size": str(4 * KB)} for i in range(5)]
+    descriptors.append({"file_id": "huge", "file_name": "huge.csv", "size": str(10 ** 10)})
+
+    GDriveHighSpeedIngestor.send_file_tasks(None, descriptors)
+    assert [[f["file_id"] for f in files] for (files,) in batched.calls] == [["f0", "f1", "f2", "f3", "f4"]]
+    assert "size" not in batched.calls[0][0][0]
+    assert [call["file_id"] for call in single.calls] == ["huge"]
+
+
+class FakeConn:
+    def __init__(self):
+        self.transactions = []
+        self.checkpoints = []
+
+    def commit(self):
+        pass
+
+    @contextmanager
+    def begin(self):
+        self.transactions.append([])
+        yield
+
+    def execute(self, sql, params):
+        rows = params if isinstance(params, list) else [params]
+        self.checkpoints.extend(rows)
+        self.transactions[-1].extend((p["filename"], p["status"]) for p in rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conn = FakeConn()
+
+    def connect(self):
+        return self.conn
+
+
+class FakePool:
+    @contextmanager
+    def client(self):
+        yield "drive-service"
+
+
+def test_failing_file_is_requeued_without_dropping_the_batch(monkeypatch):
+    engine, single = FakeEngine(), Recorder()
+    committed, errors, refreshed = [], [], []
+
+    @contextmanager
+    def all_locks(names, timeout=3600):
+        yield set(names)
+
+    def iter_file_batches(service, file_id, file_name, *args, **kwargs):
+        if file_id == "bad":
+            raise ValueError("Error tokenizing data")
+        yield "done", [{"file": file_id}], 1, 20, ["name"]
+
+    monkeypatch.setattr(etl, "engine", engine)
+    monkeypatch.setattr(etl, "drive_pool", FakePool())
+    monkeypatch.setattr(etl, "redis_locks", all_locks)
+    monkeypatch.setattr(etl, "get_file_checkpoints", lambda conn, hashes: {})
+    monkeypatch.setattr(etl, "iter_file_batches", iter_file_batches)
+    monkeypatch.setattr(etl, "commit_batch", lambda batch, **kwargs: committed.extend(r["file"] for r in batch))
+    monkeypatch.setattr(etl, "update_file_checkpoint",
+                        lambda file_id, name, status, *args, **kwargs: errors.append((file_id, status)))
+    monkeypatch.setattr(etl, "process_csv_task", single)
+    monkeypatch.setattr(etl, "trigger_stats_refresh", refreshed.append)
+
+    files = [{"file_id": fid, "file_name": f"{fid}.csv", "modified_time": "2026-01-01T00:00:00.000Z"}
+             for fid in ("a", "bad", "c")]
+    result = etl.process_csv_batch_task.apply(args=(files,)).get()
+
+    assert result == "Batch of 3: 2 completed, 0 skipped, 1 re-queued"
+    # Both good files land, with their PROCESSED checkpoints, in one transaction
+    assert committed == ["a", "c"]
+    assert engine.conn.transactions == [[("a.csv", "PROCESSED"), ("c.csv", "PROCESSED")]]
+    assert errors == [("bad", "ERROR")]
+    assert [(call["file_id"], call["modified_time"]) for call in single.calls] == [("bad", "2026-01-01 00:00:00")]
+    assert refreshed == [2]
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from utils.csv_parts import csv_byte_ranges, plan_csv_parts, open_csv_part
+
+
+def test_byte_range_parts_reassemble_the_file(tmp_path):
+    path = tmp_path / "rows.csv"
+    rows = [f'{i},"name {i}","line one\nline two, ""quoted"""\n' for i in range(500)]
+    path.write_text("id,name,notes\n" + "".join(rows))
+
+    parts = plan_csv_parts([str(path)], 2000)
+    assert len(parts) > 1
+    ranges = [(p["start"], p["end"]) for p in parts]
+    assert ranges == csv_byte_ranges(str(path), 2000)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    frames = []
+    for part in parts:
+        source = open_csv_part(part)
+        try:
+            frames.append(pd.read_csv(source))
+        finally:
+            source.close()
+    combined = pd.concat(frames, ignore_index=True)
+    pd.testing.assert_frame_equal(combined, pd.read_csv(path))
+
+
+def test_small_files_stay_whole(tmp_path):
+    path = tmp_path / "small.csv"
+    path.write_text("a,b\n1,2\n")
+    assert plan_csv_parts([str(path)], 2000) == [str(path)]
+    assert open_csv_part(str(path)) == str(path)
@@ -0,0 +1,43 @@
+import io
+import pandas as pd
+
+from services.csv_upload_engine import Column, UploadSpec, chunk_rows, decimal_text, json_text
+from utils.safe_get import safe_get
+from utils.clean_data_decimal import clean_data_decimal
+from utils.to_valid_json import to_valid_json
+
+CSV = (
+    "Business Name,Phone,Tags,Rating,Reviews\n"
+    "Cafe One,09876543210.0,\"['a', 'b']\",4.5,12\n"
+    ",,,,\n"
+    " Shop ,0,not a list,3,0\n"
+    "Mill,00,\"[1]\",,7\n"
+)
+SPEC = UploadSpec('listings', [
+    Column('name', 'Business_Name', update=False),
+    Column('number', 'Phone', transform=decimal_text),
+    Column('tags', 'Tags', transform=json_text),
+    Column('rating', 'Rating'),
+    Column('reviews', 'Reviews'),
+    Column('city', 'City'),
+], rename_spaces=True)
+
+
+def test_chunk_rows_matches_per_cell_safe_get():
+    chunk = pd.read_csv(io.StringIO(CSV))
+    legacy = [
+        (safe_get(r, 'Business_Name'), clean_data_decimal(safe_get(r, 'Phone')), to_valid_json(safe_get(r, 'Tags')),
+         safe_get(r, 'Rating'), safe_get(r, 'Reviews'), safe_get(r, 'City'))
+        for r in chunk.rename(columns=lambda c: c.replace(' ', '_')).itertuples(index=False)
+    ]
+    rows = chunk_rows(chunk, SPEC)
+    assert rows == legacy
+    assert rows[1] == (None,) * 6
+    assert [type(v) for v in rows[0]] == [type(v) for v in legacy[0]]
+
+
+def test_upsert_only_updates_flagged_columns():
+    sql = SPEC.writer(cursor=None, max_packet=1 << 20).statement(1)
+    assert sql.startswith("INSERT INTO listings (name, number, tags, rating, reviews, city) VALUES (%s")
+    assert "name = VALUES(name)" not in sql
+    assert "ON DUPLICATE KEY UPDATE number = VALUES(number)" in sql
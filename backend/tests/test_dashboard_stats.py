@@ -0,0 +1,33 @@
+from flask import Flask
+
+import routes.gdrive_etl_routes.dashboard_stats as dashboard
+
+
+def make_client(monkeypatch, queries):
+    def execute_read(query, params=None):
+        queries.append(" ".join(query.split()))
+        if "file_record_summary" in query:
+            return [(120,)]
+        if "state_category_summary_v5" in query:
+            return [(40,)]
+        return [(1, "Cafe One", None, None, None, 0, 0, "Cafe", None, "Surat", "Gujarat", None, "a.csv", "/a")]
+
+    monkeypatch.setattr(dashboard, "execute_read", execute_read)
+    app = Flask(__name__)
+    app.register_blueprint(dashboard.dashboard_bp)
+    return app.test_client()
+
+
+def test_file_total_is_only_reported_when_it_matches_the_filters(monkeypatch):
+    queries = []
+    client = make_client(monkeypatch, queries)
+
+    assert client.get("/api/model/all?file_name=a.csv").get_json()["total"] == 120
+    assert client.get("/api/model/all?state=Gujarat").get_json()["total"] == 40
+
+    # The file's count would overstate a file+state listing: no total rather than a wrong one
+    queries.clear()
+    body = client.get("/api/model/all?file_name=a.csv&state=Gujarat&category=Cafe").get_json()
+    assert body["total"] is None
+    assert [r["name"] for r in body["data"]] == ["Cafe One"]
+    assert not any("summary" in q for q in queries)
@@ -0,0 +1,24 @@
+from model.robust_gdrive_etl_v2 import group_by_size
+
+MB = 1024 * 1024
+
+
+def desc(name, size):
+    return {"file_id": name, "file_name": name, "size": str(size) if size is not None else None}
+
+
+def names(batches):
+    return [[d["file_id"] for d in b] for b in batches]
+
+
+def test_packs_small_files_by_byte_budget():
+    files = [desc("a", 3 * MB), desc("b", 4 * MB), desc("c", 2 * MB), desc("d", 1 * MB)]
+    assert names(group_by_size(files, byte_budget=8 * MB, max_files=10)) == [["a", "b"], ["c", "d"]]
+
+
+def test_large_unknown_and_capped_files():
+    files = [desc("big", 20 * MB), desc("x", 1), desc("y", 1), desc("z", 1), desc("nosize", None)]
+    batches = group_by_size(files, byte_budget=8 * MB, max_files=2)
+    assert names(batches) == [["big"], ["x", "y"], ["nosize"], ["z"]]
+    # Budget 0 disables coalescing
+    assert all(len(b) == 1 for b in group_by_size(files, byte_budget=0))
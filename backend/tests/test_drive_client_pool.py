@@ -0,0 +1,61 @@
+import threading
+from datetime import datetime, timedelta
+
+from utils.drive_client_pool import DriveClientPool
+
+
+class FakeCredentials:
+    def __init__(self, expires_in):
+        self.token = "t0"
+        self.expiry = datetime.utcnow() + timedelta(seconds=expires_in)
+        self.refresh_calls = 0
+
+    def refresh(self, request):
+        self.refresh_calls += 1
+        self.token = f"t{self.refresh_calls}"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+
+class FakePool(DriveClientPool):
+    def _build_client(self):
+        self.built += 1
+        return object()
+
+
+def test_clients_are_built_once_and_reused():
+    pool = FakePool(size=2, credentials=FakeCredentials(3600))
+    seen = set()
+    for _ in range(10):
+        with pool.client() as service:
+            seen.add(id(service))
+    assert pool.built == 2
+    assert len(seen) <= 2
+    assert pool.credentials.refresh_calls == 0
+
+
+def test_expiring_token_is_refreshed_once_for_all_callers():
+    creds = FakeCredentials(60)
+    pool = FakePool(size=4, credentials=creds, refresh_margin=300)
+
+    def task():
+        with pool.client():
+            pass
+
+    threads = [threading.Thread(target=task) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert creds.refresh_calls == 1
+    assert pool.refreshes == 1
+
+
+def test_exhausted_pool_serves_a_temporary_client_after_the_checkout_timeout():
+    pool = FakePool(size=1, credentials=FakeCredentials(3600), checkout_timeout=0.05)
+    with pool.client() as pooled:
+        with pool.client() as extra:
+            assert extra is not pooled
+    assert pool.overflows == 1
+    assert pool.built == 2
+    # The temporary client is not kept: the pool still holds only its own
+    assert pool.clients.qsize() == 1
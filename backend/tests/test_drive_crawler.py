@@ -0,0 +1,110 @@
+import threading
+from model.drive_crawler import DriveTreeCrawler, FOLDER_MIME
+
+
+class FakeIngestor:
+    """In-memory folder tree standing in for GDriveHighSpeedIngestor."""
+    def __init__(self, tree, registry=None):
+        self.tree = tree
+        self.folder_registry = dict(registry or {})
+        self.shutdown_event = threading.Event()
+        self.stats_lock = threading.Lock()
+        self.total_scanned_folders = 0
+        self.total_skipped_folders = 0
+        self.total_dispatched_files = 0
+        self.listed = []
+        self.dispatched = []
+
+    def list_children(self, parent_id):
+        self.listed.append(parent_id)
+        return list(self.tree.get(parent_id, []))
+
+    def dispatch_csv_files(self, folder_id, folder_name, path, csv_files):
+        self.dispatched.extend((f"{path}/{folder_name}", f['name']) for f in csv_files)
+        return len(csv_files), 0
+
+    def register_folder(self, folder_id, folder_name, modified_at, csv_count=0):
+        self.folder_registry[folder_id] = modified_at
+
+
+def folder(fid, mod="2026-01-01T00:00:00.000Z"):
+    return {"id": fid, "name": fid, "mimeType": FOLDER_MIME, "modifiedTime": mod}
+
+
+def csv_file(name):
+    return {"id": name, "name": name, "mimeType": "text/csv", "modifiedTime": "2026-01-01T00:00:00Z"}
+
+
+TREE = {
+    "A": [folder("A1"), folder("A2"), csv_file("a.csv")],
+    "A1": [csv_file(f"a1_{i}.csv") for i in range(5)],
+    "A2": [folder("A21")],
+    "A21": [csv_file("deep.csv")],
+    "B": [csv_file("b.csv")],
+}
+
+
+def test_crawls_whole_tree_with_paths():
+    ing = FakeIngestor(TREE)
+    DriveTreeCrawler(ing, concurrency=4).run([("A", "A", "ROOT", None), ("B", "B", "ROOT", None)])
+    assert sorted(ing.listed) == ["A", "A1", "A2", "A21", "B"]
+    assert ing.total_dispatched_files == 8
+    assert ("ROOT/A/A2/A21", "deep.csv") in ing.dispatched
+
+
+def test_skips_unchanged_subtrees():
+    ing = FakeIngestor(TREE, registry={"A2": "2026-01-01 00:00:00"})
+    DriveTreeCrawler(ing, concurrency=2).run([("A", "A", "ROOT", None)])
+    assert sorted(ing.listed) == ["A", "A1"]
+    assert ing.total_skipped_folders == 1
+
+
+class FailingIngestor(FakeIngestor):
+    def __init__(self, tree, failing, registry=None):
+        super().__init__(tree, registry)
+        self.failing = set(failing)
+
+    def list_children(self, parent_id):
+        if parent_id in self.failing:
+            raise RuntimeError("403 userRateLimitExceeded")
+        return super().list_children(parent_id)
+
+
+def test_registers_folders_only_after_whole_subtree():
+    ing = FakeIngestor(TREE)
+    DriveTreeCrawler(ing, concurrency=4).run([("A", "A", "ROOT", "2026-02-01T00:00:00.000Z"), ("B", "B", "ROOT", None)])
+    assert ing.folder_registry == {
+        "A": "2026-02-01 00:00:00",
+        "A1": "2026-01-01 00:00:00",
+        "A2": "2026-01-01 00:00:00",
+        "A21": "2026-01-01 00:00:00",
+    }  # B's own modifiedTime is unknown, so nothing is stored for it
+
+
+def test_failed_child_listing_leaves_ancestors_unregistered():
+    ing = FailingIngestor(TREE, failing={"A21"})
+    crawler = DriveTreeCrawler(ing, concurrency=4)
+    crawler.run([("A", "A", "ROOT", "2026-02-01T00:00:00.000Z")])
+    assert crawler.failed_folders == 1
+    assert set(ing.folder_registry) == {"A1"}
+
+    # The next scan must not treat A (or A2) as unchanged
+    ing.failing.clear()
+    DriveTreeCrawler(ing, concurrency=4).run([("A", "A", "ROOT", "2026-02-01T00:00:00.000Z")])
+    assert "A21" in ing.listed
+    assert set(ing.folder_registry) == {"A", "A1", "A2", "A21"}
+
+
+def test_shutdown_mid_crawl_registers_nothing_unfinished():
+    ing = FakeIngestor(TREE)
+    original = ing.list_children
+
+    def list_then_stop(parent_id):
+        items = original(parent_id)
+        if parent_id == "A":
+            ing.shutdown_event.set()
+        return items
+
+    ing.list_children = list_then_stop
+    DriveTreeCrawler(ing, concurrency=1).run([("A", "A", "ROOT", "2026-02-01T00:00:00.000Z")])
+    assert ing.folder_registry == {}
@@ -0,0 +1,102 @@
+from model.drive_folder_cache import DriveFolderCache
+
+ROOT = "root"
+# folder_id -> (name, parent_id)
+FOLDERS = {
+    "city": ("Manali", ROOT),
+    "cat": ("Hotels", "city"),
+    "sub": ("Budget", "cat"),
+    "other": ("Shimla", ROOT),
+}
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+class FakeGet:
+    def __init__(self, file_id):
+        self.file_id = file_id
+
+
+class FakeFiles:
+    def get(self, fileId, fields=None):
+        return FakeGet(fileId)
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        assert len(self.requests) <= 100
+        self.service.batches.append([rid for rid, _ in self.requests])
+        for rid, req in self.requests:
+            failures = self.service.failures.get(req.file_id)
+            if failures:
+                self.service.failures[req.file_id] = failures[1:]
+                self.callback(rid, None, FakeHttpError(failures[0]))
+            elif req.file_id in FOLDERS:
+                name, parent = FOLDERS[req.file_id]
+                self.callback(rid, {"id": req.file_id, "name": name, "parents": [parent]}, None)
+            else:
+                self.callback(rid, None, FakeHttpError(404))
+
+
+class FakeService:
+    def __init__(self, failures=None):
+        self.batches = []
+        # folder_id -> HTTP statuses returned on its next lookups
+        self.failures = dict(failures or {})
+
+    def files(self):
+        return FakeFiles()
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+def test_prefetch_batches_one_round_per_level():
+    service = FakeService()
+    cache = DriveFolderCache(service, root_id=ROOT)
+    cache.prefetch(["sub", "other"])
+    assert [sorted(b) for b in service.batches] == [["other", "sub"], ["cat"], ["city"]]
+    assert cache.path_names("sub") == ["Manali", "Hotels", "Budget"]
+    # Fully cached chains cost no further calls
+    assert cache.ancestors("sub")[0]["id"] == "city"
+    assert len(service.batches) == 3
+
+
+def test_missing_folders_are_not_refetched():
+    service = FakeService()
+    cache = DriveFolderCache(service, root_id=ROOT)
+    assert cache.get("gone") is None
+    assert cache.path_names("gone") == []
+    assert service.batches == [["gone"]]
+
+
+def test_throttled_lookups_are_retried_not_marked_missing():
+    service = FakeService(failures={"cat": [429, 403]})
+    cache = DriveFolderCache(service, root_id=ROOT, retry_backoff=0)
+    assert cache.path_names("sub") == ["Manali", "Hotels", "Budget"]
+    assert cache.missing == set()
+    assert service.batches == [["sub"], ["cat"], ["cat"], ["cat"], ["city"]]
+
+
+def test_persistent_server_errors_stay_uncached():
+    service = FakeService(failures={"cat": [503] * 10})
+    cache = DriveFolderCache(service, root_id=ROOT, max_retries=1, retry_backoff=0)
+    assert cache.path_names("sub") == ["Budget"]
+    assert cache.resolve("sub")[1] is False
+    assert "cat" not in cache.missing
+    # A later call tries the ancestor again
+    service.failures.clear()
+    chain, complete = cache.resolve("sub")
+    assert [info["name"] for info in chain] == ["Manali", "Hotels", "Budget"] and complete
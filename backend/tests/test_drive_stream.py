@@ -0,0 +1,82 @@
+import csv
+import io
+import logging
+
+import pytest
+
+import utils.drive_stream as drive_stream
+from utils.drive_stream import DriveLineStream, next_chunk_with_retry
+
+
+class FakeDownloader:
+    """Mimics MediaIoBaseDownload: writes one slice of the payload per next_chunk()."""
+    def __init__(self, sink, payload, chunk_size, start=0):
+        self.sink = sink
+        self.payload = payload
+        self.chunk_size = chunk_size
+        self.pos = start
+
+    def next_chunk(self):
+        piece = self.payload[self.pos:self.pos + self.chunk_size]
+        self.sink.write(piece)
+        self.pos += len(piece)
+        return None, self.pos >= len(self.payload)
+
+
+def make_stream(payload, chunk_size, start_offset=0):
+    stream = DriveLineStream(request=None, chunk_size=chunk_size, start_offset=start_offset)
+    stream._open_downloader = lambda sink: FakeDownloader(sink, payload, chunk_size, start=stream.offset)
+    return stream
+
+
+def test_streaming_rows_match_buffered_parse():
+    text = 'name,city\r\n"Cafe, ""One""",શહેર\r\n"Multi\r\nLine",Delhi\r\nહનીબી ડિજિટલ,Surat'
+    payload = text.encode('utf-8')
+    buffered = list(csv.DictReader(io.TextIOWrapper(io.BytesIO(payload), encoding='utf-8', errors='replace')))
+
+    # Tiny chunks split multi-byte characters and CRLF pairs across chunk boundaries
+    for chunk_size in (1, 3, 7, len(payload)):
+        stream = make_stream(payload, chunk_size)
+        assert list(csv.DictReader(stream)) == buffered
+        assert stream.offset == len(payload)
+        assert stream.bytes_downloaded == len(payload)
+
+
+def test_resume_from_recorded_byte_offset():
+    text = 'name,city\n"A\nB",Surat\nનામ,Rajkot\nC,Delhi\nD,Pune\n'
+    payload = text.encode('utf-8')
+    full = list(csv.DictReader(make_stream(payload, 4)))
+
+    first = make_stream(payload, 4)
+    reader = csv.DictReader(first)
+    consumed = [next(reader), next(reader)]
+    offset, header = first.offset, reader.fieldnames
+
+    resumed = make_stream(payload, 4, start_offset=offset)
+    rest = list(csv.DictReader(resumed, fieldnames=header))
+    assert consumed + rest == full
+    assert resumed.bytes_downloaded == len(payload) - offset
+
+
+class FlakyDownloader:
+    def __init__(self, errors):
+        self.errors = list(errors)
+
+    def next_chunk(self):
+        if self.errors:
+            raise self.errors.pop(0)
+        return None, True
+
+
+def test_transient_chunk_errors_are_retried_and_logged(monkeypatch, caplog):
+    monkeypatch.setattr(drive_stream.time, "sleep", lambda s: None)
+    caplog.set_level(logging.WARNING, logger="DriveStream")
+    assert next_chunk_with_retry(FlakyDownloader([OSError("SSL: UNEXPECTED_EOF")])) == (None, True)
+    assert "retry 1/4" in caplog.text
+
+    with pytest.raises(OSError):
+        next_chunk_with_retry(FlakyDownloader([OSError("connection reset")] * 3), attempts=3)
+    assert "still failing after 3 attempts" in caplog.text
+    # Anything else is not retried
+    with pytest.raises(ValueError):
+        next_chunk_with_retry(FlakyDownloader([ValueError("bad range")]))
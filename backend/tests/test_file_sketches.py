@@ -0,0 +1,109 @@
+import fnmatch
+
+from utils.file_sketches import add_file_ids, count_files, rebuild_sketches, slice_key, REBUILD_PREFIX
+
+
+class FakeHLLRedis:
+    """Exact sets standing in for Redis HyperLogLogs."""
+    def __init__(self):
+        self.sets = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def pfadd(self, key, *values):
+        self.sets.setdefault(key, set()).update(values)
+
+    def pfcount(self, *keys):
+        return len(set().union(*(self.sets.get(k, set()) for k in keys)))
+
+    def execute(self):
+        pass
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    def persist(self, key):
+        self.ttls.pop(key, None)
+
+    def rename(self, src, dst):
+        self.sets[dst] = self.sets.pop(src)
+        self.ttls.pop(dst, None)
+        if src in self.ttls:
+            self.ttls[dst] = self.ttls.pop(src)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.sets.pop(key, None)
+            self.ttls.pop(key, None)
+
+    def scan_iter(self, match):
+        return [k for k in list(self.sets) if fnmatch.fnmatchcase(k, match)]
+
+
+def delta(state, category, file_id):
+    return {"state": state, "category": category, "drive_file_id": file_id, "delta": 1}
+
+
+def test_distinct_files_merge_across_slices():
+    r = FakeHLLRedis()
+    add_file_ids(r, [delta("Gujarat", "Cafe", "f1"), delta("Gujarat", "Spa", "f1"),
+                     delta("Gujarat", "Spa", "f2"), delta("Kerala", "Cafe", "f3")])
+    assert count_files(r, [("Gujarat", "Cafe"), ("Gujarat", "Spa")]) == 2
+    assert count_files(r, [("Gujarat", "Cafe"), ("Kerala", "Cafe")]) == 2
+    assert count_files(r, []) == 0
+
+
+def test_slice_keys_ignore_case_like_mysql():
+    r = FakeHLLRedis()
+    add_file_ids(r, [delta("GUJARAT", "cafe", "f1"), delta("Gujarat", "Cafe ", "f2")])
+    assert count_files(r, [("gujarat", "Cafe")]) == 2
+
+
+class FakeStream:
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def execution_options(self, **kwargs):
+        return self
+
+    def execute(self, sql):
+        return self
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class CrashingStream(FakeStream):
+    def fetchmany(self, size):
+        if not self.rows:
+            raise ConnectionError("Lost connection to MySQL server during query")
+        return super().fetchmany(size)
+
+
+def test_interrupted_rebuild_leaves_only_expiring_staging_keys():
+    r = FakeHLLRedis()
+    try:
+        rebuild_sketches(CrashingStream([("Goa", "Spa", "f1")]), r)
+    except ConnectionError:
+        pass
+    staged = [k for k in r.sets if k.startswith(REBUILD_PREFIX)]
+    assert staged and all(k in r.ttls for k in staged)
+
+
+def test_rebuild_clears_stranded_staging_keys_and_keeps_live_sketches():
+    r = FakeHLLRedis()
+    add_file_ids(r, [delta("Goa", "Spa", "old")])
+    # Left behind by a rebuild that crashed before its RENAME step
+    stranded = slice_key("Kerala", "Cafe", REBUILD_PREFIX)
+    r.pfadd(stranded, "f9")
+
+    rows = [("Gujarat", "Cafe", "f1"), ("Gujarat", "Cafe", "f2"), ("Kerala", "Spa", "f3")]
+    assert rebuild_sketches(FakeStream(rows), r, batch_size=2) == 2
+    assert stranded not in r.sets
+    assert not any(k.startswith(REBUILD_PREFIX) for k in r.sets)
+    assert count_files(r, [("Gujarat", "Cafe")]) == 2
+    assert slice_key("Goa", "Spa") not in r.sets  # no rows left for it
+    assert r.ttls == {}  # staging TTLs do not follow the sketches through RENAME
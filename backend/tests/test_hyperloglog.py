@@ -0,0 +1,23 @@
+from utils.hyperloglog import HyperLogLog
+
+
+def test_estimates_within_error_and_small_counts_exact():
+    hll = HyperLogLog(14)
+    hll.update(f"city-{i}" for i in range(50000))
+    assert abs(hll.count() - 50000) / 50000 < 0.03
+    assert hll.nbytes == 16384
+
+    small = HyperLogLog(14)
+    small.update(["Pune", "Surat", "Pune", "Indore"])
+    assert small.count() == 3
+
+
+def test_merge_matches_union_and_survives_text_round_trip():
+    a, b = HyperLogLog(12), HyperLogLog(12)
+    a.update(range(0, 6000))
+    b.update(range(4000, 10000))
+    union = HyperLogLog(12)
+    union.update(range(10000))
+
+    merged = HyperLogLog.from_text(a.to_text()).merge(HyperLogLog.from_text(b.to_text()))
+    assert merged.registers == union.registers
@@ -0,0 +1,141 @@
+import time
+
+from utils.index_maintenance import begin_bulk_load, end_bulk_load, reconcile_indexes, renew_bulk_load, LEASE_TTL
+
+
+class FakeRedis:
+    def __init__(self):
+        self.zsets = {}
+        self.hashes = {}
+        self.strings = {}
+        self.results = []
+
+    def pipeline(self, transaction=True):
+        self.results = []
+        return self
+
+    def execute(self):
+        return self.results
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.setdefault(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+        self.results.append(None)
+
+    def zadd(self, key, mapping, xx=False):
+        zset = self.zsets.setdefault(key, {})
+        zset.update((m, score) for m, score in mapping.items() if not xx or m in zset)
+        self.results.append(None)
+
+    def zscore(self, key, member):
+        self.results.append(self.zsets.get(key, {}).get(member))
+
+    def zrem(self, key, member):
+        self.zsets.setdefault(key, {}).pop(member, None)
+        self.results.append(None)
+
+    def zcard(self, key):
+        self.results.append(len(self.zsets.get(key, {})))
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+        self.results.append(None)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, owner, *args):
+        # Only the compare-and-delete release is used here
+        if self.strings.get(key) == owner:
+            del self.strings[key]
+            return 1
+        return 0
+
+    def hgetall(self, key):
+        return {k.encode(): v.encode() for k, v in self.hashes.get(key, {}).items()}
+
+
+class IndexCursor:
+    """Applies DROP/CREATE INDEX statements to an in-memory index set."""
+    def __init__(self, existing):
+        self.indexes = set(existing)
+        self.ddl = []
+
+    def execute(self, sql, params=None):
+        if sql.startswith(("DROP", "CREATE")):
+            self.ddl.append(sql)
+            name = sql.split()[2]
+            (self.indexes.discard if sql.startswith("DROP") else self.indexes.add)(name)
+
+    def fetchall(self):
+        return [(name,) for name in self.indexes]
+
+
+def test_last_concurrent_load_rebuilds_online():
+    r = FakeRedis()
+    cursor = IndexCursor({"idx_city", "idx_area"})
+    first = begin_bulk_load(cursor, "t", ["city", "area"], redis_client=r)
+    second = begin_bulk_load(cursor, "t", ["city", "area"], redis_client=r)
+    assert cursor.indexes == set()
+    assert all(sql.endswith("ALGORITHM=INPLACE LOCK=NONE") for sql in cursor.ddl)
+
+    assert end_bulk_load(cursor, "t", ["city", "area"], first, redis_client=r) is False
+    assert cursor.indexes == set()
+    assert end_bulk_load(cursor, "t", ["city", "area"], second, redis_client=r) is True
+    assert cursor.indexes == {"idx_city", "idx_area"}
+
+
+def test_reconcile_restores_indexes_of_an_abandoned_load():
+    r = FakeRedis()
+    cursor = IndexCursor({"idx_city"})
+    begin_bulk_load(cursor, "t", ["city"], redis_client=r)
+    # Held by a live lease: left alone
+    assert reconcile_indexes(cursor, r) == {}
+    assert cursor.indexes == set()
+
+    r.zsets["idxlease:t"] = {k: 0 for k in r.zsets["idxlease:t"]}  # the lease expired
+    assert reconcile_indexes(cursor, r) == {"t": ["idx_city"]}
+    assert cursor.indexes == {"idx_city"}
+
+
+def test_table_being_rebuilt_is_left_alone_and_load_keeps_indexes(monkeypatch):
+    monkeypatch.setattr("utils.index_maintenance.DDL_LOCK_WAIT", 0)
+    r = FakeRedis()
+    cursor = IndexCursor({"idx_city"})
+    load = begin_bulk_load(cursor, "t", ["city"], redis_client=r)
+    assert r.strings == {}  # the DDL lock is released once the drop is done
+    assert end_bulk_load(cursor, "t", ["city"], load, redis_client=r) is True
+    cursor.indexes.clear()  # left dropped by a crashed load
+
+    # Another worker is mid-rebuild: reconcile skips the table, a new load does not drop
+    r.set("lock:idxddl:t", "other", nx=True)
+    assert reconcile_indexes(cursor, r) == {}
+    assert cursor.indexes == set()
+    cursor.indexes.add("idx_city")
+    second = begin_bulk_load(cursor, "t", ["city"], redis_client=r)
+    assert cursor.indexes == {"idx_city"}
+    assert second in r.zsets["idxlease:t"]
+    # Ending without the lock only drops the lease; reconcile rebuilds once the lock is free
+    cursor.indexes.clear()
+    assert end_bulk_load(cursor, "t", ["city"], second, redis_client=r) is False
+    assert r.zsets["idxlease:t"] == {} and cursor.indexes == set()
+    r.eval(None, 1, "lock:idxddl:t", "other")
+    assert reconcile_indexes(cursor, r) == {"t": ["idx_city"]}
+
+
+def test_renewed_lease_outlives_its_original_ttl():
+    r = FakeRedis()
+    cursor = IndexCursor({"idx_city"})
+    load = begin_bulk_load(cursor, "t", ["city"], redis_client=r)
+    r.zsets["idxlease:t"][load] = time.time() + 1  # about to expire
+    assert renew_bulk_load("t", load, redis_client=r) is True
+    assert r.zsets["idxlease:t"][load] > time.time() + LEASE_TTL - 60
+    assert reconcile_indexes(cursor, r) == {}
+
+    # A lease that already lapsed is not brought back
+    assert renew_bulk_load("t", "gone", redis_client=r) is False
+    assert "gone" not in r.zsets["idxlease:t"]
@@ -0,0 +1,31 @@
+import pytest
+from utils.keyset_cursor import encode_cursor, decode_cursor, page_response
+
+
+def test_cursor_round_trip_is_bound_to_filters():
+    filters = {"state": "Goa", "file_name": "hotels.csv"}
+    cursor = encode_cursor(12345, filters)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, {"file_name": "hotels.csv", "state": "Goa"}) == 12345
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, {"state": "Kerala", "file_name": "hotels.csv"})
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_missing_and_malformed_cursors():
+    assert decode_cursor(None) is None
+    assert decode_cursor("") is None
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_page_response_uses_lookahead_row():
+    rows = [(10,), (9,), (8,)]
+    page, next_cursor, has_next = page_response(rows, 2)
+    assert page == [(10,), (9,)] and has_next
+    assert decode_cursor(next_cursor) == 9
+
+    page, next_cursor, has_next = page_response(rows, 3)
+    assert len(page) == 3 and next_cursor is None and not has_next
+    assert page_response([], 50) == ([], None, False)
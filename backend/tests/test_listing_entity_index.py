@@ -0,0 +1,205 @@
+import re
+from contextlib import contextmanager
+
+from flask import Flask
+
+from extensions import db
+from model.listing_entity import ListingEntity
+from model.listing_entity_index import ListingEntityIndexer
+from model.listing_master import ListingMaster
+from routes.listing_master_route import listing_master_bp
+
+
+class FakeResult:
+    def __init__(self, rows=(), mapped=()):
+        self.rows = list(rows)
+        self.mapped = list(mapped)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows[0][0]
+
+    def mappings(self):
+        return FakeResult(self.mapped)
+
+
+class FakeListingDB:
+    """
+    In-memory stand-in for the MySQL tables ListingEntityIndexer touches. Each statement
+    is recognised by its text and applied with the same semantics as the real SQL.
+    """
+
+    def __init__(self, listings):
+        self.listings = {row["id"]: row for row in listings}
+        self.members = {}     # listing_id -> {entity_id, source, score}
+        self.entities = {}    # entity_id -> row
+        self.blocks = set()   # (block_key, listing_id)
+        self.metadata = {}
+
+    @contextmanager
+    def connect(self):
+        yield self
+
+    begin = connect
+
+    def add(self, *rows):
+        self.listings.update((row["id"], row) for row in rows)
+
+    def execute(self, clause, params=None):
+        sql = " ".join(clause.text.split())
+        params = params if params is not None else {}
+        if sql.startswith("SELECT meta_value FROM etl_metadata"):
+            value = self.metadata.get(params["k"])
+            return FakeResult([(value,)] if value is not None else [])
+        if sql.startswith("INSERT INTO etl_metadata"):
+            self.metadata[params["k"]] = params["v"]
+        elif sql.startswith("SELECT COALESCE(MAX(id), 0)"):
+            return FakeResult([(max(self.listings, default=0),)])
+        elif sql.startswith("SELECT id, business_name AS name"):
+            if "id IN :ids" in sql:
+                ids = [i for i in params["ids"] if i in self.listings]
+            else:
+                ids = [i for i in self.listings if params["lo"] < i <= params["hi"]]
+            return FakeResult(mapped=[self._listing_row(i) for i in sorted(ids)])
+        elif sql.startswith("(SELECT block_key"):
+            limit = int(re.search(r"LIMIT (\d+)", sql).group(1))
+            rows = []
+            for key in params.values():
+                ids = sorted((lid for k, lid in self.blocks if k == key), reverse=True)[:limit]
+                rows += [(key, lid) for lid in ids]
+            return FakeResult(rows)
+        elif sql.startswith("INSERT IGNORE INTO listing_entity_blocks"):
+            self.blocks.update((p["k"], p["id"]) for p in params)
+        elif sql.startswith("SELECT listing_id, entity_id FROM listing_entity_members"):
+            return FakeResult([(i, self.members[i]["entity_id"]) for i in params["ids"] if i in self.members])
+        elif sql.startswith("UPDATE listing_entity_members SET entity_id"):
+            for member in self.members.values():
+                if member["entity_id"] == params["old"]:
+                    member["entity_id"] = params["new"]
+        elif sql.startswith("DELETE FROM listing_entities"):
+            self.entities.pop(params["old"], None)
+        elif sql.startswith("INSERT INTO listing_entity_members"):
+            for p in params:
+                old = self.members.get(p["listing_id"])
+                if old is None:
+                    self.members[p["listing_id"]] = {k: p[k] for k in ("entity_id", "source", "score")}
+                else:
+                    old["entity_id"] = p["entity_id"]
+                    old["source"] = p["source"] if p["source"] is not None else old["source"]
+                    old["score"] = max(old["score"] or 0, p["score"] or 0)
+        elif sql.startswith("INSERT INTO listing_entities"):
+            for entity_id in params["ids"]:
+                listing_ids = [i for i, m in self.members.items() if m["entity_id"] == entity_id]
+                if not listing_ids or entity_id not in self.listings:
+                    continue
+                sources = sorted({self.members[i]["source"] for i in listing_ids} - {None})
+                head = self.listings[entity_id]
+                self.entities[entity_id] = {
+                    "business_name": head["business_name"], "city": head["city"],
+                    "listing_count": len(listing_ids), "source_count": len(sources),
+                    "sources": ",".join(sources),
+                }
+        else:
+            raise AssertionError(f"Unexpected statement: {sql[:80]}")
+        return FakeResult()
+
+    def _listing_row(self, listing_id):
+        row = self.listings[listing_id]
+        return {"id": listing_id, "name": row["business_name"], "address": row.get("address"),
+                "phone_number": row.get("mobile") or row.get("phone"), "city": row["city"],
+                "latitude": None, "longitude": None, "source": row["source"]}
+
+    def entity_of(self):
+        return {listing_id: m["entity_id"] for listing_id, m in self.members.items()}
+
+
+def listing(listing_id, name, source, mobile="", city="Surat", address="Ring Road"):
+    return {"id": listing_id, "business_name": name, "source": source, "mobile": mobile,
+            "city": city, "address": address}
+
+
+def test_singletons_and_cross_source_matches():
+    fake = FakeListingDB([
+        listing(1, "Shree Ram Sweets", "JustDial", mobile="9876543210"),
+        listing(2, "Shree Ram Sweet", "GoogleMap", mobile="+91 98765 43210"),
+        listing(3, "City Hospital", "Asklaila", city="Pune"),
+    ])
+    stats = ListingEntityIndexer(fake, chunk_size=10).run()
+    assert stats["rows"] == 3 and stats["last_id"] == 3
+    assert fake.entity_of() == {1: 1, 2: 1, 3: 3}
+    assert fake.entities[1]["listing_count"] == 2
+    assert fake.entities[1]["sources"] == "GoogleMap,JustDial"
+    assert fake.entities[3] == {"business_name": "City Hospital", "city": "Pune", "listing_count": 1,
+                                "source_count": 1, "sources": "Asklaila"}
+
+
+def test_rerun_after_checkpoint_links_new_listings_to_existing_entities():
+    fake = FakeListingDB([listing(1, "Shree Ram Sweets", "JustDial", mobile="9876543210")])
+    ListingEntityIndexer(fake).run()
+    assert fake.metadata["listing_entity_last_id"] == "1"
+
+    fake.add(listing(2, "Shri Ram Sweets", "Magicpin"))
+    stats = ListingEntityIndexer(fake).run()
+    # Only the new listing was read; it joined entity 1 through the persisted blocks
+    assert stats["rows"] == 1
+    assert fake.entity_of() == {1: 1, 2: 1}
+    assert fake.entities[1]["listing_count"] == 2
+
+
+def test_bridging_listing_merges_entities_and_moves_members():
+    fake = FakeListingDB([
+        listing(1, "Shree Ram Sweets", "JustDial", mobile="9876543210"),
+        listing(2, "Shree Ram Sweets", "GoogleMap", mobile="9123456780", city="Navsari"),
+        listing(3, "Shri Ram Sweets", "Asklaila", city="Navsari"),
+    ])
+    ListingEntityIndexer(fake).run()
+    assert fake.entity_of() == {1: 1, 2: 2, 3: 2}
+    assert set(fake.entities) == {1, 2}
+
+    # Shares a phone with entity 1 and a name block with entity 2
+    fake.add(listing(4, "Shree Ram Sweets", "Magicpin", mobile="9876543210", city="Navsari"))
+    ListingEntityIndexer(fake).run()
+
+    # Entity 2 is renamed into the surviving entity 1: its members move and its row is gone
+    assert fake.entity_of() == {1: 1, 2: 1, 3: 1, 4: 1}
+    assert set(fake.entities) == {1}
+    assert fake.entities[1]["listing_count"] == 4
+    assert fake.entities[1]["sources"] == "Asklaila,GoogleMap,JustDial,Magicpin"
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    app.register_blueprint(listing_master_bp, url_prefix="/api")
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=[ListingMaster.__table__, ListingEntity.__table__])
+        db.session.add_all([
+            ListingMaster(id=1, business_name="Shree Ram Sweets", category="Sweets", source="JustDial"),
+            ListingMaster(id=2, business_name="Shree Ram Sweets", category="Sweets", source="GoogleMap"),
+            ListingMaster(id=3, business_name="City Hospital", category="Hospital", source="Asklaila"),
+        ])
+        db.session.commit()
+    return app
+
+
+def test_listing_master_falls_back_to_live_aggregation_until_indexed():
+    app = make_app()
+    client = app.test_client()
+
+    live = client.get("/api/listing-master").get_json()
+    assert live[0]["business_name"] == "Shree Ram Sweets"
+    assert live[0]["total_listings"] == 2
+    assert "entity_id" not in live[0]
+
+    with app.app_context():
+        db.session.add(ListingEntity(entity_id=1, business_name="Shree Ram Sweets", name_key="shree ram sweets",
+                                     listing_count=2, source_count=2, sources="GoogleMap,JustDial"))
+        db.session.commit()
+    indexed = client.get("/api/listing-master?search=Shree").get_json()
+    assert [row["entity_id"] for row in indexed] == [1]
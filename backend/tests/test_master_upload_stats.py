@@ -0,0 +1,23 @@
+from services.master_uploader import merge_upload_stats, _upload_stats, _is_valid_city, HyperLogLog
+
+
+def part_stats(cities, inserted):
+    sketches = {name: HyperLogLog(14) for name in ("cities", "areas", "categories")}
+    sketches["cities"].update(cities)
+    return _upload_stats(inserted, inserted, sketches, 0, 1, 0, len(cities), 0)
+
+
+def test_parts_merge_counters_and_distinct_cities():
+    merged = merge_upload_stats([part_stats(["Pune", "Surat"], 10), part_stats(["Surat", "Indore"], 5)])
+    assert merged["inserted"] == 15
+    assert merged["missing_email"] == 2
+    assert merged["total_cities"] == 3
+    assert merged["total_areas"] == 0
+
+
+def test_city_lookup_is_a_sorted_membership_probe():
+    cities = ("ahmedabad", "pune", "surat")
+    assert _is_valid_city(cities, "pune")
+    assert not _is_valid_city(cities, "indore")
+    assert not _is_valid_city(cities, "zzz")
+    assert not _is_valid_city((), "pune")
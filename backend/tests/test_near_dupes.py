@@ -0,0 +1,44 @@
+from model.near_dupes import blocking_keys, score_pair, find_matches, assign_clusters
+from utils.similarity import jaro_winkler, token_set_ratio, geohash
+
+
+def test_similarity_primitives():
+    assert round(jaro_winkler("martha", "marhta"), 4) == 0.9611
+    assert jaro_winkler("", "x") == 0.0
+    assert token_set_ratio("Cafe Coffee Day", "coffee day cafe") == 1.0
+    assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash(None, 10) is None
+
+
+def test_blocking_keys():
+    row = {"name": "Shree Ram Sweets", "city": "Surat", "phone_number": "+91 98765 43210"}
+    assert blocking_keys(row) == ["p:9876543210", "n:shr|surat"]
+    assert blocking_keys({"name": "AB", "city": "", "phone_number": "123"}) == []
+
+
+def test_scoring_needs_a_shared_phone_or_place():
+    a = {"name": "Shree Ram Sweets", "city": "Surat", "address": "Ring Road, Surat", "phone_number": "9876543210"}
+    typo = {**a, "name": "Shri Ram Sweets", "phone_number": ""}
+    elsewhere = {**typo, "city": "Pune"}
+    assert score_pair(a, {**a, "name": "Shree Ram Sweet"})[1] == "phone+name"
+    assert score_pair(a, typo)[0] >= 0.9
+    assert score_pair(a, elsewhere) == (0.0, None)
+
+
+def test_matches_within_blocks_and_cluster_merge():
+    old = {1: {"id": 1, "name": "Shree Ram Sweets", "city": "Surat", "address": "Ring Road", "phone_number": "9876543210"}}
+    new = {
+        5: {"id": 5, "name": "Shree Ram Sweets", "city": "Surat", "address": "Ring Rd", "phone_number": "09876543210"},
+        6: {"id": 6, "name": "Shri Ram Sweets", "city": "Surat", "address": "Ring Road", "phone_number": ""},
+        7: {"id": 7, "name": "Totally Different", "city": "Surat", "address": "Ring Road", "phone_number": ""},
+    }
+    members = {"p:9876543210": [1], "n:shr|surat": [1]}
+    matches = find_matches(new, old, members, threshold=0.9)
+    pairs = {(a, b) for a, b, _, _ in matches}
+    assert (5, 1) in pairs and (6, 1) in pairs
+    assert not any(7 in p for p in pairs)
+
+    # Row 1 already sat in cluster 1 with row 3; a new match links cluster 2 in: merged to the lowest id
+    assignments, renames = assign_clusters(matches + [(6, 2, 0.95, "name+address")], {1: 1, 3: 1, 2: 2})
+    assert set(assignments.values()) == {1}
+    assert renames == {2: 1}
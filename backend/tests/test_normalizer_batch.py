@@ -0,0 +1,90 @@
+import random
+from model.normalizer import UniversalNormalizer
+
+VALUES = [
+    None, "", "  ", "nan", "None", "NaT", 0, 7, 4.5, float("nan"), "12 reviews", "4.3 stars",
+    "Honey Bee Digital", "  હનીબી   ડિજિટલ ", "ＡＢＣ Cafe", "https://www.Example.com/", "www.x.in",
+    "+91 70854 85781", "07085485781", "Ahmedabad Gujarat", "Puri Odisha", "Pondy Pondicherry",
+    "gj", "Tamil Nadu", "unknown", "Cafe\tand\nBar", "2024-02-26T10:00:00.000Z",
+]
+
+HEADERS = [
+    ["name", "address", "phone", "city", "state", "category", "rating", "reviews", "website", "area"],
+    [" Business Name ", "Full Address", "Mobile", "TOWN", "Province", "Type", "Avg Rating", "Total Reviews", "URL"],
+    ["નામ", "સરનામું", "ફોન", "શહેર", "રાજ્ય", "શ્રેણી", "subcategory", "Name"],
+    ["id", "name", "address", "website", "phone_number", "reviews_count", "reviews_average",
+     "category", "subcategory", "city", "state", "area", "created_at"],
+]
+
+EXTRA = {
+    "drive_file_id": "f1", "drive_file_name": "a.csv", "drive_folder_id": "d1",
+    "drive_folder_name": "Cafe", "drive_file_path": "ROOT/Cafe", "drive_uploaded_time": "2024-01-01T00:00:00Z",
+}
+
+
+def random_rows(header, n, rnd):
+    return [{h: rnd.choice(VALUES) for h in header} for _ in range(n)]
+
+
+def test_normalize_batch_matches_per_row():
+    rnd = random.Random(7)
+    for header in HEADERS:
+        rows = random_rows(header, 300, rnd)
+        raw = UniversalNormalizer.normalize_batch(rows, extra=EXTRA)
+        assert raw == [UniversalNormalizer.normalize_row_raw({**r, **EXTRA}) for r in rows]
+        full = UniversalNormalizer.normalize_batch(rows, full=True)
+        expected = [UniversalNormalizer.normalize_row_full(dict(r)) for r in rows]
+        assert repr(full) == repr(expected)
+
+
+def test_normalize_batch_mixed_layouts_keep_order():
+    rnd = random.Random(11)
+    rows = random_rows(HEADERS[0], 5, rnd) + random_rows(HEADERS[1], 5, rnd)
+    rnd.shuffle(rows)
+    assert UniversalNormalizer.normalize_batch(rows, full=True) == \
+        [UniversalNormalizer.normalize_row_full(r) for r in rows]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def expire(self, key, ttl):
+        pass
+
+
+def test_column_plan_cache_shared_across_workers():
+    from utils.column_plan_cache import ColumnPlanCache
+    shared = FakeRedis()
+    calls = []
+
+    def resolver(keys):
+        calls.append(keys)
+        return UniversalNormalizer.resolve_column_plan(keys)
+
+    worker_a = ColumnPlanCache(resolver, shared, max_entries=1)
+    worker_b = ColumnPlanCache(resolver, shared, max_entries=1)
+    rows = random_rows(HEADERS[1], 20, random.Random(3))
+    expected = UniversalNormalizer.normalize_batch(rows, extra=EXTRA)
+
+    try:
+        UniversalNormalizer.plan_cache = worker_a
+        assert UniversalNormalizer.normalize_batch(rows, extra=EXTRA) == expected
+        assert UniversalNormalizer.normalize_batch(rows, extra=EXTRA) == expected
+        UniversalNormalizer.plan_cache = worker_b
+        assert UniversalNormalizer.normalize_batch(rows, extra=EXTRA) == expected
+    finally:
+        UniversalNormalizer.plan_cache = None
+
+    assert len(calls) == 1
+    assert (worker_a.hits, worker_a.misses, worker_b.hits, worker_b.misses) == (1, 1, 1, 0)
+
+    # LRU eviction: a second layout pushes the first out of the local tier (Redis still has it)
+    worker_a.get(("other",))
+    assert tuple(HEADERS[1]) + tuple(EXTRA) not in worker_a._plans
@@ -0,0 +1,20 @@
+from model.raw_dedupe import plan_chunk, raw_row_signature
+
+
+def test_signature_ignores_case_and_padding_only():
+    row = {"name": "Cafe One", "address": "1 Main Rd", "city": "Pune", "reviews_count": 3}
+    assert raw_row_signature(row) == raw_row_signature({**row, "name": "  cafe one "})
+    assert raw_row_signature(row) != raw_row_signature({**row, "reviews_count": 4})
+
+
+def test_in_chunk_duplicates_keep_lowest_id():
+    to_sign, to_delete = plan_chunk({10: "a", 12: "a", 11: "b", 15: "a"}, {})
+    assert to_sign == {10: "a", 11: "b"}
+    assert to_delete == [12, 15]
+
+
+def test_signed_rows_win_only_when_older():
+    # "a" is already owned by an older signed row; "b" by a newer one, which goes instead
+    to_sign, to_delete = plan_chunk({10: "a", 11: "b"}, {"a": 3, "b": 99})
+    assert to_sign == {11: "b"}
+    assert to_delete == [10, 99]
@@ -0,0 +1,74 @@
+from flask import Flask, jsonify, request
+
+from utils.response_cache import cached_response, invalidate_tags
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        pass
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+
+    def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+def make_app(redis_client):
+    app = Flask(__name__)
+    calls = []
+
+    @app.route("/summary")
+    @cached_response("summary_table", redis_factory=lambda: redis_client)
+    def summary():
+        calls.append(request.args.get("state"))
+        return jsonify({"status": "success", "n": len(calls)})
+
+    @app.route("/broken")
+    @cached_response("summary_table", redis_factory=lambda: redis_client)
+    def broken():
+        calls.append("broken")
+        return jsonify({"status": "error"}), 500
+
+    return app, calls
+
+
+def test_hits_until_a_tag_is_invalidated():
+    r = FakeRedis()
+    app, calls = make_app(r)
+    client = app.test_client()
+
+    first = client.get("/summary?state=Goa")
+    assert first.headers["X-Cache"] == "MISS"
+    again = client.get("/summary?state=Goa")
+    assert again.headers["X-Cache"] == "HIT" and again.get_json() == first.get_json()
+    # Query args are part of the key
+    client.get("/summary?state=Kerala")
+    assert calls == ["Goa", "Kerala"]
+
+    invalidate_tags(r, "other_table")
+    client.get("/summary?state=Goa")
+    assert len(calls) == 2
+
+    invalidate_tags(r, "summary_table")
+    assert client.get("/summary?state=Goa").get_json()["n"] == 3
+
+
+def test_errors_are_not_cached():
+    app, calls = make_app(FakeRedis())
+    client = app.test_client()
+    client.get("/broken")
+    client.get("/broken")
+    assert calls == ["broken", "broken"]
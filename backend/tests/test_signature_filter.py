@@ -0,0 +1,81 @@
+import hashlib
+
+from utils.bloom_filter import BloomFilter
+from model.signature_filter import SignatureFilter
+
+
+def sig(i):
+    return hashlib.md5(f"row-{i}".encode()).hexdigest()
+
+
+def test_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(10000, 0.01)
+    bloom.update(sig(i) for i in range(10000))
+    assert all(sig(i) in bloom for i in range(10000))
+    false_positives = sum(sig(i) in bloom for i in range(10000, 30000))
+    assert false_positives / 20000 < 0.02
+    assert 0.005 < bloom.estimated_error_rate() < 0.02
+
+
+def test_snapshot_round_trip(tmp_path):
+    bloom = BloomFilter(1000, 0.001)
+    bloom.update(sig(i) for i in range(500))
+    path = str(tmp_path / "bloom.bin")
+    bloom.save(path, watermark=500)
+    loaded, meta = BloomFilter.load(path)
+    assert meta == {"watermark": 500}
+    assert loaded.count == 500 and loaded.num_hashes == bloom.num_hashes
+    assert all(sig(i) in loaded for i in range(500))
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConn:
+    """raw_clean_google_map_data as (id, signature_hash) rows."""
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, clause, params):
+        after, lim = params["after"], params["lim"]
+        return FakeResult([r for r in self.rows if r[0] > after][:lim])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeEngine:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def connect(self):
+        return self.conn
+
+
+def test_warm_catch_up_and_snapshot_resume(tmp_path):
+    conn = FakeConn([(i, sig(i)) for i in range(1, 101)])
+    path = str(tmp_path / "bloom.bin")
+    f = SignatureFilter(FakeEngine(conn), capacity=1000, error_rate=0.001, snapshot_path=path,
+                        overlap=10, scan_batch=30)
+    assert f.probable({sig(1), "new"}) == {sig(1), "new"}  # not ready: everything goes to MySQL
+    f.warm()
+    assert f.ready and f.watermark == 100
+    assert f.probable({sig(5), sig(500)}) == {sig(5)}
+
+    # Another writer inserts rows; the next catch-up folds them in
+    conn.rows.append((101, sig(500)))
+    f.catch_up(conn)
+    assert f.watermark == 101 and f.probable({sig(500)}) == {sig(500)}
+
+    f.maybe_snapshot(force=True)
+    resumed = SignatureFilter(FakeEngine(conn), capacity=1000, error_rate=0.001, snapshot_path=path)
+    resumed.warm()
+    assert resumed.watermark == 101 and sig(500) in resumed.bloom
@@ -0,0 +1,46 @@
+from utils.stats_deltas import aggregate_new_rows, merge_stats_deltas
+
+
+def row(sig, state="Gujarat", category="Cafe", file_id="f1"):
+    return {"row_signature": sig, "state": state, "category": category, "drive_file_id": file_id}
+
+
+def test_only_rows_insert_ignore_keeps_are_counted():
+    batch = [row("a"), row("a"), row("b"), row("c", state=None), row("d", file_id="f2")]
+    deltas = aggregate_new_rows(batch, existing={"b"})
+    by_key = {(d["state"], d["category"], d["drive_file_id"]): d["delta"] for d in deltas}
+    assert by_key == {("Gujarat", "Cafe", "f1"): 1, ("", "Cafe", "f1"): 1, ("Gujarat", "Cafe", "f2"): 1}
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConn:
+    def __init__(self, staged):
+        self.staged = staged
+        self.calls = []
+
+    def execute(self, clause, params=None):
+        sql = " ".join(str(clause).split())
+        self.calls.append((sql, params))
+        if sql.startswith("SELECT id"):
+            return FakeResult(self.staged)
+        return FakeResult([])
+
+
+def test_merge_sums_per_key_and_deletes_the_merged_range():
+    staged = [(1, "Gujarat", "Cafe", "f1", 5), (2, "Gujarat", "Cafe", "f2", 3), (4, "Kerala", "Spa", "f2", 2)]
+    conn = FakeConn(staged)
+    assert merge_stats_deltas(conn) == 3
+    state_cat = next(p for sql, p in conn.calls if sql.startswith("INSERT INTO state_category_summary_v5"))
+    files = next(p for sql, p in conn.calls if sql.startswith("INSERT INTO file_record_summary"))
+    delete = next(p for sql, p in conn.calls if sql.startswith("DELETE FROM stats_delta_staging"))
+    assert sorted((p["state"], p["delta"]) for p in state_cat) == [("Gujarat", 8), ("Kerala", 2)]
+    assert sorted((p["file_id"], p["delta"]) for p in files) == [("f1", 5), ("f2", 5)]
+    assert delete == {"lo": 1, "hi": 4}
+    assert conn.calls[-1][0].startswith("INSERT INTO dashboard_stats_summary_v5")
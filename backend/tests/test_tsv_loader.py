@@ -0,0 +1,56 @@
+import io
+import os
+import re
+import types
+
+from utils.tsv_loader import tsv_field, write_tsv, load_data_infile
+
+MYSQL_UNESCAPES = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r", "\\0": "\0"}
+
+
+def mysql_fields(line):
+    """Splits one LOAD DATA line the way the server does (FIELDS ESCAPED BY '\\')."""
+    return [None if f == "\\N" else re.sub(r"\\.", lambda m: MYSQL_UNESCAPES[m.group(0)], f)
+            for f in line.split("\t")]
+
+
+def test_fields_escape_separators_and_backslashes():
+    assert tsv_field("a\tb") == "a\\tb"
+    assert tsv_field("line1\nline2\r\n") == "line1\\nline2\\r\\n"
+    assert tsv_field("C:\\temp\\new") == "C:\\\\temp\\\\new"
+    assert tsv_field("nul\0byte") == "nul\\0byte"
+    assert tsv_field(None) == "\\N"
+    # The text "\N" is data, not NULL
+    assert tsv_field("\\N") == "\\\\N"
+    assert tsv_field(0.1) == "0.1" and tsv_field(7) == "7"
+
+
+def test_rows_survive_the_round_trip_through_load_data_parsing():
+    rows = [
+        {"name": "Cafe\tOne", "address": "12 MG Road\nSurat", "note": "back\\slash", "phone": None},
+        {"name": "\\N", "address": "", "note": "tab at end\t", "phone": "98765"},
+    ]
+    columns = ["name", "address", "note", "phone"]
+    fh = io.StringIO()
+    write_tsv(fh, rows, columns)
+    lines = fh.getvalue().split("\n")
+    assert lines[-1] == "" and len(lines) == 3  # one physical line per row
+    assert [dict(zip(columns, mysql_fields(line))) for line in lines[:-1]] == rows
+
+
+def test_load_data_infile_streams_the_escaped_file_and_removes_it():
+    seen = {}
+
+    class Conn:
+        def execute(self, clause, params):
+            seen["sql"] = clause.text
+            with open(params["path"], encoding="utf-8") as fh:
+                seen["data"] = fh.read()
+            seen["path"] = params["path"]
+            return types.SimpleNamespace(rowcount=1)
+
+    assert load_data_infile(Conn(), "t", ["a", "b"], [{"a": "x\ty", "b": None}]) == 1
+    assert seen["data"] == "x\\ty\t\\N\n"
+    assert "ESCAPED BY '\\\\'" in seen["sql"] and "(a, b)" in seen["sql"]
+    assert not os.path.exists(seen["path"])
+    assert load_data_infile(Conn(), "t", ["a"], []) == 0
@@ -0,0 +1,195 @@
+import sys
+import types
+
+import pytest
+from celery import Celery, signature
+
+# The real celery_app patches gevent and loads the Flask config; the tasks only need an app
+sys.modules.setdefault("celery_app", types.SimpleNamespace(celery=Celery("tests")))
+
+import tasks.upload_fanout as fanout  # noqa: E402
+import tasks.upload_master_task as master  # noqa: E402
+from services.master_uploader import HyperLogLog, _upload_stats  # noqa: E402
+
+
+def eager_chord(header):
+    """Runs the chord header in-process, then the body; a failing part triggers the body's errbacks."""
+    header = list(header)
+
+    def apply(body):
+        try:
+            results = [sig() for sig in header]
+        except Exception as exc:
+            for errback in body.options.get("link_error", []):
+                signature(errback)(None, exc, None)
+            return types.SimpleNamespace(id="chord-failed")
+        body(results)
+        return types.SimpleNamespace(id="chord-1")
+    return apply
+
+
+class IndexCalls:
+    def __init__(self):
+        self.calls = []
+
+    def set_spec_indexes(self, spec, present, load_id):
+        self.calls.append((spec.table, present, load_id))
+
+
+@pytest.fixture
+def csv_upload(tmp_path, monkeypatch):
+    paths = []
+    for name in ("a.csv", "b.csv", "c.csv"):
+        path = tmp_path / name
+        path.write_text("id,name\n1,x\n2,y\n")
+        paths.append(str(path))
+    indexes = IndexCalls()
+    spec = types.SimpleNamespace(table="justdial", indexes=["idx_city"])
+    monkeypatch.setattr(fanout, "UPLOAD_FANOUT", True)
+    monkeypatch.setattr(fanout, "chord", eager_chord)
+    monkeypatch.setattr(fanout, "load_spec", lambda ref: spec)
+    monkeypatch.setattr(fanout, "set_spec_indexes", indexes.set_spec_indexes)
+    return paths, indexes
+
+
+def test_csv_fan_out_sums_parts_and_ends_the_same_load(csv_upload, monkeypatch):
+    paths, indexes = csv_upload
+    loaded = []
+
+    def upload_part(spec, parts, manage_indexes=True, load_id=None):
+        assert manage_indexes is False
+        loaded.append(load_id)
+        return 2
+
+    monkeypatch.setattr(fanout, "upload_csv_files", upload_part)
+    finished = []
+    real_finish = fanout.finish_csv_upload.run
+    monkeypatch.setattr(fanout.finish_csv_upload, "run", lambda *a: finished.append(real_finish(*a)))
+
+    started = fanout.fan_out_csv_upload("specs:JUSTDIAL", paths)
+    assert started == {"parts": 3, "chord_id": "chord-1"}
+    assert finished == [6]
+    (_, dropped, load_id), (_, restored, end_id) = indexes.calls
+    assert (dropped, restored) == (False, True)
+    assert end_id == load_id
+    # Every part renews the lease of the load that dropped the indexes
+    assert loaded == [load_id] * 3
+    # Files go once the load is complete
+    assert not any(fanout.os.path.exists(p) for p in paths)
+
+
+def test_failed_csv_part_restores_indexes_and_keeps_files(csv_upload, monkeypatch):
+    paths, indexes = csv_upload
+
+    def upload_part(spec, parts, manage_indexes=True, load_id=None):
+        raise RuntimeError("Deadlock found")
+
+    monkeypatch.setattr(fanout, "upload_csv_files", upload_part)
+    fanout.fan_out_csv_upload("specs:JUSTDIAL", paths)
+    (_, dropped, load_id), (_, restored, end_id) = indexes.calls
+    assert (dropped, restored, end_id) == (False, True, load_id)
+    assert all(fanout.os.path.exists(p) for p in paths)
+
+
+def broken_chord(header):
+    def apply(body):
+        raise ConnectionError("Error 111 connecting to redis:6379")
+    return apply
+
+
+def test_csv_chord_dispatch_failure_restores_indexes(csv_upload, monkeypatch):
+    paths, indexes = csv_upload
+    monkeypatch.setattr(fanout, "chord", broken_chord)
+    with pytest.raises(ConnectionError):
+        fanout.fan_out_csv_upload("specs:JUSTDIAL", paths)
+    (_, dropped, load_id), (_, restored, end_id) = indexes.calls
+    assert (dropped, restored, end_id) == (False, True, load_id)
+    assert all(fanout.os.path.exists(p) for p in paths)
+
+
+class FakeQuery:
+    def __init__(self, session):
+        self.session = session
+
+    def filter_by(self, task_id):
+        return self
+
+    def first(self):
+        return self.session.report
+
+
+class FakeSession:
+    """One UploadReport row shared by the upload task, its reducer and its errback."""
+    report = None
+
+    def query(self, model):
+        return FakeQuery(self)
+
+    def add(self, report):
+        FakeSession.report = report
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def connection(self):
+        return types.SimpleNamespace(connection=types.SimpleNamespace(cursor=lambda: types.SimpleNamespace(close=lambda: None)))
+
+
+def part_stats(cities, inserted):
+    sketches = {name: HyperLogLog(14) for name in ("cities", "areas", "categories")}
+    sketches["cities"].update(cities)
+    return _upload_stats(inserted, inserted, sketches, 0, 0, 0, len(cities), 0)
+
+
+@pytest.fixture
+def master_upload(monkeypatch):
+    FakeSession.report = None
+    index_calls = []
+    monkeypatch.setattr(master, "get_db_session", FakeSession)
+    monkeypatch.setattr(master, "chord", eager_chord)
+    monkeypatch.setattr(master, "plan_upload_parts", lambda paths: [{"path": p} for p in paths])
+    monkeypatch.setattr(master, "set_master_indexes", lambda session, present, load_id:
+                        index_calls.append(("recreate" if present else "drop", load_id)))
+    return index_calls
+
+
+def test_master_fan_out_merges_part_stats_into_the_report(master_upload, monkeypatch):
+    stats_by_part = {"a.csv": part_stats(["Pune", "Surat"], 10), "b.csv": part_stats(["Surat"], 5)}
+    monkeypatch.setattr(master, "upload_master_csv",
+                        lambda parts, session, report, manage_indexes=True, load_id=None: stats_by_part[parts[0]["path"]])
+    merged_inputs = []
+    real_merge = master.merge_upload_stats
+    monkeypatch.setattr(master, "merge_upload_stats", lambda parts: merged_inputs.append(parts) or real_merge(parts))
+
+    result = master.process_master_upload_task.apply(args=(["a.csv", "b.csv"],), task_id="task-1").get()
+    assert result == {"task_id": "task-1", "status": "PROCESSING", "parts": 2}
+    assert merged_inputs == [[stats_by_part["a.csv"], stats_by_part["b.csv"]]]
+    assert master_upload == [("drop", "task-1"), ("recreate", "task-1")]
+    report = FakeSession.report
+    assert report.status == "COMPLETED"
+    assert report.inserted == 15 and report.total_cities == 2
+
+
+def test_failed_master_part_restores_indexes_and_fails_the_report(master_upload, monkeypatch):
+    def upload_part(parts, session, report, manage_indexes=True, load_id=None):
+        raise RuntimeError("Lock wait timeout exceeded")
+
+    monkeypatch.setattr(master, "upload_master_csv", upload_part)
+    master.process_master_upload_task.apply(args=(["a.csv", "b.csv"],), task_id="task-2").get()
+    assert master_upload == [("drop", "task-2"), ("recreate", "task-2")]
+    assert FakeSession.report.status == "FAILED"
+    assert "Lock wait timeout" in FakeSession.report.stats["error"]
+
+
+def test_master_chord_dispatch_failure_restores_indexes(master_upload, monkeypatch):
+    monkeypatch.setattr(master, "chord", broken_chord)
+    with pytest.raises(ConnectionError):
+        master.process_master_upload_task.apply(args=(["a.csv", "b.csv"],), task_id="task-3").get()
+    assert master_upload == [("drop", "task-3"), ("recreate", "task-3")]
+    assert FakeSession.report.status == "FAILED"
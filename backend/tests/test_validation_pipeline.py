@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from model.validation_pipeline import ValidationPipeline
+
+
+class FakeProcessor:
+    """Raw ids 1..total in batches of `batch`; write_batch fails once on `fail_at`."""
+    def __init__(self, total=23, batch=5, fail_at=None):
+        self.shutdown_event = threading.Event()
+        self.total, self.batch, self.fail_at = total, batch, fail_at
+        self.written = []
+
+    def read_raw_batch(self, last_id, upper_id=None):
+        return [{"id": i} for i in range(last_id + 1, min(last_id + self.batch, self.total) + 1)]
+
+    def normalise_raw_batch(self, raw_rows, last_id):
+        return raw_rows, set(), max([last_id] + [r["id"] for r in raw_rows])
+
+    def write_batch(self, batch_rows, signatures, current_max_id):
+        if current_max_id == self.fail_at:
+            self.fail_at = None
+            raise RuntimeError("deadlock")
+        self.written.extend(r["id"] for r in batch_rows)
+        return {"total": len(batch_rows)}
+
+
+def run_until_caught_up(processor, last_id, on_batch):
+    def wrapped(current_max_id, summary):
+        on_batch(current_max_id, summary)
+        if current_max_id >= processor.total:
+            processor.shutdown_event.set()
+    return ValidationPipeline(processor, queue_depth=2, normalise_workers=3, idle_seconds=0.1).run(last_id, wrapped)
+
+
+def test_batches_are_written_in_id_order():
+    processor = FakeProcessor()
+    committed = []
+    assert run_until_caught_up(processor, 0, lambda last, s: committed.append(last)) == 23
+    assert processor.written == list(range(1, 24))
+    assert committed == [5, 10, 15, 20, 23]
+
+
+def test_writer_error_surfaces_after_earlier_batches_and_resumes():
+    processor = FakeProcessor(fail_at=15)
+    committed = []
+    with pytest.raises(RuntimeError):
+        run_until_caught_up(processor, 0, lambda last, s: committed.append(last))
+    assert committed == [5, 10]  # prefetched batches past the failure are discarded
+
+    assert run_until_caught_up(processor, committed[-1], lambda last, s: committed.append(last)) == 23
+    assert processor.written == list(range(1, 24))
@@ -0,0 +1,201 @@
+import json
+import threading
+import types
+from contextlib import contextmanager
+
+import model.validation_shards as shards
+from model.robust_gdrive_etl_v2 import ValidationQualityProcessor
+from model.validation_shards import (
+    ValidationShardCoordinator, plan_ranges, resume_point, load_range_cursor, save_range_checkpoint,
+)
+
+
+def rng(start, end, done=False, updated=1000.0, cursor=None):
+    return {"start": start, "end": end, "done": done, "updated": updated,
+            "cursor": start if cursor is None else cursor}
+
+
+def test_fills_shards_up_to_max_id():
+    watermark, finished, stale, new = plan_ranges(0, 250, [], shards=4, range_size=100,
+                                                  lease_seconds=900, now=1000)
+    assert (watermark, finished, stale) == (0, [], [])
+    assert new == [(0, 100), (100, 200), (200, 250)]
+
+
+def test_watermark_advances_only_over_contiguous_done_prefix():
+    ranges = [rng(0, 100, done=True), rng(100, 200), rng(200, 300, done=True)]
+    watermark, finished, stale, new = plan_ranges(0, 300, ranges, shards=2, range_size=100,
+                                                  lease_seconds=900, now=1000)
+    assert watermark == 100
+    assert [r["start"] for r in finished] == [0]
+    assert new == []  # nothing past max_id yet
+
+    ranges[1]["done"] = True
+    watermark, finished, _, new = plan_ranges(100, 450, ranges[1:], shards=2, range_size=100,
+                                              lease_seconds=900, now=1000)
+    assert watermark == 300 and len(finished) == 2
+    assert new == [(300, 400), (400, 450)]
+
+
+def test_stale_ranges_are_redispatched_and_count_as_in_flight():
+    ranges = [rng(0, 100, updated=0, cursor=40), rng(100, 200, updated=950)]
+    _, _, stale, new = plan_ranges(0, 1000, ranges, shards=3, range_size=100,
+                                   lease_seconds=900, now=1000)
+    assert [(r["start"], r["cursor"]) for r in stale] == [(0, 40)]
+    assert new == [(200, 300)]
+
+
+def test_resume_point_walks_done_ranges_into_the_first_open_one():
+    ranges = [rng(100, 200, done=True), rng(200, 300, cursor=240), rng(300, 400, done=True)]
+    assert resume_point(100, ranges) == 240
+    assert resume_point(50, ranges) == 50  # gap before the first range
+    assert resume_point(500, ranges) == 500
+
+
+class FakeResult:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows[0][0]
+
+
+class FakeMetaEngine:
+    """etl_metadata as a dict, plus MAX(id) of the raw table."""
+
+    def __init__(self, max_id=0, meta=None):
+        self.max_id = max_id
+        self.meta = dict(meta or {})
+
+    @contextmanager
+    def connect(self):
+        yield self
+
+    begin = connect
+
+    def execute(self, clause, params=None):
+        sql = " ".join(clause.text.split())
+        if sql.startswith("SELECT COALESCE(MAX(id), 0)"):
+            return FakeResult([(self.max_id,)])
+        if sql.startswith("SELECT meta_key, meta_value FROM etl_metadata WHERE meta_key LIKE"):
+            prefix = params["prefix"].rstrip("%")
+            return FakeResult([(k, v) for k, v in self.meta.items() if k.startswith(prefix)])
+        if sql.startswith("SELECT meta_value FROM etl_metadata"):
+            key = params["key"] if params else "last_processed_id"
+            return FakeResult([(self.meta[key],)] if key in self.meta else [])
+        if sql.startswith("DELETE FROM etl_metadata"):
+            for key in params["keys"]:
+                self.meta.pop(key, None)
+        elif sql.startswith("INSERT INTO etl_metadata (meta_key, meta_value) VALUES ('last_processed_id'"):
+            self.meta["last_processed_id"] = params["val"]
+        elif sql.startswith("INSERT INTO etl_metadata"):
+            self.meta[params["key"]] = params["val"]
+        else:
+            raise AssertionError(f"Unexpected statement: {sql[:80]}")
+        return FakeResult()
+
+
+class FakeLeaderRedis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+
+class StubProcessor:
+    """The slice of ValidationQualityProcessor that process_range and the coordinator use."""
+
+    def __init__(self, engine, batch=25):
+        self.engine = engine
+        self.batch = batch
+        self.shutdown_event = threading.Event()
+        self.signature_filter = None
+        self.processed = []
+        self.logged = []
+
+    def get_last_processed_id(self):
+        return ValidationQualityProcessor.get_last_processed_id(self)
+
+    def process_batch(self, last_id, upper_id=None):
+        if last_id >= upper_id:
+            return last_id, None
+        hi = min(last_id + self.batch, upper_id)
+        self.processed.extend(range(last_id + 1, hi + 1))
+        return hi, {"total": hi - last_id}
+
+    def log_validation_batch(self, summary):
+        self.logged.append(summary)
+
+    def process_range(self, start, end, watermark, keep_alive=None):
+        return ValidationQualityProcessor.process_range(self, start, end, watermark, keep_alive)
+
+
+def make_coordinator(processor, redis_client, dispatched):
+    return ValidationShardCoordinator(processor, shards=2, range_size=100, lease_seconds=900,
+                                      dispatch=lambda *args: dispatched.append(args),
+                                      redis_factory=lambda: redis_client)
+
+
+def test_coordinator_claims_ranges_resumes_and_completes():
+    engine = FakeMetaEngine(max_id=250, meta={"last_processed_id": "0"})
+    processor = StubProcessor(engine)
+    redis_client, dispatched = FakeLeaderRedis(), []
+    leader = make_coordinator(processor, redis_client, dispatched)
+    standby = make_coordinator(processor, redis_client, [])
+
+    # Claiming: one leader, which checkpoints and dispatches `shards` ranges
+    assert leader.is_leader() and not standby.is_leader()
+    assert leader.step() == 2
+    assert dispatched == [(0, 100, 0), (100, 200, 0)]
+    assert load_range_cursor(engine, 0, 100) == 0
+
+    # A worker loses its lease after two batches: the range keeps its checkpoint...
+    leases = iter([True, False])
+    assert processor.process_range(0, 100, 0, keep_alive=lambda: next(leases)) is False
+    assert load_range_cursor(engine, 0, 100) == 50
+    assert all(summary["last_id"] == 0 for summary in processor.logged)
+    # ...and an unsharded restart resumes from it rather than from the logged watermark
+    assert processor.get_last_processed_id() == 50
+
+    # The next worker resumes at the checkpoint, not at the range start
+    processor.processed.clear()
+    assert processor.process_range(0, 100, 0, keep_alive=lambda: True) is True
+    assert processor.processed == list(range(51, 101))
+    assert json.loads(engine.meta["validation_range:0:100"])["done"] is True
+
+    # Completion: the done prefix advances the watermark, its checkpoint goes, a new range opens
+    dispatched.clear()
+    assert leader.step() == 1
+    assert engine.meta["last_processed_id"] == "100"
+    assert "validation_range:0:100" not in engine.meta
+    assert dispatched == [(200, 250, 100)]
+
+
+def test_stalled_range_is_redispatched_from_its_cursor(monkeypatch):
+    engine = FakeMetaEngine(max_id=100, meta={"last_processed_id": "0"})
+    with monkeypatch.context() as m:
+        # A worker checkpointed at id 30 long ago, then died
+        m.setattr(shards, "time", types.SimpleNamespace(time=lambda: 0.0))
+        save_range_checkpoint(engine, 0, 100, 30)
+    dispatched = []
+    leader = make_coordinator(StubProcessor(engine), FakeLeaderRedis(), dispatched)
+    assert leader.step() == 1
+    assert dispatched == [(0, 100, 0)]
+    state = json.loads(engine.meta["validation_range:0:100"])
+    assert state["cursor"] == 30 and state["updated"] > 0
@@ -0,0 +1,72 @@
+from datetime import date, datetime
+
+from utils.validation_snapshot import apply_clean_batch, inserted_rows, reconcile_validation_snapshot
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeConn:
+    def __init__(self, responses):
+        # (sql prefix, rows) pairs answered in order of appearance
+        self.responses = responses
+        self.calls = []
+
+    def execute(self, clause, params=None):
+        sql = " ".join(str(clause).split())
+        self.calls.append((sql, params))
+        for prefix, rows in self.responses:
+            if sql.startswith(prefix):
+                return FakeResult(rows)
+        return FakeResult([])
+
+    def params_for(self, prefix):
+        return next(p for sql, p in self.calls if sql.startswith(prefix))
+
+
+def clean_row(raw_id, status="VALID", state="Goa"):
+    return {"raw_id": raw_id, "val_status": status, "state": state, "processed_at": datetime(2026, 1, 5, 10)}
+
+
+def test_only_rows_the_insert_added_are_counted():
+    batch = [clean_row(1), clean_row(2), clean_row(3)]
+    # raw_id 1 was already there; raw_id 3 was skipped on the composite dedup index
+    conn = FakeConn([("SELECT raw_id", [(1,), (2,)])])
+    assert [r["raw_id"] for r in inserted_rows(conn, batch, preexisting={1})] == [2]
+
+
+def test_batch_counts_are_increments():
+    conn = FakeConn([])
+    apply_clean_batch(conn, [clean_row(1), clean_row(2, "MISSING"), clean_row(3, state=None)], last_id=40)
+    snap = conn.params_for("INSERT INTO validation_dashboard_snapshot")
+    assert (snap["clean"], snap["valid_count"], snap["missing_count"], snap["last_id"]) == (3, 2, 1, 40)
+    states = conn.params_for("INSERT INTO validation_state_snapshot")
+    assert sorted((p["state"], p["n"]) for p in states) == [("", 1), ("Goa", 2)]
+    assert conn.params_for("INSERT INTO validation_daily_snapshot") == [{"day": date(2026, 1, 5), "n": 3}]
+
+
+def test_reconcile_applies_only_the_drift():
+    conn = FakeConn([
+        ("SELECT clean_count, valid_count", [(10, 8, 1, 0, 1)]),
+        ("SELECT state, clean_count", [("Goa", 7), ("Kerala", 3)]),
+        ("SELECT day, clean_count", [(date(2026, 1, 5), 10)]),
+        ("SELECT COALESCE(state, '')", [
+            ("Goa", "VALID", date(2026, 1, 5), 8, 90),
+            ("Kerala", "MISSING", date(2026, 1, 5), 1, 95),
+            ("Kerala", "DUPLICATE", None, 3, 12),
+        ]),
+    ])
+    assert reconcile_validation_snapshot(conn) == 12
+    snap = conn.params_for("INSERT INTO validation_dashboard_snapshot")
+    assert (snap["clean"], snap["valid_count"], snap["duplicate_count"], snap["last_id"]) == (2, 0, 2, 95)
+    states = conn.params_for("INSERT INTO validation_state_snapshot")
+    assert sorted((p["state"], p["n"]) for p in states) == [("Goa", 1), ("Kerala", 1)]
+    assert conn.params_for("INSERT INTO validation_daily_snapshot") == [{"day": date(2026, 1, 5), "n": -1}]
@@ -0,0 +1,78 @@
+"""
+Plain bytearray Bloom filter with on-disk snapshots.
+Sized from (capacity, error_rate) with the usual m = -n ln p / (ln 2)^2 bits and
+k = m/n ln 2 hash functions; the k positions come from one 128-bit blake2b digest
+via double hashing (h1 + i*h2), so adding or probing costs one hash per item.
+"""
+import os
+import json
+import math
+import struct
+import hashlib
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001, num_bits=None, num_hashes=None):
+        self.capacity = int(capacity)
+        self.error_rate = float(error_rate)
+        self.num_bits = num_bits or max(8, math.ceil(-self.capacity * math.log(self.error_rate) / math.log(2) ** 2))
+        self.num_hashes = num_hashes or max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        h2 |= 1  # odd stride: never degenerates to a single position
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item):
+        bits = self.bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+    def estimated_error_rate(self):
+        """False-positive rate at the current fill: (1 - e^(-kn/m))^k."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, path, **meta):
+        """Writes the filter (plus caller metadata) atomically: temp file, then rename."""
+        header = json.dumps({
+            "capacity": self.capacity, "error_rate": self.error_rate, "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes, "count": self.count, "meta": meta,
+        }).encode('utf-8')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as fh:
+            fh.write(struct.pack('<I', len(header)))
+            fh.write(header)
+            fh.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Returns (filter, meta) from a snapshot written by save()."""
+        with open(path, 'rb') as fh:
+            (header_len,) = struct.unpack('<I', fh.read(4))
+            header = json.loads(fh.read(header_len).decode('utf-8'))
+            bloom = cls(header["capacity"], header["error_rate"], header["num_bits"], header["num_hashes"])
+            bits = fh.read()
+        if len(bits) != len(bloom.bits):
+            raise ValueError(f"Truncated Bloom filter snapshot: {path}")
+        bloom.bits = bytearray(bits)
+        bloom.count = header["count"]
+        return bloom, header.get("meta", {})
@@ -0,0 +1,137 @@
+"""
+Multi-row upsert writer for DB-API cursors (pymysql, mysql-connector).
+
+cursor.executemany() with an ON DUPLICATE KEY UPDATE statement is only rewritten into
+multi-row INSERTs by some drivers and versions; otherwise it is a round trip per row,
+and a rewrite that does happen is not sized, so wide tables can overflow
+max_allowed_packet. BulkWriter builds the statements itself:
+
+    INSERT INTO t (c1, c2) VALUES (%s, %s), (%s, %s), ... [ON DUPLICATE KEY UPDATE c2 = VALUES(c2)]
+
+packing as many rows as fit in `packet_fraction` of the server's max_allowed_packet
+(from the rows' encoded sizes; the slack covers escaping). Rows per statement are
+rounded to a multiple of ROW_STEP, so full statements of a table share one statement
+text, built once. Statements run on the caller's cursor and transaction: committing
+stays with the caller.
+"""
+import os
+import time
+import logging
+
+logger = logging.getLogger("BulkWriter")
+
+DEFAULT_MAX_PACKET = 4 * 1024 * 1024
+PACKET_FRACTION = float(os.getenv("BULK_WRITER_PACKET_FRACTION", "0.5"))
+MAX_ROWS_PER_STATEMENT = int(os.getenv("BULK_WRITER_MAX_ROWS", "5000"))
+ROW_STEP = 50
+MAX_CACHED_STATEMENTS = 32
+
+
+def value_size(value):
+    """Approximate bytes of one value in the statement (quotes and separator included)."""
+    if value is None:
+        return 5
+    if isinstance(value, str):
+        return len(value.encode('utf-8', errors='ignore')) + 4
+    if isinstance(value, bytes):
+        return len(value) + 4
+    return len(str(value)) + 2
+
+
+def row_size(row):
+    return sum(value_size(v) for v in row) + 4
+
+
+class BulkWriter:
+    def __init__(self, cursor, table, columns, update_columns=(), max_packet=None,
+                 packet_fraction=PACKET_FRACTION, max_rows=MAX_ROWS_PER_STATEMENT):
+        self.cursor = cursor
+        self.table = table
+        self.columns = list(columns)
+        self.prefix = f"INSERT INTO {table} ({', '.join(self.columns)}) VALUES "
+        self.row_placeholder = "(" + ", ".join(["%s"] * len(self.columns)) + ")"
+        self.suffix = ""
+        if update_columns:
+            self.suffix = " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in update_columns)
+        self.max_packet = max_packet or self._server_max_packet()
+        self.budget = max(int(self.max_packet * packet_fraction) - len(self.prefix) - len(self.suffix), 1)
+        self.max_rows = max(1, max_rows)
+        self._statements = {}
+        self.rows = 0
+        self.bytes = 0
+        self.statements = 0
+        self.seconds = 0.0
+
+    def _server_max_packet(self):
+        try:
+            self.cursor.execute("SELECT @@max_allowed_packet")
+            return int(self.cursor.fetchone()[0])
+        except Exception as e:
+            logger.warning(f"Could not read max_allowed_packet ({e}); assuming {DEFAULT_MAX_PACKET} bytes")
+            return DEFAULT_MAX_PACKET
+
+    def statement(self, row_count):
+        sql = self._statements.get(row_count)
+        if sql is None:
+            sql = self.prefix + ", ".join([self.row_placeholder] * row_count) + self.suffix
+            if len(self._statements) < MAX_CACHED_STATEMENTS:
+                self._statements[row_count] = sql
+        return sql
+
+    def rows_per_statement(self, sizes):
+        """Target group size for rows of these sizes: fills the budget on average, in ROW_STEP steps."""
+        average = sum(sizes) / len(sizes)
+        fit = int(self.budget // average)
+        if fit >= ROW_STEP:
+            fit -= fit % ROW_STEP
+        return max(1, min(fit, self.max_rows))
+
+    def pack(self, rows):
+        """Splits rows into [(group, estimated_bytes)]; a group is cut early when its rows outgrow the budget."""
+        sizes = [row_size(row) for row in rows]
+        target = self.rows_per_statement(sizes)
+        groups = []
+        start, total = 0, 0
+        for i, size in enumerate(sizes):
+            if i > start and (i - start >= target or total + size > self.budget):
+                groups.append((rows[start:i], total))
+                start, total = i, 0
+            total += size
+        groups.append((rows[start:], total))
+        return groups
+
+    def write(self, rows, cursor=None):
+        """
+        Writes rows (sequences in `columns` order) on `cursor` (default: the writer's).
+        Returns the number of rows sent.
+        """
+        if not rows:
+            return 0
+        cursor = cursor or self.cursor
+        start = time.time()
+        for group, size in self.pack(list(rows)):
+            cursor.execute(self.statement(len(group)), [v for row in group for v in row])
+            self.statements += 1
+            self.bytes += size + len(self.prefix) + len(self.suffix)
+        self.rows += len(rows)
+        self.seconds += time.time() - start
+        return len(rows)
+
+    def stats(self):
+        seconds = self.seconds or 1e-9
+        return {
+            "table": self.table,
+            "rows": self.rows,
+            "statements": self.statements,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "rows_per_sec": round(self.rows / seconds),
+            "bytes_per_sec": round(self.bytes / seconds),
+        }
+
+    def log_summary(self):
+        s = self.stats()
+        logger.info(f"{s['table']}: {s['rows']:,} rows in {s['statements']:,} statements, "
+                    f"{s['bytes'] / 1e6:.1f} MB in {s['seconds']}s "
+                    f"({s['rows_per_sec']:,} rows/s, {s['bytes_per_sec'] / 1e6:.2f} MB/s)")
+        return s
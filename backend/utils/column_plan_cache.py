@@ -0,0 +1,100 @@
+"""
+Column-plan cache for CSV header layouts.
+A "column plan" maps each canonical field (name, city, ...) to the actual CSV
+header that UniversalNormalizer.get_fuzzy would resolve it to. The Drive corpus
+has only a few dozen distinct layouts, so plans are cached per header tuple:
+an in-process LRU in front of Redis, which every Celery worker shares.
+"""
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from utils.metrics import column_plan_hits, column_plan_misses
+
+logger = logging.getLogger("ColumnPlanCache")
+
+
+class ColumnPlanCache:
+    """
+    LRU cache of column plans keyed by header tuple, backed by Redis.
+    Redis entries carry a TTL that is refreshed on every hit, so layouts that
+    stop appearing age out. Redis errors degrade to the local LRU only.
+    """
+
+    def __init__(self, resolver, redis_client=None, max_entries=256, namespace="colplan",
+                 version="", ttl=30 * 24 * 3600, retry_after=60):
+        self.resolver = resolver
+        self.redis = redis_client
+        self.max_entries = max_entries
+        self.prefix = f"{namespace}:{version}:" if version else f"{namespace}:"
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _redis_key(self, header):
+        payload = json.dumps(list(header), ensure_ascii=False)
+        return self.prefix + hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+    def _redis_available(self):
+        return self.redis is not None and time.time() >= self._redis_down_until
+
+    def _redis_failed(self, e):
+        # Back off instead of paying a socket timeout for every batch
+        self._redis_down_until = time.time() + self.retry_after
+        logger.warning(f"Column plan cache: Redis unavailable, using local LRU only: {e}")
+
+    def _remember(self, header, plan):
+        with self._lock:
+            self._plans[header] = plan
+            self._plans.move_to_end(header)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+
+    def get(self, header):
+        """Returns the column plan for a header tuple, resolving (and publishing) it on a miss."""
+        header = tuple(header)
+        with self._lock:
+            plan = self._plans.get(header)
+            if plan is not None:
+                self._plans.move_to_end(header)
+        if plan is not None:
+            self.hits += 1
+            column_plan_hits.labels(tier="local").inc()
+            return plan
+
+        if self._redis_available():
+            try:
+                key = self._redis_key(header)
+                raw = self.redis.get(key)
+                if raw:
+                    plan = json.loads(raw)
+                    self.redis.expire(key, self.ttl)
+                    self._remember(header, plan)
+                    self.hits += 1
+                    column_plan_hits.labels(tier="redis").inc()
+                    return plan
+            except Exception as e:
+                self._redis_failed(e)
+
+        plan = self.resolver(header)
+        self.misses += 1
+        column_plan_misses.inc()
+        self._remember(header, plan)
+
+        if self._redis_available():
+            try:
+                self.redis.set(self._redis_key(header), json.dumps(plan, ensure_ascii=False), ex=self.ttl)
+            except Exception as e:
+                self._redis_failed(e)
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
@@ -1,4 +1,4 @@
-def create_non_essential_indexes(cursor,tableName,indexes):
+def create_non_essential_indexes(cursor,tableName,indexes,online=False):
     cursor.execute("""
         SELECT index_name
         FROM information_schema.statistics
@@ -8,7 +8,19 @@ def create_non_essential_indexes(cursor,tableName,indexes):
 
     existing_indexes = {row[0] for row in cursor.fetchall()}
 
+    created = []
     for index in indexes:
         idx_name = f"idx_{index}"
         if idx_name not in existing_indexes:
-            cursor.execute(f"CREATE INDEX {idx_name} ON {tableName}({index})")
\ No newline at end of file
+            sql = f"CREATE INDEX {idx_name} ON {tableName}({index})"
+            if online:
+                # Builds without blocking reads/writes of the table (InnoDB online DDL)
+                try:
+                    cursor.execute(sql + " ALGORITHM=INPLACE LOCK=NONE")
+                    created.append(idx_name)
+                    continue
+                except Exception as e:
+                    print(f"⚠️ Online build of {idx_name} refused ({e}); retrying with default locking")
+            cursor.execute(sql)
+            created.append(idx_name)
+    return created
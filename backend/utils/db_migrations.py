@@ -1,6 +1,7 @@
 import logging
 from sqlalchemy import text, inspect
 from extensions import db
+from utils.validation_snapshot import reconcile_validation_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +105,9 @@ def run_pending_migrations(app):
                 
                 indexes_to_create = [
                     ("idx_city", "CREATE INDEX idx_city ON raw_google_map_drive_data(city)"),
-                    ("idx_state_category", "CREATE INDEX idx_state_category ON raw_google_map_drive_data(state, category)")
+                    ("idx_state_category", "CREATE INDEX idx_state_category ON raw_google_map_drive_data(state, category)"),
+                    # Serves keyset pages of /api/model/all?file_name=... (the implicit PK suffix orders by id)
+                    ("idx_drive_file_name", "CREATE INDEX idx_drive_file_name ON raw_google_map_drive_data(drive_file_name)")
                 ]
 
                 for name, sql in indexes_to_create:
@@ -194,6 +197,199 @@ def run_pending_migrations(app):
                 except Exception as e:
                     logger.error(f"❌ Failed to add `file_hash` to file_registry: {e}")
 
+                # === ISSUE 6: Byte-offset resume columns on file_registry ===
+                for col_name, col_type in [("last_byte_offset", "BIGINT NULL"), ("header_row", "TEXT NULL")]:
+                    try:
+                        col_check = text(f"""
+                            SELECT COUNT(*) FROM information_schema.COLUMNS
+                            WHERE TABLE_SCHEMA = DATABASE()
+                            AND TABLE_NAME = 'file_registry'
+                            AND COLUMN_NAME = '{col_name}'
+                        """)
+                        if conn.execute(col_check).scalar() == 0:
+                            logger.info(f"⚠️ Column `{col_name}` missing on file_registry. Adding...")
+                            conn.execute(text(f"ALTER TABLE file_registry ADD COLUMN {col_name} {col_type}"))
+                            logger.info(f"✅ Column `{col_name}` added to file_registry.")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to add `{col_name}` to file_registry: {e}")
+
+                # === ISSUE 7: Persistent Drive folder cache (ancestor/path resolution) ===
+                try:
+                    table_check = text("""
+                        SELECT COUNT(*) FROM information_schema.TABLES
+                        WHERE TABLE_SCHEMA = DATABASE()
+                        AND TABLE_NAME = 'drive_folder_paths'
+                    """)
+                    if conn.execute(table_check).scalar() == 0:
+                        logger.info("⚠️ Table `drive_folder_paths` missing. Creating it now...")
+                        conn.execute(text("""
+                            CREATE TABLE drive_folder_paths (
+                                folder_id VARCHAR(200) PRIMARY KEY,
+                                folder_name VARCHAR(500),
+                                parent_id VARCHAR(200),
+                                resolved_at DATETIME,
+                                INDEX idx_parent_id (parent_id)
+                            )
+                        """))
+                        logger.info("✅ Table `drive_folder_paths` created successfully.")
+                    else:
+                        logger.info("⏩ Table `drive_folder_paths` already exists.")
+                except Exception as e:
+                    logger.error(f"❌ Failed to create `drive_folder_paths` table: {e}")
+
+                # === ISSUE 8: Incremental dashboard stats (delta staging + per-file counts) ===
+                for table_name, ddl in [
+                    ("stats_delta_staging", """
+                        CREATE TABLE stats_delta_staging (
+                            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                            state VARCHAR(255) NOT NULL DEFAULT '',
+                            category VARCHAR(255) NOT NULL DEFAULT '',
+                            drive_file_id VARCHAR(255) NOT NULL DEFAULT '',
+                            delta INT NOT NULL
+                        )
+                    """),
+                    ("file_record_summary", """
+                        CREATE TABLE file_record_summary (
+                            drive_file_id VARCHAR(255) PRIMARY KEY,
+                            record_count BIGINT NOT NULL DEFAULT 0
+                        )
+                    """),
+                ]:
+                    try:
+                        table_check = text("""
+                            SELECT COUNT(*) FROM information_schema.TABLES
+                            WHERE TABLE_SCHEMA = DATABASE()
+                            AND TABLE_NAME = :table_name
+                        """)
+                        if conn.execute(table_check, {"table_name": table_name}).scalar() == 0:
+                            logger.info(f"⚠️ Table `{table_name}` missing. Creating it now...")
+                            conn.execute(text(ddl))
+                            logger.info(f"✅ Table `{table_name}` created successfully.")
+                        else:
+                            logger.info(f"⏩ Table `{table_name}` already exists.")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to create `{table_name}` table: {e}")
+
+                # === ISSUE 9: Validation dashboard snapshot (maintained by ValidationQualityProcessor) ===
+                snapshot_created = False
+                for table_name, ddl in [
+                    ("validation_dashboard_snapshot", """
+                        CREATE TABLE validation_dashboard_snapshot (
+                            id TINYINT PRIMARY KEY,
+                            clean_count BIGINT NOT NULL DEFAULT 0,
+                            valid_count BIGINT NOT NULL DEFAULT 0,
+                            missing_count BIGINT NOT NULL DEFAULT 0,
+                            invalid_count BIGINT NOT NULL DEFAULT 0,
+                            duplicate_count BIGINT NOT NULL DEFAULT 0,
+                            last_id BIGINT NOT NULL DEFAULT 0,
+                            last_batch_at DATETIME NULL
+                        )
+                    """),
+                    ("validation_state_snapshot", """
+                        CREATE TABLE validation_state_snapshot (
+                            state VARCHAR(255) PRIMARY KEY,
+                            clean_count BIGINT NOT NULL DEFAULT 0
+                        )
+                    """),
+                    ("validation_daily_snapshot", """
+                        CREATE TABLE validation_daily_snapshot (
+                            day DATE PRIMARY KEY,
+                            clean_count BIGINT NOT NULL DEFAULT 0
+                        )
+                    """),
+                ]:
+                    try:
+                        table_check = text("""
+                            SELECT COUNT(*) FROM information_schema.TABLES
+                            WHERE TABLE_SCHEMA = DATABASE()
+                            AND TABLE_NAME = :table_name
+                        """)
+                        if conn.execute(table_check, {"table_name": table_name}).scalar() == 0:
+                            logger.info(f"⚠️ Table `{table_name}` missing. Creating it now...")
+                            conn.execute(text(ddl))
+                            snapshot_created = True
+                            logger.info(f"✅ Table `{table_name}` created successfully.")
+                        else:
+                            logger.info(f"⏩ Table `{table_name}` already exists.")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to create `{table_name}` table: {e}")
+                if snapshot_created:
+                    # New tables start empty and batches only add increments: seed them from the clean table once
+                    try:
+                        with engine.connect() as seed_conn:
+                            seed_conn = seed_conn.execution_options(isolation_level="REPEATABLE READ")
+                            with seed_conn.begin():
+                                reconcile_validation_snapshot(seed_conn)
+                        logger.info("✅ Validation snapshot seeded from the clean table.")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to seed the validation snapshot: {e}")
+
+                # === ISSUE 10: row_signature keyed index (ingest dedupe + raw dedupe engine) ===
+                try:
+                    col_check = text("""
+                        SELECT COUNT(*) FROM information_schema.COLUMNS
+                        WHERE TABLE_SCHEMA = DATABASE()
+                        AND TABLE_NAME = 'raw_google_map_drive_data'
+                        AND COLUMN_NAME = 'row_signature'
+                    """)
+                    if conn.execute(col_check).scalar() == 0:
+                        logger.info("⚠️ Column `row_signature` missing on raw_google_map_drive_data. Adding...")
+                        conn.execute(text("ALTER TABLE raw_google_map_drive_data ADD COLUMN row_signature VARCHAR(32) NULL AFTER file_hash"))
+                        logger.info("✅ Column `row_signature` added to raw_google_map_drive_data.")
+                    idx_check = text("""
+                        SELECT COUNT(*) FROM information_schema.STATISTICS
+                        WHERE table_schema = DATABASE()
+                        AND table_name = 'raw_google_map_drive_data'
+                        AND index_name = 'idx_raw_signature'
+                    """)
+                    if conn.execute(idx_check).scalar() == 0:
+                        # NULLs (unsigned legacy rows) never collide; model/raw_dedupe.py signs them
+                        conn.execute(text(
+                            "ALTER TABLE raw_google_map_drive_data ADD UNIQUE INDEX idx_raw_signature (row_signature), "
+                            "ALGORITHM=INPLACE, LOCK=NONE"
+                        ))
+                        logger.info("✅ Created index: idx_raw_signature")
+                    else:
+                        logger.info("⏩ Index idx_raw_signature already exists.")
+                except Exception as e:
+                    logger.error(f"❌ Failed to ensure row_signature index: {e}")
+
+                # === ISSUE 11: Near-duplicate blocks + clusters for g_map_master_table (model/near_dupes.py) ===
+                for table_name, ddl in [
+                    ("master_dupe_blocks", """
+                        CREATE TABLE master_dupe_blocks (
+                            block_key VARCHAR(191) NOT NULL,
+                            master_id BIGINT NOT NULL,
+                            PRIMARY KEY (block_key, master_id)
+                        )
+                    """),
+                    ("master_duplicate_clusters", """
+                        CREATE TABLE master_duplicate_clusters (
+                            master_id BIGINT PRIMARY KEY,
+                            cluster_id BIGINT NOT NULL,
+                            matched_id BIGINT NOT NULL,
+                            score FLOAT NOT NULL,
+                            method VARCHAR(32) NOT NULL,
+                            detected_at DATETIME NOT NULL,
+                            INDEX idx_cluster (cluster_id)
+                        )
+                    """),
+                ]:
+                    try:
+                        table_check = text("""
+                            SELECT COUNT(*) FROM information_schema.TABLES
+                            WHERE TABLE_SCHEMA = DATABASE()
+                            AND TABLE_NAME = :table_name
+                        """)
+                        if conn.execute(table_check, {"table_name": table_name}).scalar() == 0:
+                            logger.info(f"⚠️ Table `{table_name}` missing. Creating it now...")
+                            conn.execute(text(ddl))
+                            logger.info(f"✅ Table `{table_name}` created successfully.")
+                        else:
+                            logger.info(f"⏩ Table `{table_name}` already exists.")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to create `{table_name}` table: {e}")
+
             logger.info("🏁 DB Migrations check complete.")
             
         except Exception as e:
@@ -0,0 +1,110 @@
+"""
+Per-process pool of authorised Google Drive v3 clients.
+Building a client (service-account JSON parse + discovery document) costs tens of
+milliseconds, so each worker process builds `size` clients once and tasks check one
+out for their duration. httplib2 connections are not safe to share between
+concurrent greenlets/threads, hence a pool rather than a single client.
+All clients share one credentials object whose token is refreshed centrally,
+under a lock, shortly before it expires, so concurrent tasks never race to refresh.
+A task that waits longer than `checkout_timeout` for a pooled client gets a one-off
+client instead, so more concurrent tasks than pooled clients slow down rather than stall.
+"""
+import os
+import queue
+import logging
+import threading
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+
+from google.oauth2 import service_account
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+
+logger = logging.getLogger("DriveClientPool")
+
+DRIVE_READONLY_SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
+
+
+class DriveClientPool:
+    def __init__(self, service_account_file=None, scopes=DRIVE_READONLY_SCOPES, size=8,
+                 refresh_margin=300, credentials=None, checkout_timeout=None):
+        self.service_account_file = service_account_file
+        self.scopes = scopes
+        self.size = size
+        # Seconds before expiry at which the shared token is refreshed (None disables refreshing)
+        self.refresh_margin = refresh_margin
+        self.credentials = credentials
+        # Seconds to wait for a free client before building a temporary one (None waits forever)
+        self.checkout_timeout = checkout_timeout
+        self.clients = queue.Queue()
+        self.built = 0
+        self.overflows = 0
+        self.refreshes = 0
+        self.pid = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _load_credentials(self):
+        if not os.path.exists(self.service_account_file):
+            raise FileNotFoundError(f"Service account file not found at: {self.service_account_file}")
+        return service_account.Credentials.from_service_account_file(
+            self.service_account_file, scopes=self.scopes
+        )
+
+    def _build_client(self):
+        self.built += 1
+        return build('drive', 'v3', credentials=self.credentials, cache_discovery=False)
+
+    def init(self):
+        """Loads credentials and builds the clients. Re-runs after a fork (pool is per process)."""
+        with self._lock:
+            if self.pid == os.getpid():
+                return
+            # Credentials hold no sockets and survive a fork; the clients' HTTP connections do not
+            if self.credentials is None:
+                self.credentials = self._load_credentials()
+            self.clients = queue.Queue()
+            for _ in range(self.size):
+                self.clients.put(self._build_client())
+            self.pid = os.getpid()
+            logger.info(f"Drive client pool ready: {self.size} clients (pid {self.pid})")
+
+    def _needs_refresh(self):
+        creds = self.credentials
+        if not creds.token or not creds.expiry:
+            return True
+        return creds.expiry - timedelta(seconds=self.refresh_margin) <= datetime.utcnow()
+
+    def ensure_token(self):
+        """Refreshes the shared token once, for every client, when it is missing or about to expire."""
+        if self.refresh_margin is None or not self._needs_refresh():
+            return
+        with self._refresh_lock:
+            if self._needs_refresh():
+                self.credentials.refresh(Request())
+                self.refreshes += 1
+                logger.info(f"Drive token refreshed (expires {self.credentials.expiry})")
+
+    @contextmanager
+    def client(self, timeout=None):
+        """
+        Checks a Drive client out of the pool. Waits up to `timeout` seconds (default
+        checkout_timeout) for a free one, then serves a temporary client rather than stall.
+        """
+        if self.pid != os.getpid():
+            self.init()
+        self.ensure_token()
+        try:
+            service = self.clients.get(timeout=self.checkout_timeout if timeout is None else timeout)
+        except queue.Empty:
+            service = None
+        if service is None:
+            with self._lock:
+                self.overflows += 1
+            logger.warning("Drive client pool exhausted; building a temporary client.")
+            yield self._build_client()
+            return
+        try:
+            yield service
+        finally:
+            self.clients.put(service)
@@ -0,0 +1,97 @@
+"""
+Streaming reader for Google Drive media downloads.
+Feeds MediaIoBaseDownload chunks straight into an incremental UTF-8 decoder so
+csv.reader / csv.DictReader can consume rows while the download is still running.
+Peak memory is one chunk plus the current (partial) line, regardless of file size.
+"""
+import io
+import time
+import codecs
+import logging
+
+logger = logging.getLogger("DriveStream")
+
+
+def next_chunk_with_retry(downloader, attempts=5):
+    """Pull one chunk from a MediaIoBaseDownload, retrying transient SSL / network errors."""
+    for attempt in range(attempts):
+        try:
+            return downloader.next_chunk()
+        except Exception as e:
+            transient = "SSL" in str(e) or "EOF" in str(e) or "connection" in str(e).lower()
+            if attempt < attempts - 1 and transient:
+                logger.warning(f"Drive chunk download failed ({e}); retry {attempt + 1}/{attempts - 1} in {2 ** attempt}s")
+                time.sleep(2 ** attempt)
+                continue
+            if transient:
+                logger.error(f"Drive chunk download still failing after {attempts} attempts: {e}")
+            raise
+
+
+class DriveLineStream:
+    """
+    Iterable of decoded text lines from a Drive `get_media` request.
+
+    `offset` is the number of source bytes consumed up to the end of the last
+    yielded line, so callers can record exactly where a parsed row ended.
+    Passing that value back as `start_offset` resumes the download from there.
+    """
+
+    def __init__(self, request, chunk_size=1024 * 1024, start_offset=0):
+        self.request = request
+        self.chunk_size = chunk_size
+        self.offset = start_offset
+        self.bytes_downloaded = 0
+
+    def _open_downloader(self, sink):
+        from googleapiclient.http import MediaIoBaseDownload
+        downloader = MediaIoBaseDownload(sink, self.request, chunksize=self.chunk_size)
+        # MediaIoBaseDownload builds each chunk's Range header from _progress,
+        # so seeding it turns the download into a ranged request from `offset`
+        downloader._progress = self.offset
+        return downloader
+
+    def iter_chunks(self):
+        """Yields raw byte chunks as they arrive; the sink is emptied after every chunk."""
+        sink = io.BytesIO()
+        downloader = self._open_downloader(sink)
+        done = False
+        while not done:
+            # Yield control to gevent hub every chunk to handle Redis heartbeats
+            time.sleep(0.01)
+            _, done = next_chunk_with_retry(downloader)
+            data = sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+            if data:
+                self.bytes_downloaded += len(data)
+                yield data
+
+    def __iter__(self):
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        tail = b''
+        for chunk in self.iter_chunks():
+            buf = tail + chunk if tail else chunk
+            start = 0
+            # b'\n' never occurs inside a multi-byte UTF-8 sequence, so byte-level splitting is safe
+            nl = buf.find(b'\n', start)
+            while nl >= 0:
+                raw = buf[start:nl + 1]
+                start = nl + 1
+                self.offset += len(raw)
+                yield self._decode_line(decoder, raw)
+                nl = buf.find(b'\n', start)
+            tail = buf[start:]
+        if tail:
+            # Last line without a newline: normal for many exports, but also what a cut-off file looks like
+            logger.debug(f"Stream ended with an unterminated {len(tail)}-byte line at offset {self.offset}")
+            self.offset += len(tail)
+            yield decoder.decode(tail, final=True)
+
+    @staticmethod
+    def _decode_line(decoder, raw):
+        line = decoder.decode(raw)
+        # Match TextIOWrapper universal-newline behaviour for CRLF files
+        if line.endswith('\r\n'):
+            line = line[:-2] + '\n'
+        return line
@@ -1,4 +1,4 @@
-def drop_non_essential_indexes(cursor,tableName,indexes):
+def drop_non_essential_indexes(cursor,tableName,indexes,online=False):
     cursor.execute("""
         SELECT index_name
         FROM information_schema.statistics
@@ -8,7 +8,18 @@ def drop_non_essential_indexes(cursor,tableName,indexes):
 
     existing_indexes = {row[0] for row in cursor.fetchall()}
 
+    dropped = []
     for index in indexes:
         idx_name = f"idx_{index}"
         if idx_name in existing_indexes:
-            cursor.execute(f"DROP INDEX {idx_name} ON {tableName}")
\ No newline at end of file
+            sql = f"DROP INDEX {idx_name} ON {tableName}"
+            if online:
+                try:
+                    cursor.execute(sql + " ALGORITHM=INPLACE LOCK=NONE")
+                    dropped.append(idx_name)
+                    continue
+                except Exception as e:
+                    print(f"⚠️ Online drop of {idx_name} refused ({e}); retrying with default locking")
+            cursor.execute(sql)
+            dropped.append(idx_name)
+    return dropped
@@ -0,0 +1,182 @@
+"""
+Coordinates the non-essential index drop/rebuild around bulk loads.
+
+Every bulk load of a table holds a lease: a member of the Redis sorted set
+idxlease:<table>, scored with its expiry time. begin_bulk_load() adds the lease and
+drops the indexes; end_bulk_load() removes it and rebuilds the indexes only when no
+other live lease is left, so concurrent uploads into the same table no longer rebuild
+each other's indexes mid-load. Leases expire after INDEX_LEASE_TTL, so a loader that
+died without releasing stops holding the indexes down; a live loader renews its lease
+with renew_bulk_load() as it commits. The lease change and the DDL that follows it run
+under the per-table lock idxddl:<table> (utils.redis_lock), so a load starting while
+the last one is rebuilding cannot have its fresh drop undone by that rebuild. Index DDL
+runs online (ALGORITHM=INPLACE, LOCK=NONE), so dashboards keep reading and writing while
+an index builds; a server that refuses it falls back to the default algorithm.
+
+Tables whose indexes were ever dropped this way are remembered in idxlease:tables.
+reconcile_indexes() (run when a worker starts and from beat) recreates any of their
+indexes that are missing while nothing holds a lease or the table's DDL lock, which
+repairs a load that crashed between the drop and the rebuild, or whose rebuild found
+the lock busy.
+
+Without Redis the manager degrades to the old behaviour: every load drops on begin and
+rebuilds on end.
+"""
+import os
+import json
+import time
+import uuid
+import logging
+
+from utils.file_sketches import get_redis
+from utils.redis_lock import acquire_lock, release_lock
+from utils.drop_non_essential_indexes import drop_non_essential_indexes
+from utils.create_non_essential_indexes import create_non_essential_indexes
+
+logger = logging.getLogger("IndexMaintenance")
+
+LEASE_PREFIX = "idxlease:"
+REGISTRY_KEY = LEASE_PREFIX + "tables"
+LEASE_TTL = int(os.getenv("INDEX_LEASE_TTL", str(6 * 3600)))
+# How long a load waits for another load's index drop/rebuild on the same table
+DDL_LOCK_WAIT = int(os.getenv("INDEX_DDL_LOCK_WAIT", "900"))
+ONLINE_DDL = os.getenv("INDEX_ONLINE_DDL", "true").lower() in ("1", "true", "yes")
+
+
+def lease_key(table):
+    return LEASE_PREFIX + table
+
+
+def active_loads(redis_client, table, now=None):
+    """Live leases on `table` (expired ones are pruned on the way)."""
+    now = time.time() if now is None else now
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.zremrangebyscore(lease_key(table), "-inf", now)
+    pipe.zcard(lease_key(table))
+    return int(pipe.execute()[-1])
+
+
+def ddl_lock_name(table):
+    return "idxddl:" + table
+
+
+def _release(redis_client, table, lock_id):
+    if lock_id:
+        try:
+            release_lock(redis_client, ddl_lock_name(table), lock_id)
+        except Exception as e:
+            # Expires on its own after LEASE_TTL
+            logger.warning(f"{table}: could not release the index DDL lock: {e}")
+
+
+def begin_bulk_load(cursor, table, indexes, load_id=None, redis_client=None):
+    """Takes a lease on `table` and drops its non-essential indexes. Returns the load id."""
+    load_id = load_id or uuid.uuid4().hex
+    if not indexes:
+        return load_id
+    lock_id = None
+    coordinated = True
+    try:
+        redis_client = redis_client or get_redis()
+        lock_id = acquire_lock(redis_client, ddl_lock_name(table), LEASE_TTL, wait=DDL_LOCK_WAIT)
+        now = time.time()
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.zremrangebyscore(lease_key(table), "-inf", now)
+        pipe.zadd(lease_key(table), {load_id: now + LEASE_TTL})
+        pipe.hset(REGISTRY_KEY, table, json.dumps(list(indexes)))
+        pipe.zcard(lease_key(table))
+        loads = int(pipe.execute()[-1])
+        logger.info(f"{table}: bulk load {load_id} started ({loads} active)")
+    except Exception as e:
+        logger.warning(f"{table}: index lease unavailable ({e}); dropping indexes uncoordinated")
+        coordinated = False
+    try:
+        if coordinated and not lock_id:
+            # Another load is still rebuilding: load with the indexes in place rather than race its DDL
+            logger.warning(f"{table}: index DDL lock busy; bulk load {load_id} keeps the indexes")
+            return load_id
+        # Idempotent: a second concurrent load finds the indexes already gone
+        drop_non_essential_indexes(cursor, table, indexes, online=ONLINE_DDL)
+        return load_id
+    finally:
+        _release(redis_client, table, lock_id)
+
+
+def renew_bulk_load(table, load_id, redis_client=None):
+    """
+    Pushes the lease of a running load out by another LEASE_TTL, so a load that runs
+    longer than the TTL does not have its indexes rebuilt underneath it. Returns False
+    when the lease is gone (expired and pruned, or never taken); never raises.
+    """
+    if not load_id:
+        return False
+    try:
+        redis_client = redis_client or get_redis()
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.zadd(lease_key(table), {load_id: time.time() + LEASE_TTL}, xx=True)
+        pipe.zscore(lease_key(table), load_id)
+        return pipe.execute()[-1] is not None
+    except Exception as e:
+        logger.warning(f"{table}: could not renew the lease of bulk load {load_id}: {e}")
+        return False
+
+
+def end_bulk_load(cursor, table, indexes, load_id, redis_client=None):
+    """
+    Releases the lease and rebuilds the indexes if it was the last one on `table`.
+    Returns True when the indexes were rebuilt.
+    """
+    if not indexes:
+        return False
+    lock_id = None
+    try:
+        redis_client = redis_client or get_redis()
+        lock_id = acquire_lock(redis_client, ddl_lock_name(table), LEASE_TTL, wait=DDL_LOCK_WAIT)
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.zrem(lease_key(table), load_id)
+        pipe.zremrangebyscore(lease_key(table), "-inf", time.time())
+        pipe.zcard(lease_key(table))
+        remaining = int(pipe.execute()[-1])
+    except Exception as e:
+        logger.warning(f"{table}: index lease unavailable ({e}); rebuilding indexes uncoordinated")
+        remaining = None
+    try:
+        if remaining:
+            logger.info(f"{table}: bulk load {load_id} done; {remaining} still running, rebuild left to the last")
+            return False
+        if remaining is not None and not lock_id:
+            logger.warning(f"{table}: index DDL lock busy; rebuild after bulk load {load_id} left to reconcile")
+            return False
+        created = create_non_essential_indexes(cursor, table, indexes, online=ONLINE_DDL)
+        logger.info(f"{table}: bulk load {load_id} done; rebuilt {created or 'no'} indexes")
+        return True
+    finally:
+        _release(redis_client, table, lock_id)
+
+
+def reconcile_indexes(cursor, redis_client=None):
+    """
+    Recreates missing non-essential indexes of every registered table no load holds.
+    Returns {table: [created index names]} for the tables it touched.
+    """
+    redis_client = redis_client or get_redis()
+    repaired = {}
+    for table, indexes in redis_client.hgetall(REGISTRY_KEY).items():
+        table = table.decode() if isinstance(table, bytes) else table
+        # A load dropping or rebuilding right now owns the table's DDL: try again next run
+        lock_id = acquire_lock(redis_client, ddl_lock_name(table), LEASE_TTL)
+        if not lock_id:
+            continue
+        try:
+            if active_loads(redis_client, table):
+                continue
+            created = create_non_essential_indexes(cursor, table, json.loads(indexes), online=ONLINE_DDL)
+        except Exception as e:
+            logger.error(f"{table}: index reconcile failed: {e}")
+            continue
+        finally:
+            _release(redis_client, table, lock_id)
+        if created:
+            logger.warning(f"{table}: restored indexes left missing by an unfinished load: {created}")
+            repaired[table] = created
+    return repaired
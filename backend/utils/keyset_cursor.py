@@ -0,0 +1,40 @@
+"""
+Opaque keyset-pagination cursors.
+
+A cursor is the last id of the previous page plus the filter set it was issued for,
+JSON-encoded and base64url'd. Pages are then read with `id < :cursor ORDER BY id DESC
+LIMIT :limit + 1`, which costs the same however deep the page is (no OFFSET scan).
+Decoding against a different filter set is rejected so a cursor from one listing
+cannot silently page through another.
+"""
+import json
+import base64
+
+
+def encode_cursor(last_id, filters=None):
+    payload = json.dumps({"id": int(last_id), "f": filters or {}}, sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, filters=None):
+    """Returns the last id encoded in `cursor` (None for no cursor). Raises ValueError when invalid."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        last_id = int(payload["id"])
+        issued_for = payload.get("f") or {}
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if issued_for != (filters or {}):
+        raise ValueError("Cursor does not match the current filters")
+    return last_id
+
+
+def page_response(rows, limit, filters=None, id_of=lambda r: r[0]):
+    """Trims the LIMIT limit+1 lookahead row. Returns (rows, next_cursor, has_next)."""
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(id_of(rows[-1]), filters) if has_next else None
+    return rows, next_cursor, has_next
@@ -44,6 +44,34 @@ if PROMETHEUS_AVAILABLE:
     error_count = Counter(
         'gdrive_etl_errors_total', 'Total ETL errors encountered'
     )
+    column_plan_hits = Counter(
+        'gdrive_column_plan_cache_hits_total', 'CSV header column-plan cache hits', ['tier']
+    )
+    column_plan_misses = Counter(
+        'gdrive_column_plan_cache_misses_total', 'CSV header column-plan cache misses (fuzzy resolution ran)'
+    )
+    signature_bloom_bytes = Gauge(
+        'validation_signature_bloom_bytes', 'Memory held by the clean-table signature Bloom filter'
+    )
+    signature_bloom_items = Gauge(
+        'validation_signature_bloom_items', 'Signatures added to the Bloom filter'
+    )
+    signature_bloom_fp_rate = Gauge(
+        'validation_signature_bloom_fp_rate', 'Estimated Bloom filter false-positive rate at the current fill'
+    )
+    signature_bloom_checks = Counter(
+        'validation_signature_bloom_checks_total', 'Signature lookups answered by the Bloom filter', ['result']
+    )
+    signature_bloom_false_positives = Counter(
+        'validation_signature_bloom_false_positives_total', 'Probable hits MySQL did not find'
+    )
+    validation_stage_seconds = Histogram(
+        'validation_stage_seconds', 'Time one batch spends in a quality pipeline stage', ['stage'],
+        buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30]
+    )
+    validation_queue_depth = Gauge(
+        'validation_queue_depth', 'Batches waiting between quality pipeline stages', ['queue']
+    )
 else:
     # Lightweight no-op stubs
     class _NoOp:
@@ -67,6 +95,15 @@ else:
     processing_time = _NoOp()
     dlq_entries = _NoOp()
     active_db_ops = _NoOp()
+    column_plan_hits = _NoOp()
+    column_plan_misses = _NoOp()
+    signature_bloom_bytes = _NoOp()
+    signature_bloom_items = _NoOp()
+    signature_bloom_fp_rate = _NoOp()
+    signature_bloom_checks = _NoOp()
+    signature_bloom_false_positives = _NoOp()
+    validation_stage_seconds = _NoOp()
+    validation_queue_depth = _NoOp()
 
 
 def start_metrics_server(port=None):
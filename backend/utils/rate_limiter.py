@@ -0,0 +1,50 @@
+import time
+import threading
+import logging
+
+logger = logging.getLogger("RateLimiter")
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every caller of one API.
+    `rate` tokens are added per second up to `capacity`; acquire() blocks until a
+    token is available. penalize() pauses ALL callers (e.g. after a 429) so the
+    backoff is applied once, centrally, instead of per call.
+    """
+    def __init__(self, name, rate, capacity=None):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+
+    def acquire(self, tokens=1):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= tokens:
+                        self.tokens -= tokens
+                        return
+                    wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, seconds):
+        with self.lock:
+            until = time.monotonic() + seconds
+            if until > self.paused_until:
+                self.paused_until = until
+                self.tokens = 0.0
+                self.last_refill = until
+                logger.warning(f"Rate limiter [{self.name}] backing off for {seconds:.2f}s")
@@ -0,0 +1,68 @@
+"""
+Owner-checked Redis locks.
+
+A lock is the key lock:<name>, set NX with a TTL to a random token per acquisition, so
+a holder can only release or extend the lock it took itself, never one a later holder
+took after its own expired. tasks.gdrive_task.etl_tasks.redis_lock wraps these with the
+ETL's shared Redis pool.
+"""
+import time
+import uuid
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger("RedisLock")
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+EXTEND_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def acquire_lock(redis_client, lock_name, timeout=3600, wait=0, poll=0.5):
+    """Takes lock:<lock_name>, retrying for up to `wait` seconds. Returns the owner token or None."""
+    lock_id = uuid.uuid4().hex
+    deadline = time.time() + wait
+    while True:
+        if redis_client.set(f"lock:{lock_name}", lock_id, ex=int(timeout), nx=True):
+            return lock_id
+        if time.time() >= deadline:
+            return None
+        time.sleep(poll)
+
+
+def release_lock(redis_client, lock_name, lock_id):
+    """Deletes the lock only if `lock_id` still owns it (atomic compare-and-delete)."""
+    redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{lock_name}", lock_id)
+
+
+def extend_lock(redis_client, lock_name, lock_id, timeout):
+    """
+    Pushes a held lock's expiry out to `timeout` seconds. Returns False once the lock has
+    expired or been taken by someone else; a Redis outage is not a lost lock.
+    """
+    try:
+        return bool(redis_client.eval(EXTEND_LOCK_SCRIPT, 1, f"lock:{lock_name}", lock_id, int(timeout)))
+    except Exception as e:
+        logger.warning(f"Could not extend lock {lock_name}: {e}")
+        return True
+
+
+@contextmanager
+def redis_lock(redis_client, lock_name, timeout=3600, wait=0):
+    """Yields the owner token, or None when the lock is held elsewhere."""
+    lock_id = acquire_lock(redis_client, lock_name, timeout, wait)
+    try:
+        yield lock_id
+    finally:
+        if lock_id:
+            release_lock(redis_client, lock_name, lock_id)
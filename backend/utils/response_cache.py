@@ -0,0 +1,88 @@
+"""
+Redis-backed response cache for the dashboard blueprints, invalidated by the ETL.
+
+Each cached view declares the tables it reads as tags. Every tag has a version counter
+in Redis and a response is stored under a key built from the route, its query args and
+the current versions of its tags. Writers call invalidate_tags() after changing a table,
+which bumps the versions: the next request misses and recomputes, and the superseded
+entries simply expire. A response computed while an invalidation lands is stored under
+the old versions, so it can never be served as fresh. The TTL is only a backstop for
+entries nobody invalidates; freshness comes from the ETL. Redis errors fall through to
+the uncached view.
+"""
+import json
+import time
+import hashlib
+import logging
+from functools import wraps
+
+from flask import request, Response
+
+from utils.file_sketches import get_redis
+
+logger = logging.getLogger("ResponseCache")
+
+CACHE_PREFIX = "respcache:"
+TAG_PREFIX = CACHE_PREFIX + "tag:"
+BACKSTOP_TTL = 3600
+
+# Tables whose changes dashboards care about
+RAW_TABLE = "raw_google_map_drive_data"
+CLEAN_TABLE = "raw_clean_google_map_data"
+VALIDATION_LOG = "data_validation_log"
+STATE_SUMMARY = "state_category_summary_v5"
+STATS_SUMMARY = "dashboard_stats_summary_v5"
+
+_redis_down_until = 0
+
+
+def invalidate_tags(redis_client, *tags):
+    """Marks every cached response tagged with any of `tags` stale. Never throws."""
+    if not tags:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(TAG_PREFIX + tag)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Response cache invalidation failed for {tags}: {e}")
+
+
+def cache_key(path, args, versions):
+    payload = json.dumps([path, sorted(args), versions], ensure_ascii=False)
+    return CACHE_PREFIX + hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+
+def cached_response(*tags, ttl=BACKSTOP_TTL, redis_factory=get_redis, retry_after=30):
+    """Caches a view's successful JSON responses until one of `tags` is invalidated."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            global _redis_down_until
+            if time.time() < _redis_down_until:
+                return view(*args, **kwargs)
+            try:
+                redis_client = redis_factory()
+                versions = [int(v or 0) for v in redis_client.mget([TAG_PREFIX + t for t in tags])]
+                key = cache_key(request.path, request.args.items(multi=True), versions)
+                body = redis_client.get(key)
+            except Exception as e:
+                # Back off instead of paying a socket timeout on every poll
+                _redis_down_until = time.time() + retry_after
+                logger.warning(f"Response cache unavailable, serving uncached: {e}")
+                return view(*args, **kwargs)
+
+            if body is not None:
+                return Response(body, mimetype="application/json", headers={"X-Cache": "HIT"})
+
+            resp = view(*args, **kwargs)
+            if isinstance(resp, Response) and resp.status_code == 200 and resp.is_json:
+                try:
+                    redis_client.set(key, resp.get_data(), ex=ttl)
+                except Exception as e:
+                    logger.warning(f"Response cache write failed: {e}")
+                resp.headers["X-Cache"] = "MISS"
+            return resp
+        return wrapper
+    return decorator
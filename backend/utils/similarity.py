@@ -0,0 +1,80 @@
+"""
+String similarity and spatial keys for near-duplicate detection (pure Python, no deps).
+  jaro_winkler      edit-style similarity that rewards a shared prefix (typos, short names)
+  token_set_ratio   order-insensitive word overlap (re-ordered or extra words in names/addresses)
+  geohash           base32 geohash cell of a coordinate, for spatial blocking
+All similarities are in [0, 1].
+"""
+import re
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def jaro_winkler(a, b, prefix_scale=0.1):
+    if a == b:
+        return 1.0 if a else 0.0
+    if not a or not b:
+        return 0.0
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    a_matched = [False] * len(a)
+    b_matched = [False] * len(b)
+    matches = 0
+    for i, ch in enumerate(a):
+        for j in range(max(0, i - window), min(i + window + 1, len(b))):
+            if not b_matched[j] and b[j] == ch:
+                a_matched[i] = b_matched[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    a_seq = [ch for ch, m in zip(a, a_matched) if m]
+    b_seq = [ch for ch, m in zip(b, b_matched) if m]
+    transpositions = sum(x != y for x, y in zip(a_seq, b_seq)) / 2
+    jaro = (matches / len(a) + matches / len(b) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def tokens(text):
+    return set(_TOKEN_RE.findall((text or "").lower()))
+
+
+def token_set_ratio(a, b):
+    """Mean of word-set overlap coefficient and Jaccard: 1.0 for equal sets, >= 0.5 when one contains the other."""
+    ta, tb = tokens(a), tokens(b)
+    if not ta or not tb:
+        return 0.0
+    common = len(ta & tb)
+    return (common / min(len(ta), len(tb)) + common / len(ta | tb)) / 2
+
+
+def geohash(lat, lon, precision=6):
+    """Geohash cell (precision 6 is roughly 1.2 km x 0.6 km). None for missing coordinates."""
+    try:
+        lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or (lat == 0 and lon == 0):
+        return None
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    out, bit, ch, even = [], 0, 0, True
+    while len(out) < precision:
+        rng, val = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if val >= mid:
+            ch = (ch << 1) | 1
+            rng[0] = mid
+        else:
+            ch <<= 1
+            rng[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            out.append(_GEOHASH_ALPHABET[ch])
+            bit, ch = 0, 0
+    return "".join(out)
@@ -0,0 +1,183 @@
+"""
+Incremental maintenance of the dashboard summary tables.
+
+commit_batch records, in the same transaction as the raw rows, how many NEW rows it
+inserted per (state, category, drive_file_id) into `stats_delta_staging`. A small
+merge job folds staged deltas into `state_category_summary_v5` and
+`file_record_summary` and re-derives the `dashboard_stats_summary_v5` totals from
+those (small) tables, so no query ever scans raw_google_map_drive_data.
+reconcile_summaries() is the old full recompute, kept for rare drift correction
+(e.g. after rows are deleted by the dedupe scripts).
+
+NULL state/category are stored as '' (summary primary keys cannot be NULL) and are
+not counted as distinct states/categories, mirroring COUNT(DISTINCT ...).
+"""
+import logging
+from collections import Counter
+from sqlalchemy import text
+
+logger = logging.getLogger("StatsDeltas")
+
+
+def _key(val):
+    return val if val is not None else ''
+
+
+def existing_signatures(conn, batch, table='raw_google_map_drive_data'):
+    """row_signatures of `batch` already present in `table` (one lookup on idx_raw_signature)."""
+    sigs = list({row['row_signature'] for row in batch})
+    if not sigs:
+        return set()
+    placeholders = ", ".join(f":s{i}" for i in range(len(sigs)))
+    rows = conn.execute(
+        text(f"SELECT row_signature FROM {table} WHERE row_signature IN ({placeholders})"),
+        {f"s{i}": sig for i, sig in enumerate(sigs)}
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
+def aggregate_new_rows(batch, existing):
+    """Per-(state, category, drive_file_id) counts of rows INSERT IGNORE will actually insert."""
+    seen = set(existing)
+    counts = Counter()
+    for row in batch:
+        sig = row['row_signature']
+        if sig in seen:
+            continue
+        seen.add(sig)
+        counts[(_key(row.get('state')), _key(row.get('category')), _key(row.get('drive_file_id')))] += 1
+    return [
+        {"state": state, "category": category, "drive_file_id": file_id, "delta": delta}
+        for (state, category, file_id), delta in counts.items()
+    ]
+
+
+def record_stats_deltas(conn, deltas):
+    """Stages deltas on the caller's connection (same transaction as the rows they describe)."""
+    if deltas:
+        conn.execute(text("""
+            INSERT INTO stats_delta_staging (state, category, drive_file_id, delta)
+            VALUES (:state, :category, :drive_file_id, :delta)
+        """), deltas)
+
+
+def _refresh_totals(conn):
+    """Re-derives dashboard_stats_summary_v5 (id=1) from the per-key summary tables."""
+    conn.execute(text("""
+        INSERT INTO dashboard_stats_summary_v5
+            (id, total_records, total_states, total_categories, total_csvs, last_updated)
+        SELECT 1,
+               (SELECT COALESCE(SUM(record_count), 0) FROM state_category_summary_v5),
+               (SELECT COUNT(DISTINCT state) FROM state_category_summary_v5 WHERE record_count > 0 AND state <> ''),
+               (SELECT COUNT(DISTINCT category) FROM state_category_summary_v5 WHERE record_count > 0 AND category <> ''),
+               (SELECT COUNT(*) FROM file_record_summary WHERE record_count > 0 AND drive_file_id <> ''),
+               NOW()
+        ON DUPLICATE KEY UPDATE
+            total_records = VALUES(total_records),
+            total_states = VALUES(total_states),
+            total_categories = VALUES(total_categories),
+            total_csvs = VALUES(total_csvs),
+            last_updated = NOW()
+    """))
+
+
+def merge_stats_deltas(conn, max_rows=50000):
+    """
+    Folds up to max_rows staged deltas into the summaries inside the caller's transaction.
+    The locking read waits for in-flight inserts, so exactly the rows summed are deleted.
+    Returns the number of staging rows merged.
+    """
+    rows = conn.execute(text("""
+        SELECT id, state, category, drive_file_id, delta FROM stats_delta_staging
+        ORDER BY id LIMIT :lim FOR UPDATE
+    """), {"lim": max_rows}).fetchall()
+    if not rows:
+        return 0
+
+    by_state_cat = Counter()
+    by_file = Counter()
+    for _, state, category, file_id, delta in rows:
+        by_state_cat[(state, category)] += delta
+        by_file[file_id] += delta
+
+    conn.execute(text("""
+        INSERT INTO state_category_summary_v5 (state, category, record_count)
+        VALUES (:state, :category, :delta)
+        ON DUPLICATE KEY UPDATE record_count = record_count + VALUES(record_count)
+    """), [{"state": s, "category": c, "delta": d} for (s, c), d in by_state_cat.items()])
+    conn.execute(text("""
+        INSERT INTO file_record_summary (drive_file_id, record_count)
+        VALUES (:file_id, :delta)
+        ON DUPLICATE KEY UPDATE record_count = record_count + VALUES(record_count)
+    """), [{"file_id": f, "delta": d} for f, d in by_file.items()])
+
+    conn.execute(text("DELETE FROM stats_delta_staging WHERE id BETWEEN :lo AND :hi"),
+                 {"lo": rows[0][0], "hi": rows[-1][0]})
+    _refresh_totals(conn)
+    return len(rows)
+
+
+def _upsert_counts(conn, sql, params, chunk=1000):
+    for i in range(0, len(params), chunk):
+        conn.execute(text(sql), params[i:i + chunk])
+
+
+def reconcile_summaries(conn):
+    """
+    Full recompute from raw_google_map_drive_data. Must run inside ONE REPEATABLE READ
+    transaction: the first read below fixes the snapshot, so staged deltas visible in it
+    describe rows the recompute already counts and exactly those are discarded; later
+    deltas are merged normally afterwards. The GROUP BYs are plain consistent reads
+    (no row locks on the raw table) and summary rows are upserted, never emptied, so
+    dashboard readers see no gap. Returns the number of staged deltas discarded.
+    """
+    staged_ids = [r[0] for r in conn.execute(text("SELECT id FROM stats_delta_staging ORDER BY id"))]
+
+    state_cat = conn.execute(text("""
+        SELECT COALESCE(state, ''), COALESCE(category, ''), COUNT(*)
+        FROM raw_google_map_drive_data GROUP BY COALESCE(state, ''), COALESCE(category, '')
+    """)).fetchall()
+    files = conn.execute(text("""
+        SELECT COALESCE(drive_file_id, ''), COUNT(*)
+        FROM raw_google_map_drive_data GROUP BY COALESCE(drive_file_id, '')
+    """)).fetchall()
+
+    # Zero pairs/files that vanished BEFORE upserting live counts: a live key wrongly flagged
+    # stale (the summary collation is case-insensitive) is then immediately set back
+    live_pairs = {(s, c) for s, c, _ in state_cat}
+    stale_pairs = [
+        {"state": s, "category": c}
+        for s, c in conn.execute(text("SELECT state, category FROM state_category_summary_v5 WHERE record_count > 0"))
+        if (s, c) not in live_pairs
+    ]
+    _upsert_counts(conn, """
+        UPDATE state_category_summary_v5 SET record_count = 0 WHERE state = :state AND category = :category
+    """, stale_pairs)
+    _upsert_counts(conn, """
+        INSERT INTO state_category_summary_v5 (state, category, record_count)
+        VALUES (:state, :category, :cnt)
+        ON DUPLICATE KEY UPDATE record_count = VALUES(record_count)
+    """, [{"state": s, "category": c, "cnt": n} for s, c, n in state_cat])
+
+    live_files = {f for f, _ in files}
+    stale_files = [
+        {"file_id": f}
+        for (f,) in conn.execute(text("SELECT drive_file_id FROM file_record_summary WHERE record_count > 0"))
+        if f not in live_files
+    ]
+    _upsert_counts(conn, "UPDATE file_record_summary SET record_count = 0 WHERE drive_file_id = :file_id",
+                   stale_files)
+    _upsert_counts(conn, """
+        INSERT INTO file_record_summary (drive_file_id, record_count)
+        VALUES (:file_id, :cnt)
+        ON DUPLICATE KEY UPDATE record_count = VALUES(record_count)
+    """, [{"file_id": f, "cnt": n} for f, n in files])
+
+    for i in range(0, len(staged_ids), 1000):
+        chunk = staged_ids[i:i + 1000]
+        placeholders = ", ".join(f":id{j}" for j in range(len(chunk)))
+        conn.execute(text(f"DELETE FROM stats_delta_staging WHERE id IN ({placeholders})"),
+                     {f"id{j}": sid for j, sid in enumerate(chunk)})
+
+    _refresh_totals(conn)
+    return len(staged_ids)
@@ -0,0 +1,65 @@
+"""
+LOAD DATA LOCAL INFILE helper.
+Serialises a batch of dict rows to a temporary TSV in MySQL's default
+LOAD DATA format (tab-separated, backslash-escaped, \\N for NULL) and loads it
+in one statement. Requires `local_infile=True` on the client connection and
+`local_infile=ON` on the server.
+"""
+import os
+import tempfile
+from sqlalchemy import text
+
+# MySQL default FIELDS ESCAPED BY '\\' rules
+_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\0': '\\0',
+})
+
+
+def tsv_field(val):
+    """Format one value for LOAD DATA: None -> \\N, everything else escaped text."""
+    if val is None:
+        return '\\N'
+    if isinstance(val, float):
+        return repr(val)
+    return str(val).translate(_ESCAPES)
+
+
+def write_tsv(fh, rows, columns):
+    """Write rows (dicts) to an open text file, one line per row in `columns` order."""
+    for row in rows:
+        fh.write('\t'.join(tsv_field(row.get(col)) for col in columns))
+        fh.write('\n')
+
+
+def load_data_infile(conn, table, columns, rows, target_columns=None, set_clause=None, ignore=True):
+    """
+    Bulk-loads rows into `table` via LOAD DATA LOCAL INFILE on the given connection.
+    `columns` are the dict keys to read; `target_columns` are the table columns they map to
+    (defaults to `columns`). Returns the affected row count reported by the server.
+    """
+    if not rows:
+        return 0
+    target_columns = target_columns or columns
+    fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".tsv")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as fh:
+            write_tsv(fh, rows, columns)
+        sql = (
+            f"LOAD DATA LOCAL INFILE :path {'IGNORE' if ignore else ''} INTO TABLE {table} "
+            f"CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({', '.join(target_columns)})"
+        )
+        if set_clause:
+            sql += f" SET {set_clause}"
+        result = conn.execute(text(sql), {"path": path.replace('\\', '/')})
+        return result.rowcount
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,180 @@
+"""
+Materialised validation dashboard counters.
+
+ValidationQualityProcessor applies each batch's counts, in the same transaction as the
+clean rows it inserted, to three small tables:
+  validation_dashboard_snapshot  one row (id=1): clean rows per validation status, last raw id
+  validation_state_snapshot      clean rows per state
+  validation_daily_snapshot      clean rows per processing day
+so the validation dashboard and report read a few rows instead of running COUNT(*)s and
+SUMs over raw_clean_google_map_data and data_validation_log. Counters are increments,
+so concurrent processors can share them. reconcile_validation_snapshot() seeds the
+tables when utils.db_migrations creates them and corrects any drift from the clean
+table (init_summaries.py and the nightly reconcile).
+"""
+import logging
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import text
+
+logger = logging.getLogger("ValidationSnapshot")
+
+CLEAN_TABLE = "raw_clean_google_map_data"
+STATUS_COLUMNS = {
+    "VALID": "valid_count",
+    "MISSING": "missing_count",
+    "INVALID": "invalid_count",
+    "DUPLICATE": "duplicate_count",
+}
+TREND_DAYS = 7
+
+
+def _present_raw_ids(conn, raw_ids):
+    if not raw_ids:
+        return set()
+    placeholders = ", ".join(f":r{i}" for i in range(len(raw_ids)))
+    rows = conn.execute(
+        text(f"SELECT raw_id FROM {CLEAN_TABLE} WHERE raw_id IN ({placeholders})"),
+        {f"r{i}": rid for i, rid in enumerate(raw_ids)}
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
+def existing_raw_ids(conn, batch):
+    """raw_ids of `batch` already in the clean table, i.e. rows INSERT IGNORE will skip (idx_raw_id)."""
+    return _present_raw_ids(conn, list({row['raw_id'] for row in batch}))
+
+
+def inserted_rows(conn, batch, preexisting):
+    """
+    Rows of `batch` that the INSERT IGNORE just added: present now but not before. Rows skipped
+    on the composite dedup index are not present and so are not counted.
+    """
+    candidates = [row for row in batch if row['raw_id'] not in preexisting]
+    present = _present_raw_ids(conn, list({row['raw_id'] for row in candidates}))
+    return [row for row in candidates if row['raw_id'] in present]
+
+
+def apply_clean_batch(conn, rows, last_id):
+    """Adds the clean rows a batch inserted to the snapshot counters (caller's transaction)."""
+    by_status = Counter(row['val_status'] for row in rows)
+    by_state = Counter(row.get('state') or '' for row in rows)
+    by_day = Counter((row.get('processed_at') or datetime.now()).date() for row in rows)
+
+    params = {col: by_status.get(status, 0) for status, col in STATUS_COLUMNS.items()}
+    params.update({"clean": len(rows), "last_id": last_id})
+    conn.execute(text("""
+        INSERT INTO validation_dashboard_snapshot
+            (id, clean_count, valid_count, missing_count, invalid_count, duplicate_count, last_id, last_batch_at)
+        VALUES (1, :clean, :valid_count, :missing_count, :invalid_count, :duplicate_count, :last_id, NOW())
+        ON DUPLICATE KEY UPDATE
+            clean_count = clean_count + VALUES(clean_count),
+            valid_count = valid_count + VALUES(valid_count),
+            missing_count = missing_count + VALUES(missing_count),
+            invalid_count = invalid_count + VALUES(invalid_count),
+            duplicate_count = duplicate_count + VALUES(duplicate_count),
+            last_id = GREATEST(last_id, VALUES(last_id)),
+            last_batch_at = NOW()
+    """), params)
+    if by_state:
+        conn.execute(text("""
+            INSERT INTO validation_state_snapshot (state, clean_count) VALUES (:state, :n)
+            ON DUPLICATE KEY UPDATE clean_count = clean_count + VALUES(clean_count)
+        """), [{"state": s, "n": n} for s, n in by_state.items()])
+    if by_day:
+        conn.execute(text("""
+            INSERT INTO validation_daily_snapshot (day, clean_count) VALUES (:day, :n)
+            ON DUPLICATE KEY UPDATE clean_count = clean_count + VALUES(clean_count)
+        """), [{"day": d, "n": n} for d, n in by_day.items()])
+
+
+def reconcile_validation_snapshot(conn):
+    """
+    Corrects counter drift against the clean table in ONE scan, without locking anything.
+    Must run inside ONE REPEATABLE READ transaction: the counters and the clean rows are read
+    in the same snapshot, where (since batches commit both atomically) they must agree, and
+    the difference is then applied as an increment, which commutes with batches committing
+    meanwhile. Also seeds the tables from scratch. Returns the clean-table row count.
+    """
+    counters = conn.execute(text(
+        "SELECT clean_count, valid_count, missing_count, invalid_count, duplicate_count "
+        "FROM validation_dashboard_snapshot WHERE id = 1"
+    )).fetchone() or (0, 0, 0, 0, 0)
+    state_counters = dict(conn.execute(text("SELECT state, clean_count FROM validation_state_snapshot")).fetchall())
+    day_counters = dict(conn.execute(text(
+        f"SELECT day, clean_count FROM validation_daily_snapshot WHERE day >= CURDATE() - INTERVAL {TREND_DAYS} DAY"
+    )).fetchall())
+
+    rows = conn.execute(text(f"""
+        SELECT COALESCE(state, ''), validation_status,
+               CASE WHEN processed_at >= CURDATE() - INTERVAL {TREND_DAYS} DAY THEN DATE(processed_at) END,
+               COUNT(*), MAX(raw_id)
+        FROM {CLEAN_TABLE}
+        GROUP BY 1, 2, 3
+    """)).fetchall()
+
+    by_status, by_state, by_day = Counter(), Counter(), Counter()
+    last_id = 0
+    for state, status, day, n, max_raw_id in rows:
+        by_status[status] += n
+        by_state[state] += n
+        if day:
+            by_day[day] += n
+        last_id = max(last_id, max_raw_id or 0)
+
+    clean = sum(by_status.values())
+    params = {"clean": clean - int(counters[0] or 0), "last_id": last_id}
+    for i, (status, col) in enumerate(STATUS_COLUMNS.items(), start=1):
+        params[col] = by_status.get(status, 0) - int(counters[i] or 0)
+    conn.execute(text("""
+        INSERT INTO validation_dashboard_snapshot
+            (id, clean_count, valid_count, missing_count, invalid_count, duplicate_count, last_id)
+        VALUES (1, :clean, :valid_count, :missing_count, :invalid_count, :duplicate_count, :last_id)
+        ON DUPLICATE KEY UPDATE
+            clean_count = clean_count + VALUES(clean_count),
+            valid_count = valid_count + VALUES(valid_count),
+            missing_count = missing_count + VALUES(missing_count),
+            invalid_count = invalid_count + VALUES(invalid_count),
+            duplicate_count = duplicate_count + VALUES(duplicate_count),
+            last_id = GREATEST(last_id, VALUES(last_id))
+    """), params)
+
+    state_drift = [
+        {"state": s, "n": by_state.get(s, 0) - int(state_counters.get(s) or 0)}
+        for s in set(by_state) | set(state_counters)
+    ]
+    day_drift = [
+        {"day": d, "n": by_day.get(d, 0) - int(day_counters.get(d) or 0)}
+        for d in set(by_day) | set(day_counters)
+    ]
+    state_drift = [d for d in state_drift if d["n"]]
+    day_drift = [d for d in day_drift if d["n"]]
+    if state_drift:
+        conn.execute(text("""
+            INSERT INTO validation_state_snapshot (state, clean_count) VALUES (:state, :n)
+            ON DUPLICATE KEY UPDATE clean_count = clean_count + VALUES(clean_count)
+        """), state_drift)
+    if day_drift:
+        conn.execute(text("""
+            INSERT INTO validation_daily_snapshot (day, clean_count) VALUES (:day, :n)
+            ON DUPLICATE KEY UPDATE clean_count = clean_count + VALUES(clean_count)
+        """), day_drift)
+    logger.info(f"Validation snapshot reconciled: {clean} clean rows (drift {params['clean']:+d}), "
+                f"{len(state_drift)} state / {len(day_drift)} day counters corrected.")
+    return clean
+
+
+def read_snapshot(conn):
+    """The snapshot row joined with the raw-table total from dashboard_stats_summary_v5, as a dict."""
+    row = conn.execute(text("""
+        SELECT s.clean_count, s.valid_count, s.missing_count, s.invalid_count, s.duplicate_count,
+               s.last_id, s.last_batch_at, COALESCE(d.total_records, 0)
+        FROM validation_dashboard_snapshot s
+        LEFT JOIN dashboard_stats_summary_v5 d ON d.id = 1
+        WHERE s.id = 1
+    """)).fetchone()
+    keys = ("clean_count", "valid_count", "missing_count", "invalid_count", "duplicate_count",
+            "last_id", "last_batch_at", "raw_count")
+    if row is None:
+        return {**dict.fromkeys(keys, 0), "last_batch_at": None}
+    return {k: (v if k == "last_batch_at" else int(v or 0)) for k, v in zip(keys, row)}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback, useMemo } from 'react';
+import React, { useState, useEffect, useCallback, useMemo, useRef } from 'react';
 import ReusableTable from '../Table/ReusableTable';
 import SlotCounter from 'react-slot-counter';
 import {
@@ -47,6 +47,9 @@ const RawCleanedData = () => {
     const [selectedFile, setSelectedFile] = useState(null);
     const [searchTerm, setSearchTerm] = useState('');
     const [page, setPage] = useState(1);
+    const [hasNext, setHasNext] = useState(false);
+    // Keyset cursors: pageCursors.current.list[n] fetches page n + 1 of pageCursors.current.file
+    const pageCursors = useRef({ file: null, list: [null] });
 
     // --- VIEW-LAYER AGGREGATION & NORMALIZATION (O(n)) ---
     const aggregatedData = useMemo(() => {
@@ -191,10 +194,17 @@ const RawCleanedData = () => {
         if (!selectedFile) return;
         setLoading(true);
         try {
-            const params = new URLSearchParams({ page, limit: 50, file_name: selectedFile });
+            if (pageCursors.current.file !== selectedFile) pageCursors.current = { file: selectedFile, list: [null] };
+            const params = new URLSearchParams({ limit: 50, file_name: selectedFile });
+            const cursor = pageCursors.current.list[page - 1];
+            if (cursor) params.append("cursor", cursor);
             const res = await fetch(`http://localhost:8001/api/model/all?${params.toString()}`);
             const json = await res.json();
-            if (json.status === "success") setDetailData(json.data);
+            if (json.status === "success") {
+                setDetailData(json.data);
+                setHasNext(json.has_next);
+                pageCursors.current.list[page] = json.next_cursor;
+            }
         } catch (err) { console.error("Detail Error:", err); }
         finally { setLoading(false); }
     }, [page, selectedFile]);
@@ -403,7 +413,7 @@ const RawCleanedData = () => {
                                                 {filesData.map((file) => (
                                                     <div
                                                         key={file.file_name}
-                                                        onClick={() => { setSelectedFile(file.file_name); setViewMode('detail'); }}
+                                                        onClick={() => { setSelectedFile(file.file_name); setPage(1); setViewMode('detail'); }}
                                                         className="bg-slate-50/50 p-6 rounded-3xl border border-slate-100 hover:bg-white hover:border-indigo-400 hover:shadow-xl transition-all cursor-pointer group"
                                                     >
                                                         <div className="flex items-start gap-4 mb-4">
@@ -480,8 +490,9 @@ const RawCleanedData = () => {
                                             <span className="text-[10px] font-black text-slate-400 uppercase">PAGE {page}</span>
                                         </div>
                                         <button
+                                            disabled={!hasNext}
                                             onClick={() => setPage(p => p + 1)}
-                                            className="px-6 py-3 bg-slate-50 text-slate-600 rounded-xl text-[10px] font-black uppercase"
+                                            className="px-6 py-3 bg-slate-50 text-slate-600 rounded-xl text-[10px] font-black uppercase disabled:opacity-30"
                                         >NEXT PAGE</button>
                                     </div>
                                 </>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import SlotCounter from 'react-slot-counter';
 import {
     ShieldCheckIcon,
@@ -40,6 +40,8 @@ const ValidationDashboard = () => {
     const [paginatedClean, setPaginatedClean] = useState([]);
     const [totalErrors, setTotalErrors] = useState(0);
     const [totalClean, setTotalClean] = useState(0);
+    const [cleanHasNext, setCleanHasNext] = useState(false);
+    const cleanCursors = useRef([null]); // keyset cursor for each visited clean-data page
     const [autoRefresh, setAutoRefresh] = useState(true);
 
     // Fetch main dashboard data
@@ -70,12 +72,16 @@ const ValidationDashboard = () => {
     // Fetch paginated clean data
     const fetchClean = useCallback(async () => {
         try {
-            const params = new URLSearchParams({ page: cleanPage, limit: 50 });
+            const params = new URLSearchParams({ limit: 50 });
+            const cursor = cleanCursors.current[cleanPage - 1];
+            if (cursor) params.append("cursor", cursor);
             const res = await fetch(`${API_BASE}/api/validation/clean?${params.toString()}`);
             const json = await res.json();
             if (json.status === "success") {
                 setPaginatedClean(json.data);
                 setTotalClean(json.total);
+                setCleanHasNext(json.has_next);
+                cleanCursors.current[cleanPage] = json.next_cursor;
             }
         } catch (err) { console.error("Clean fetch error:", err); }
     }, [cleanPage]);
@@ -505,8 +511,9 @@ const ValidationDashboard = () => {
                             >PREVIOUS</button>
                             <span className="text-[10px] font-black text-slate-400 uppercase">Page {cleanPage} • {totalClean} total</span>
                             <button
+                                disabled={!cleanHasNext}
                                 onClick={() => setCleanPage(p => p + 1)}
-                                className="px-6 py-3 bg-slate-50 text-slate-600 rounded-xl text-[10px] font-black uppercase"
+                                className="px-6 py-3 bg-slate-50 text-slate-600 rounded-xl text-[10px] font-black uppercase disabled:opacity-30"
                             >NEXT</button>
                         </div>
                     </div>